@@ -34,6 +34,7 @@ from rally.common import opts
 from rally.common import utils
 from rally.common import version as rally_version
 from rally.common.plugin import discover
+from rally.task import abort
 from rally.task import engine
 from rally.task import exporter as texporter
 from rally.task import task_cfg
@@ -451,6 +452,7 @@ class _Task(APIGroup):
         )
 
         task_engine.validate()
+        task.set_input_task(config.to_dict())
 
         LOG.info("Task %s input file is valid." % task["uuid"])
         LOG.info(
@@ -462,6 +464,71 @@ class _Task(APIGroup):
 
         return task["uuid"], task.get_status(task["uuid"])
 
+    def resume(self, task_uuid, abort_on_sla_failure=False):
+        """Resume the interrupted task.
+
+        The workloads which have been finished are not run again, the one
+        which was interrupted is run from its start and the results of the
+        rest workloads are added to the same task.
+
+        :param task_uuid: The UUID of the task
+        :param abort_on_sla_failure: If set to True, the task execution is
+                                     stop when any of SLA checks fails
+        :raises RallyException: when the task is not interrupted or it can
+                                not be resumed
+        """
+        task = objects.Task.get(task_uuid)
+        status = task["status"]
+        if status not in (
+            consts.TaskStatus.RUNNING,
+            consts.TaskStatus.SOFT_ABORTING,
+            consts.TaskStatus.ABORTING,
+            consts.TaskStatus.ABORTED,
+            consts.TaskStatus.CRASHED,
+        ):
+            raise exceptions.RallyException(
+                "Unable to resume task '%s' in '%s' status."
+                % (task_uuid, status)
+            )
+        # NOTE: the task which is still running on another host can not be
+        #   detected, its status in the database is the same as the status
+        #   of the task which engine was killed
+        if abort.is_listening(task_uuid):
+            raise exceptions.RallyException(
+                "Unable to resume task '%s', it is still running." % task_uuid
+            )
+        config = task.get_input_task()
+        if config is None:
+            raise exceptions.RallyException(
+                "Unable to resume task '%s', its config has not been saved."
+                % task_uuid
+            )
+
+        deployment = objects.Deployment.get(task["deployment_uuid"])
+        if deployment["status"] != consts.DeployStatus.DEPLOY_FINISHED:
+            raise exceptions.DeploymentNotFinishedStatus(
+                name=deployment["name"],
+                uuid=deployment["uuid"],
+                status=deployment["status"],
+            )
+
+        # the config has been validated when the task was started
+        task_engine = engine.TaskEngine(
+            task_cfg.TaskConfig(config),
+            task,
+            deployment.env_obj,
+            abort_on_sla_failure=abort_on_sla_failure,
+        )
+
+        LOG.info(
+            "Resume Task %s against Deployment %s"
+            % (task["uuid"], deployment["uuid"])
+        )
+
+        task_engine.run()
+
+        return task["uuid"], task.get_status(task["uuid"])
+
     def abort(self, task_uuid, soft=False, wait=False, **kwargs):
         """Abort running task.
 
@@ -505,6 +572,9 @@ class _Task(APIGroup):
                     current_status = objects.Task.get_status(task_uuid)
 
         objects.Task.get(task_uuid).abort(soft=soft)
+        # the engine checks the status of the task in the database from
+        # time to time, but let it know right away if it runs on this host
+        abort.notify(task_uuid, soft=soft)
 
         if wait:
             LOG.info("Waiting until the task stops.")
@@ -595,6 +665,7 @@ class _Task(APIGroup):
                     full_duration=workload["full_duration"],
                     load_duration=workload["load_duration"],
                     contexts_results=workload["contexts_results"],
+                    runner_statistics=workload["statistics"].get("runner"),
                 )
             subtask_obj.update_status(consts.SubtaskStatus.FINISHED)
         task_inst.update_status(consts.SubtaskStatus.FINISHED)
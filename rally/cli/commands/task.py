@@ -36,6 +36,7 @@ from rally.cli import yamlutils as yaml
 from rally.common import logging
 from rally.common import utils as rutils
 from rally.common import version
+from rally.task import agent
 from rally.task import atomic
 from rally.task.processing import charts
 from rally.utils import strutils
@@ -744,6 +745,48 @@ def restart(
         raise typer.Exit(code=1)
 
 
+@task_app.command()
+@plugins.ensure_plugins_are_loaded
+def resume(
+    task_id: t.Annotated[
+        str,
+        argutils.ArgumentOrKeyword(
+            "--uuid", envvar=envutils.ENV_TASK, help="UUID of task."
+        ),
+    ],
+    abort_on_sla_failure: t.Annotated[
+        bool,
+        typer.Option(
+            "--abort-on-sla-failure",
+            help="Abort the execution of a task when any SLA check for it "
+            "fails for subtask or workload.",
+        ),
+    ] = False,
+) -> None:
+    """Resume an interrupted task.
+
+    Workloads which have been finished are not run again, the interrupted
+    one is run from its start and the results are added to the same task.
+    There are 3 kinds of return codes, 0: no error, 1: running error,
+    2: sla check failed.
+    """
+    api = cliutils.get_api()
+    print("Running Rally version", version.version_string())
+    print(cliutils.make_header("Task %s: resumed" % task_id))
+    print("Running Task... This can take a while...\n")
+
+    try:
+        api.task.resume(
+            task_uuid=task_id, abort_on_sla_failure=abort_on_sla_failure
+        )
+    except exceptions.DeploymentNotFinishedStatus as e:
+        print("Cannot resume a task on unfinished deployment: %s" % e)
+        raise typer.Exit(code=1)
+
+    if _detailed(api, task_id=task_id):
+        raise typer.Exit(code=2)
+
+
 @task_app.command()
 def abort(
     task_id: t.Annotated[
@@ -774,6 +817,32 @@ def abort(
     print("Task %s successfully stopped." % task_id)
 
 
+@task_app.command(name="agent")
+def agent_(
+    listen: t.Annotated[
+        str,
+        typer.Option(
+            "--listen",
+            help="Address to listen on: <host>:<port> or unix:<path>.",
+        ),
+    ],
+) -> None:
+    """Start an agent which generates the load of distributed runner."""
+    try:
+        agent_obj = agent.Agent(listen)
+    except (ValueError, OSError, exceptions.RallyException) as e:
+        print(e)
+        raise typer.Exit(code=1)
+
+    print("Agent is listening on %s. Press Ctrl+C to stop it." % listen)
+    try:
+        agent_obj.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent_obj.close()
+
+
 @task_app.command()
 def status(
     task_id: t.Annotated[
@@ -261,6 +261,37 @@ def task_create(session, values):
     return task
 
 
+@with_session
+def task_get_input(session, uuid):
+    task = (
+        session.query(models.Task)
+        .options(sa.orm.load_only(models.Task.input_task))
+        .filter_by(uuid=uuid)
+        .first()
+    )
+    if not task:
+        raise exceptions.DBRecordNotFound(
+            criteria="uuid: %s" % uuid, table="tasks"
+        )
+
+    return task.input_task
+
+
+@with_session
+def task_set_input(session, uuid, input_task):
+    # NOTE: do not load the deferred column of the task back, so it does
+    #   not appear in the task dicts returned by other methods
+    result = (
+        session.query(models.Task)
+        .filter_by(uuid=uuid)
+        .update({"input_task": input_task}, synchronize_session=False)
+    )
+    if not result:
+        raise exceptions.DBRecordNotFound(
+            criteria="uuid: %s" % uuid, table="tasks"
+        )
+
+
 @with_session
 def task_update(session, uuid, values):
     values.pop("uuid", None)
@@ -402,17 +433,35 @@ def task_delete(session, uuid, status=None):
 
 
 @with_session
-def subtask_create(session, task_uuid, title, description=None, contexts=None):
+def subtask_create(
+    session,
+    task_uuid,
+    title,
+    description=None,
+    contexts=None,
+    run_in_parallel=False,
+):
     subtask = models.Subtask(
         task_uuid=task_uuid,
         title=title,
         description=description or "",
         contexts=contexts or {},
+        run_in_parallel=run_in_parallel,
     )
     session.add(subtask)
     return subtask
 
 
+@with_session
+def subtask_list(session, task_uuid):
+    return (
+        session.query(models.Subtask)
+        .filter_by(task_uuid=task_uuid)
+        .order_by(models.Subtask.id.asc())
+        .all()
+    )
+
+
 @with_session
 def subtask_update(session, subtask_uuid, values):
     subtask = (
@@ -427,6 +476,74 @@ def workload_get(session, workload_uuid):
     return session.query(models.Workload).filter_by(uuid=workload_uuid).first()
 
 
+@with_session
+def workload_list(session, subtask_uuid):
+    return (
+        session.query(models.Workload)
+        .filter_by(subtask_uuid=subtask_uuid)
+        .order_by(models.Workload.position.asc())
+        .all()
+    )
+
+
+@with_session
+def workload_delete(session, workload_uuid):
+    workload = (
+        session.query(models.Workload)
+        .options(
+            sa.orm.load_only(
+                models.Workload.task_uuid,
+                models.Workload.subtask_uuid,
+                models.Workload.load_duration,
+            )
+        )
+        .filter_by(uuid=workload_uuid)
+        .first()
+    )
+    if not workload:
+        raise exceptions.DBRecordNotFound(
+            criteria="uuid: %s" % workload_uuid, table="workloads"
+        )
+    task_uuid = workload.task_uuid
+    subtask_uuid = workload.subtask_uuid
+    load_duration = workload.load_duration or 0.0
+
+    (
+        session.query(models.WorkloadData)
+        .filter_by(workload_uuid=workload_uuid)
+        .delete(synchronize_session=False)
+    )
+    (
+        session.query(models.Workload)
+        .filter_by(uuid=workload_uuid)
+        .delete(synchronize_session=False)
+    )
+
+    # take the results of the workload out of the subtask and the task
+    def _pass_sla(**criteria):
+        failed = (
+            session.query(models.Workload.id)
+            .filter_by(pass_sla=False, **criteria)
+            .first()
+        )
+        return failed is None
+
+    session.query(models.Subtask).filter_by(uuid=subtask_uuid).update(
+        {
+            "duration": models.Subtask.duration - load_duration,
+            "pass_sla": _pass_sla(subtask_uuid=subtask_uuid),
+        },
+        synchronize_session=False,
+    )
+    session.query(models.Task).filter_by(uuid=task_uuid).update(
+        {
+            "task_duration": models.Task.task_duration - load_duration,
+            "pass_sla": _pass_sla(task_uuid=task_uuid),
+        },
+        synchronize_session=False,
+    )
+
+
 @with_session
 def workload_create(
     session,
@@ -523,6 +640,7 @@ def workload_set_results(
     sla_results,
     contexts_results,
     hooks_results=None,
+    runner_statistics=None,
 ):
     workload_results = _task_workload_data_get_all(session, workload_uuid)
 
@@ -557,6 +675,10 @@ def workload_set_results(
     # so if no SLAs were specified, then we assume pass_sla == True
     success = all(s.get("success") for s in sla)
 
+    statistics = {"durations": durations_stat.to_dict()}
+    if runner_statistics:
+        statistics["runner"] = runner_statistics
+
     session.query(models.Workload).filter_by(uuid=workload_uuid).update(
         {
             "sla_results": {"sla": sla},
@@ -569,7 +691,7 @@ def workload_set_results(
             "total_iteration_count": iter_count,
             "failed_iteration_count": failed_iter_count,
             "start_time": start_time,
-            "statistics": {"durations": durations_stat.to_dict()},
+            "statistics": statistics,
             "pass_sla": success,
         }
     )
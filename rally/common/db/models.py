@@ -170,8 +170,6 @@ class Subtask(BASE, RallyBase):
     title = sa.Column(sa.String(128), default="")
     description = sa.Column(sa.Text, default="")
 
-    # we do not support subtask contexts feature yet, see
-    # https://review.openstack.org/#/c/404168/
     contexts = sa.orm.deferred(
         sa.Column(sa_types.JSONEncodedDict, default={}, nullable=False)
     )
@@ -182,7 +180,6 @@ class Subtask(BASE, RallyBase):
 
     sla = sa.Column(sa_types.JSONEncodedDict, default={}, nullable=False)
 
-    # It is always False for now
     run_in_parallel = sa.orm.deferred(
         sa.Column(sa.Boolean, default=False, nullable=False)
     )
@@ -16,6 +16,7 @@
 import collections
 import copy
 import datetime as dt
+import json
 import uuid
 
 from rally import consts
@@ -107,6 +108,7 @@ TASK_SCHEMA = {
                     "properties": {
                         "durations": {"type": "object"},
                         "atomics": {"type": "object"},
+                        "runner": {"type": "object"},
                     },
                 },
                 "data": {"type": "array"},
@@ -403,12 +405,35 @@ class Task:
             }
         )
 
-    def add_subtask(self, title, description=None, contexts=None):
+    def set_input_task(self, config):
+        """Save the config of the task to be able to resume it later.
+
+        :param config: a dict with the task config of the latest version
+        """
+        if not self.is_temporary:
+            db.task_set_input(self.task["uuid"], json.dumps(config))
+
+    def get_input_task(self):
+        """Return the saved config of the task or None."""
+        input_task = db.task_get_input(self.task["uuid"])
+        return json.loads(input_task) if input_task else None
+
+    def get_subtasks(self):
+        """Return the subtasks of the task in the order they were run."""
+        return [
+            Subtask(subtask=subtask)
+            for subtask in db.subtask_list(self.task["uuid"])
+        ]
+
+    def add_subtask(
+        self, title, description=None, contexts=None, run_in_parallel=False
+    ):
         return Subtask(
             self.task["uuid"],
             title=title,
             description=description,
             contexts=contexts,
+            run_in_parallel=run_in_parallel,
         )
 
     def delete(self, status=None):
@@ -557,9 +582,26 @@ class Task:
 class Subtask:
     """Represents a subtask object."""
 
-    def __init__(self, task_uuid, title, description=None, contexts=None):
-        self.subtask = db.subtask_create(
-            task_uuid, title=title, description=description, contexts=contexts
+    def __init__(
+        self,
+        task_uuid=None,
+        title=None,
+        description=None,
+        contexts=None,
+        run_in_parallel=False,
+        subtask=None,
+    ):
+        """Subtask object init
+
+        :param subtask: dictionary like object, that represents an existing
+            subtask. A new subtask is created if it is not specified.
+        """
+        self.subtask = subtask or db.subtask_create(
+            task_uuid,
+            title=title,
+            description=description,
+            contexts=contexts,
+            run_in_parallel=run_in_parallel,
         )
 
     def __getitem__(self, key):
@@ -571,6 +613,13 @@ class Subtask:
     def update_status(self, status):
         self._update({"status": status})
 
+    def set_contexts_results(self, contexts_results):
+        self._update({"contexts_results": contexts_results})
+
+    def get_workloads(self):
+        """Return the workloads of the subtask without their data."""
+        return db.workload_list(self.subtask["uuid"])
+
     def add_workload(
         self,
         name,
@@ -635,6 +684,10 @@ class Workload:
     def __getitem__(self, key):
         return self.workload[key]
 
+    @staticmethod
+    def delete_by_uuid(uuid):
+        db.workload_delete(uuid)
+
     def add_workload_data(self, chunk_order, workload_data):
         db.workload_data_create(
             self.workload["task_uuid"],
@@ -651,6 +704,7 @@ class Workload:
         sla_results,
         contexts_results,
         hooks_results=None,
+        runner_statistics=None,
     ):
         db.workload_set_results(
             workload_uuid=self.workload["uuid"],
@@ -662,6 +716,7 @@ class Workload:
             sla_results=sla_results,
             hooks_results=hooks_results,
             contexts_results=contexts_results,
+            runner_statistics=runner_statistics,
         )
 
     @classmethod
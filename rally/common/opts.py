@@ -16,8 +16,10 @@ import importlib
 
 from rally.common import cfg
 from rally.common import logging
+from rally.task import abort
 from rally.task import context
 from rally.task import engine
+from rally.task import runner
 from rally.task import scenario
 
 
@@ -27,9 +29,11 @@ CONF = cfg.CONF
 def list_opts():
 
     merged_opts = {"DEFAULT": []}
+    merged_opts["DEFAULT"].extend(abort.CONF_OPTS)
     merged_opts["DEFAULT"].extend(context.CONF_OPTS)
     merged_opts["DEFAULT"].extend(logging.DEBUG_OPTS)
     merged_opts["DEFAULT"].extend(engine.TASK_ENGINE_OPTS)
+    merged_opts["DEFAULT"].extend(runner.CONF_OPTS)
     merged_opts["DEFAULT"].extend(scenario.CONF_OPTS)
 
     return merged_opts.items()
@@ -18,7 +18,10 @@ from __future__ import annotations
 import collections
 import copy
 import ctypes
+import functools
+import heapq
 import io
+import itertools
 import multiprocessing
 import os
 import queue as queue_m
@@ -28,6 +31,7 @@ import shutil
 import string
 import sys
 import tempfile
+import threading
 import time
 import typing as t
 import uuid
@@ -36,10 +40,6 @@ from rally import exceptions
 from rally.common import logging
 
 
-if t.TYPE_CHECKING:  # pragma: no cover
-    import threading
-
-
 LOG = logging.getLogger(__name__)
 
 
@@ -182,6 +182,94 @@ class RAMInt:
         with self.__int._lock:  # type: ignore[attr-defined]
             self.__int.value = 0
 
+    def _lease(self, size: t.Callable[[int], int]) -> range:
+        """Take several next numbers at once.
+
+        :param size: function which returns how many numbers to take, it is
+            called with the current value under the lock
+        :returns: the range of taken numbers
+        """
+        with self.__int._lock:  # type: ignore[attr-defined]
+            value = self.__int.value
+            end = value + size(value)
+            if end > ctypes.c_uint(-1).value:
+                raise StopIteration
+            self.__int.value = end
+            return range(value, end)
+
+
+class BlockRAMInt(RAMInt):
+    """RAMInt which takes the shared integer in blocks.
+
+    Taking the lock of the shared integer for each number makes all threads
+    of all processes wait for each other. Instead, each process leases a
+    block of numbers and hands them out to its threads one by one, so the
+    shared lock is taken once per block.
+
+    If the limit is specified, the numbers below it are handed out exactly
+    once and no block crosses it. The blocks get smaller when there are few
+    numbers left to keep the processes evenly loaded until the end, and the
+    numbers above the limit are handed out one by one.
+    """
+
+    def __init__(
+        self,
+        base_value: int = 0,
+        block_size: int = 32,
+        limit: int | None = None,
+        workers: int = 1,
+    ) -> None:
+        """Create the integer.
+
+        :param base_value: the first number
+        :param block_size: maximum number of numbers in a block
+        :param limit: the number which no block may cross
+        :param workers: the number of processes which share the integer
+        """
+        super().__init__(base_value)
+        self.block_size = block_size
+        self.limit = limit
+        self.workers = workers
+        self._pid: int | None = None
+
+    def __getstate__(self) -> dict[str, t.Any]:
+        # the leased block belongs to the process that leased it
+        state = dict(self.__dict__)
+        state.pop("_lock", None)
+        state.pop("_block", None)
+        state["_pid"] = None
+        return state
+
+    def _block_size(self, value: int) -> int:
+        if self.limit is None:
+            return self.block_size
+        if value >= self.limit:
+            return 1
+        left = self.limit - value
+        return max(1, min(self.block_size, left // (2 * self.workers)))
+
+    _init_lock = threading.Lock()
+
+    def _init_process(self) -> None:
+        with self._init_lock:
+            if self._pid != os.getpid():
+                self._lock = threading.Lock()
+                self._block: t.Iterator[int] = iter(())
+                self._pid = os.getpid()
+
+    def __next__(self) -> int:
+        if self._pid != os.getpid():
+            self._init_process()
+        with self._lock:
+            for value in self._block:
+                return value
+            self._block = iter(self._lease(self._block_size))
+            return next(self._block)
+
+    def reset(self) -> None:
+        super().reset()
+        self._pid = None
+
 
 def retry(
     times: int,
@@ -513,6 +601,47 @@ def terminate_thread(
     )
 
 
+class ThreadIteration:
+    """A single iteration performed by a long-living thread.
+
+    TimeoutService terminates a watched thread if it is still alive when its
+    deadline comes. A thread of a pool outlives its iterations, so the
+    object to watch is an instance of this class instead: it is alive only
+    until the iteration is finished and the thread is terminated only if the
+    iteration is still in progress.
+
+    It has to be created by the thread which performs the iteration and
+    used as a context manager around the iteration.
+    """
+
+    def __init__(self) -> None:
+        self.ident: int | None = threading.get_ident()
+        self._lock = threading.Lock()
+        self._finished = False
+        # called once the iteration is finished, e.g. to cancel its deadline
+        self._on_finish: t.Callable[[], None] | None = None
+
+    def is_alive(self) -> bool:
+        return not self._finished
+
+    def terminate(self) -> None:
+        with self._lock:
+            if not self._finished and self.ident is not None:
+                terminate_thread(self.ident)
+
+    def finish(self) -> None:
+        with self._lock:
+            self._finished = True
+        if self._on_finish is not None:
+            self._on_finish()
+
+    def __enter__(self) -> ThreadIteration:
+        return self
+
+    def __exit__(self, *args: t.Any) -> None:
+        self.finish()
+
+
 def timeout_thread(
     queue: queue_m.Queue[tuple[threading.Thread, float] | tuple[None, None]],
 ) -> None:
@@ -557,6 +686,105 @@ def timeout_thread(
             return
 
 
+class TimeoutService:
+    """Terminate the iterations which run longer than their timeouts.
+
+    One thread watches the deadlines of all the iterations of a process.
+    The deadlines are kept in a heap, so every iteration is terminated at
+    its own deadline whatever the deadlines of the others are, and a
+    deadline is scheduled in O(log n). The deadline of an iteration which
+    is finished in time is cancelled: it is marked so in place and dropped
+    once it gets to the top of the heap, or together with the rest of the
+    cancelled ones when they make up most of the heap.
+
+    It is used as a context manager which starts and stops the watching
+    thread:
+
+    .. code-block:: python
+
+        with TimeoutService() as timeout_service:
+            ...
+            # in the thread which performs the iteration
+            with timeout_service.watch(timeout):
+                run_the_iteration()
+    """
+
+    def __init__(self) -> None:
+        # [deadline, sequence number, iteration or None if cancelled]
+        self._heap: list[list[t.Any]] = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> TimeoutService:
+        self.start()
+        return self
+
+    def __exit__(self, *args: t.Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching. The iterations which are left are not terminated."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+
+    def watch(self, timeout: float) -> ThreadIteration:
+        """Schedule the termination of the iteration of the current thread.
+
+        :param timeout: seconds the iteration may run for
+        :returns: ThreadIteration which should be used as a context manager
+            around the iteration; the deadline is cancelled once it exits
+        """
+        iteration = ThreadIteration()
+        entry = [time.monotonic() + timeout, next(self._counter), iteration]
+        iteration._on_finish = functools.partial(self._cancel, entry)
+        with self._cond:
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                # the watching thread waits for a later deadline
+                self._cond.notify()
+        return iteration
+
+    def _cancel(self, entry: list[t.Any]) -> None:
+        with self._cond:
+            if entry[2] is None:
+                # the iteration has been terminated
+                return
+            entry[2] = None
+            self._cancelled += 1
+            if self._cancelled > max(len(self._heap) // 2, 64):
+                self._heap = [e for e in self._heap if e[2] is not None]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def _run(self) -> None:
+        with self._cond:
+            while not self._stopped:
+                while self._heap and self._heap[0][2] is None:
+                    heapq.heappop(self._heap)
+                    self._cancelled -= 1
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                delay = self._heap[0][0] - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                entry = heapq.heappop(self._heap)
+                iteration, entry[2] = entry[2], None
+                LOG.info(
+                    f"Thread {iteration.ident} is timed out. Terminating."
+                )
+                iteration.terminate()
+
+
 class LockedDict(dict):
     """This represents dict which can be locked for updates.
 
@@ -642,6 +870,221 @@ class LockedDict(dict):
         return super().clear(*args, **kwargs)
 
 
+_IMMUTABLE_TYPES = (str, bytes, int, float, complex, frozenset, type(None))
+
+
+def copy_on_write(obj: t.Any) -> t.Any:
+    """Return an object which can be changed without affecting the original.
+
+    Dicts (including LockedDict) and lists are wrapped into CopyOnWriteDict
+    and CopyOnWriteList, which copy nested objects only when they are
+    accessed. Immutable objects are returned as is and everything else is
+    deep-copied.
+    """
+    if isinstance(obj, _IMMUTABLE_TYPES):
+        return obj
+    if type(obj) is dict or isinstance(obj, LockedDict):
+        return CopyOnWriteDict(obj)
+    if type(obj) is list:
+        return CopyOnWriteList(obj)
+    if type(obj) is tuple:
+        return tuple(copy_on_write(v) for v in obj)
+    return copy.deepcopy(obj)
+
+
+class CopyOnWriteDict(dict):
+    """A shallow copy of a dict which copies its values on first access.
+
+    It behaves like a deep copy of the original dict, but the copying is
+    deferred: a value is copied (see copy_on_write()) only when it is taken
+    from this dict, so the values which are never accessed are never copied.
+    The original dict and its values are not changed in any case.
+
+    d = CopyOnWriteDict(original)
+    d["users"].append(user)  # `original["users"]` stays the same
+
+    Copying the view with dict(), {**d}, f(**d), dict.update() or
+    copy.copy() gives the copies of the values as well.
+    """
+
+    def __init__(self, original: dict[t.Any, t.Any]) -> None:
+        super().__init__(original)
+        # ids of the values which still belong to the original dict; they
+        # are taken from the storage, since a view given as the original
+        # hands out copies instead of the values it stores itself
+        self._original_ids = {
+            id(v)
+            for v in super().values()
+            if not isinstance(v, _IMMUTABLE_TYPES)
+        }
+
+    def _own(self, key: t.Any, value: t.Any) -> t.Any:
+        if id(value) in self._original_ids:
+            value = copy_on_write(value)
+            super().__setitem__(key, value)
+        return value
+
+    def _own_all(self) -> None:
+        for key, value in list(super().items()):
+            self._own(key, value)
+
+    def __getitem__(self, key: t.Any) -> t.Any:
+        return self._own(key, super().__getitem__(key))
+
+    def __iter__(self) -> t.Iterator[t.Any]:
+        # CPython merges a dict subclass into another dict right from its
+        # storage unless the subclass overrides __iter__, in which case
+        # the values are taken with __getitem__
+        return super().__iter__()
+
+    def get(self, key: t.Any, default: t.Any = None) -> t.Any:
+        return self[key] if key in self else default
+
+    def setdefault(self, key: t.Any, default: t.Any = None) -> t.Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: t.Any, *args: t.Any) -> t.Any:
+        if key not in self:
+            return super().pop(key, *args)
+        value = self[key]
+        super().__delitem__(key)
+        return value
+
+    def popitem(self) -> tuple[t.Any, t.Any]:
+        key, value = super().popitem()
+        if id(value) in self._original_ids:
+            value = copy_on_write(value)
+        return key, value
+
+    def values(self) -> t.Any:
+        self._own_all()
+        return super().values()
+
+    def items(self) -> t.Any:
+        self._own_all()
+        return super().items()
+
+    def copy(self) -> dict[t.Any, t.Any]:
+        return dict(self.items())
+
+    def __deepcopy__(self, memo: t.Any = None) -> dict[t.Any, t.Any]:
+        return {
+            k: copy.deepcopy(v, memo=memo) for k, v in super().items()
+        }
+
+    def __reduce__(self) -> tuple[t.Any, ...]:
+        return dict, (self.copy(),)
+
+
+class CopyOnWriteList(list):
+    """A shallow copy of a list which copies its items on first access.
+
+    The list counterpart of CopyOnWriteDict.
+    """
+
+    def __init__(self, original: list[t.Any]) -> None:
+        super().__init__(original)
+        # ids of the items which still belong to the original list
+        self._original_ids = {
+            id(v) for v in original if not isinstance(v, _IMMUTABLE_TYPES)
+        }
+
+    def _own(self, index: t.SupportsIndex) -> t.Any:
+        value = super().__getitem__(index)
+        if id(value) in self._original_ids:
+            value = copy_on_write(value)
+            super().__setitem__(index, value)
+        return value
+
+    def _own_all(self) -> None:
+        for index in range(len(self)):
+            self._own(index)
+
+    @t.overload
+    def __getitem__(self, index: t.SupportsIndex) -> t.Any: ...
+
+    @t.overload
+    def __getitem__(self, index: slice) -> list[t.Any]: ...
+
+    def __getitem__(self, index: t.SupportsIndex | slice) -> t.Any:
+        if isinstance(index, slice):
+            self._own_all()
+            return super().__getitem__(index)
+        return self._own(index)
+
+    def __iter__(self) -> t.Iterator[t.Any]:
+        self._own_all()
+        return super().__iter__()
+
+    def __reversed__(self) -> t.Iterator[t.Any]:
+        self._own_all()
+        return super().__reversed__()
+
+    def pop(self, index: t.SupportsIndex = -1) -> t.Any:
+        value = self._own(index)
+        super().__delitem__(index)
+        return value
+
+    def copy(self) -> list[t.Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: t.Any = None) -> list[t.Any]:
+        return [copy.deepcopy(v, memo=memo) for v in super().__iter__()]
+
+    def __reduce__(self) -> tuple[t.Any, ...]:
+        return list, (self.copy(),)
+
+
+class WaitableDeque(collections.deque):  # type: ignore[type-arg]
+    """collections.deque which lets a consumer wait for new items.
+
+    The producers append items as usual, the consumer pops them as usual
+    and calls wait() instead of polling the deque when it is empty.
+    """
+
+    def __init__(
+        self, iterable: t.Iterable[t.Any] = (), maxlen: int | None = None
+    ) -> None:
+        super().__init__(iterable, maxlen)
+        self._cond = threading.Condition()
+
+    def append(self, item: t.Any) -> None:
+        with self._cond:
+            super().append(item)
+            self._cond.notify_all()
+
+    def extend(self, items: t.Iterable[t.Any]) -> None:
+        with self._cond:
+            super().extend(items)
+            self._cond.notify_all()
+
+    def wait(
+        self,
+        stop_event: threading.Event | None = None,
+        timeout: float | None = None,
+    ) -> bool:
+        """Wait until the deque has items.
+
+        :param stop_event: stop waiting if this event is set; wake() should
+            be called after setting it
+        :param timeout: the maximum number of seconds to wait
+        :returns: whether the deque has items
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: bool(self) or bool(stop_event and stop_event.is_set()),
+                timeout,
+            )
+            return bool(self)
+
+    def wake(self) -> None:
+        """Wake up the consumers waiting for the items."""
+        with self._cond:
+            self._cond.notify_all()
+
+
 class DequeAsQueue:
     """Allows to use some of Queue methods on collections.deque."""
 
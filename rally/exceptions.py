@@ -253,6 +253,11 @@ class SSHError(RallyException):
     pass
 
 
+class AgentFailure(RallyException):
+    error_code = 244
+    msg_fmt = "Agent %(agent)s failed: %(message)s"
+
+
 class RallyAssertionError(RallyException):
     msg_fmt = "Assertion error: %(message)s"
 
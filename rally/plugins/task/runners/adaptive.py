@@ -0,0 +1,377 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+import typing as t
+
+from rally import consts
+from rally.common import logging
+from rally.common import utils
+from rally.common import validation
+from rally.plugins.task.runners import constant
+from rally.task import runner
+from rally.task import sla
+
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from rally.task import scenario
+
+
+LOG = logging.getLogger(__name__)
+
+
+class _ConcurrencyLimit(constant.SlotSchedule):
+    """The number of concurrent slots which are allowed to run iterations.
+
+    The slots above the limit sleep until the runner raises the limit or
+    aborts the load, instead of checking the limit over and over again.
+    The limit the iteration was started with is reported as the
+    `concurrency` field of the result.
+    """
+
+    def __init__(
+        self, value: int, started_at: float, duration: float
+    ) -> None:
+        """Create the limit.
+
+        :param value: the initial number of concurrent slots
+        :param started_at: the time at which the load starts
+        :param duration: duration of the load in seconds
+        """
+        self._value = multiprocessing.Value("i", value)
+        self._changed = multiprocessing.Condition()
+        self.started_at = started_at
+        self.duration = duration
+
+    @property
+    def value(self) -> int:
+        return self._value.value
+
+    def set(self, value: int) -> None:
+        """Change the limit and wake the slots up."""
+        with self._changed:
+            self._value.value = value
+            self._changed.notify_all()
+
+    def wake(self) -> None:
+        """Wake the waiting slots up, e.g. to let them see the abort."""
+        with self._changed:
+            self._changed.notify_all()
+
+    def wait(
+        self, slot: int, aborted: multiprocessing.synchronize.Event
+    ) -> dict[str, t.Any] | None:
+        with self._changed:
+            while not aborted.is_set():
+                left = self.started_at + self.duration - time.time()
+                if left <= 0:
+                    break
+                concurrency = self._value.value
+                if slot < concurrency:
+                    return {"concurrency": concurrency}
+                self._changed.wait(left)
+        return None
+
+
+@validation.configure("check_adaptive_concurrency")
+class CheckAdaptiveConcurrencyValidator(validation.Validator):
+    """Check the limits and the SLA of adaptive_concurrency runner."""
+
+    def validate(
+        self,
+        context: dict[str, t.Any],
+        config: dict[str, t.Any] | None,
+        plugin_cls: type[runner.plugin.Plugin],
+        plugin_cfg: dict[str, t.Any] | None,
+    ) -> None:
+        if not plugin_cfg:
+            return
+        min_concurrency = plugin_cfg.get("min_concurrency", 1)
+        if min_concurrency > plugin_cfg["max_concurrency"]:
+            self.fail(
+                "Parameter 'min_concurrency' should not be greater than "
+                "'max_concurrency'."
+            )
+        errors = []
+        for name, criterion_value in plugin_cfg.get("sla", {}).items():
+            errors.extend(
+                sla.SLA.validate(
+                    name=name,
+                    context=context,
+                    config=None,
+                    plugin_cfg=criterion_value,
+                    vtype="syntax",
+                )
+            )
+        if errors:
+            self.fail("\n".join(errors))
+
+
+@validation.add("check_adaptive_concurrency")
+@runner.configure(name="adaptive_concurrency")
+class AdaptiveConcurrencyScenarioRunner(runner.ScenarioRunner):
+    """Scenario runner that searches for the best concurrency.
+
+    The runner starts with `min_concurrency` iterations in flight and every
+    `window` seconds checks the iterations completed at the current
+    concurrency against the SLA criteria of the workload, or against the
+    ones given as `sla` in the runner config if they should differ. While the
+    criteria pass, the concurrency is increased by `step`, once they fail, it
+    is multiplied by `backoff` (additive increase, multiplicative decrease),
+    so the load settles around the highest concurrency that the system
+    under test can sustain.
+
+    When the load is over, the runner logs the concurrency at which the
+    throughput peaked and the highest one reached before the SLA broke for
+    the first time, and saves them to the statistics of the workload as
+    `statistics["runner"]["knee"]`. Every iteration result has the
+    `concurrency` field, the report shows the statistics per concurrency as
+    a table.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA7,
+        "properties": {
+            "duration": {
+                "type": "number",
+                "minimum": 0,
+                "description": "Duration of the load in seconds.",
+            },
+            "min_concurrency": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The concurrency to start with and the "
+                "lowest one to back off to (1 by default).",
+            },
+            "max_concurrency": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The highest concurrency to try.",
+            },
+            "step": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "How much the concurrency is increased by "
+                "while the SLA passes (1 by default).",
+            },
+            "backoff": {
+                "type": "number",
+                "exclusiveMinimum": 0,
+                "maximum": 0.99,
+                "description": "The factor the concurrency is multiplied "
+                "by once the SLA fails (0.5 by default).",
+            },
+            "window": {
+                "type": "number",
+                "exclusiveMinimum": 0,
+                "minimum": 0,
+                "description": "How often in seconds the concurrency is "
+                "adjusted (5 by default).",
+            },
+            "sla": {
+                "type": "object",
+                "description": "The SLA criteria which the iterations of "
+                "a window should pass to increase the concurrency, in the "
+                'format of the "sla" section of the workload, which is '
+                "used if they are not specified.",
+                "additionalProperties": True,
+            },
+            "timeout": {
+                "type": "number",
+            },
+            "max_cpu_count": {"type": "integer", "minimum": 1},
+        },
+        "required": ["duration", "max_concurrency"],
+        "additionalProperties": False,
+    }
+
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._window_lock = threading.Lock()
+        self._window_results: list[runner.ScenarioRunnerResult] = []
+        # the throughput and the SLA success of every window by concurrency
+        self.windows: list[tuple[int, float, bool]] = []
+        self._limit: _ConcurrencyLimit | None = None
+
+    def abort(self) -> None:
+        super().abort()
+        if self._limit is not None:
+            self._limit.wake()
+
+    def _send_result(self, result: runner.ScenarioRunnerResult) -> None:
+        super()._send_result(result)
+        with self._window_lock:
+            self._window_results.append(result)
+
+    def _adjust(
+        self,
+        concurrency: int,
+        results: list[runner.ScenarioRunnerResult],
+        window: float,
+    ) -> int:
+        """Check the results of the window and choose the next concurrency.
+
+        :param concurrency: the current concurrency
+        :param results: the iteration results received within the window
+        :param window: duration of the window in seconds
+        :returns: the concurrency for the next window
+        """
+        results = [r for r in results if r.get("concurrency") == concurrency]
+        if not results:
+            # nothing has completed at this concurrency yet
+            return concurrency
+        checker = sla.SLAChecker(
+            {"sla": self.config.get("sla", self.workload_sla)}
+        )
+        # every result is added, so that criteria like the failure rate see
+        # the whole window
+        success = all([  # noqa: C419
+            checker.add_iteration(r) for r in results
+        ])
+        self.windows.append((concurrency, len(results) / window, success))
+
+        if success:
+            return min(
+                concurrency + self.config.get("step", 1),
+                self.config["max_concurrency"],
+            )
+        return max(
+            self.config.get("min_concurrency", 1),
+            int(concurrency * self.config.get("backoff", 0.5)),
+        )
+
+    def _control(
+        self, limit: _ConcurrencyLimit, finished: threading.Event
+    ) -> None:
+        window = self.config.get("window", 5)
+        while not finished.wait(window):
+            with self._window_lock:
+                results = self._window_results
+                self._window_results = []
+            concurrency = self._adjust(limit.value, results, window)
+            if concurrency != limit.value:
+                LOG.debug(
+                    "Task %s | Concurrency %s -> %s"
+                    % (self.task["uuid"], limit.value, concurrency)
+                )
+                limit.set(concurrency)
+
+    def get_knee(self) -> dict[str, int | None]:
+        """Find the concurrency at which the system under test saturates.
+
+        :returns: a dict with the concurrency of the highest throughput of
+            the windows which passed the SLA ("peak_throughput") and the
+            highest concurrency which passed the SLA before it failed for
+            the first time ("sla_limit")
+        """
+        passed = [w for w in self.windows if w[2]]
+        peak = max(passed, key=lambda w: w[1])[0] if passed else None
+        sla_limit = None
+        for concurrency, _throughput, success in self.windows:
+            if not success:
+                break
+            sla_limit = max(sla_limit or 0, concurrency)
+        return {"peak_throughput": peak, "sla_limit": sla_limit}
+
+    def _run_scenario(
+        self,
+        cls: type[scenario.Scenario],
+        method_name: t.Literal["run"],
+        context: dict[str, t.Any],
+        args: dict[str, t.Any],
+    ) -> None:
+        """Runs the specified scenario adjusting its concurrency.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Context that contains users, admin & other
+                        information, that was created before scenario
+                        execution starts.
+        :param args: Arguments to call the scenario method with
+        """
+        duration = self.config["duration"]
+        max_concurrency = self.config["max_concurrency"]
+        timeout = self.config.get("timeout", 0)  # 0 means no timeout
+
+        cpu_count = multiprocessing.cpu_count()
+        max_cpu_used = min(
+            cpu_count, self.config.get("max_cpu_count", cpu_count)
+        )
+        processes_to_start = min(max_cpu_used, max_concurrency)
+
+        self._log_debug_info(
+            duration=duration,
+            min_concurrency=self.config.get("min_concurrency", 1),
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            max_cpu_used=max_cpu_used,
+            processes_to_start=processes_to_start,
+        )
+
+        result_queue = self._create_result_queue(processes_to_start)
+        event_queue: multiprocessing.Queue[dict[str, t.Any]] = (
+            multiprocessing.Queue()
+        )
+        # the workers stop when the duration ends, so the iteration numbers
+        # are not leased in blocks, see ConstantForDurationScenarioRunner
+        iteration_gen = utils.RAMInt()
+        limit = _ConcurrencyLimit(
+            self.config.get("min_concurrency", 1), time.time(), duration
+        )
+        self._limit = limit
+
+        finished = threading.Event()
+        controller = threading.Thread(
+            target=self._control, args=(limit, finished)
+        )
+        controller.start()
+
+        def worker_args_gen() -> t.Generator[tuple[t.Any, ...], None, None]:
+            while True:
+                yield (
+                    result_queue,
+                    iteration_gen,
+                    limit,
+                    max_concurrency,
+                    timeout,
+                    context,
+                    cls,
+                    method_name,
+                    args,
+                    event_queue,
+                    self.aborted,
+                )
+
+        try:
+            process_pool = self._create_process_pool(
+                processes_to_start,
+                constant.slot_worker_process,
+                worker_args_gen(),
+            )
+            self._join_processes(process_pool, result_queue, event_queue)
+        finally:
+            finished.set()
+            controller.join()
+            self._limit = None
+
+        knee = self.get_knee()
+        self.statistics["knee"] = knee
+        LOG.info(
+            "Task %s | Throughput peaked at concurrency %s, the SLA held up "
+            "to concurrency %s."
+            % (self.task["uuid"], knee["peak_throughput"], knee["sla_limit"])
+        )
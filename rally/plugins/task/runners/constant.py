@@ -15,9 +15,8 @@
 
 from __future__ import annotations
 
-import collections
+import abc
 import multiprocessing
-import queue as Queue
 import threading
 import time
 import typing as t
@@ -29,7 +28,7 @@ from rally.task import runner
 
 
 def _worker_process(
-    queue: multiprocessing.Queue[runner.ScenarioRunnerResult],
+    queue: runner.transport.BatchedResultQueue,
     iteration_gen: t.Iterator[int],
     timeout: float | None,
     concurrency: int,
@@ -41,17 +40,19 @@ def _worker_process(
     args: dict[str, t.Any],
     event_queue: multiprocessing.Queue[dict[str, t.Any]],
     aborted: multiprocessing.synchronize.Event,
+    phases: runner.LoadPhases,
     info: dict[str, t.Any],
 ) -> None:
-    """Start the scenario within threads.
+    """Start the scenario within a pool of threads.
 
-    Spawn threads to support scenario execution.
+    Start `concurrency` threads which live as long as the worker process.
     Scenario is ran for a fixed number of times if times is specified
     Scenario is ran for fixed duration if duration is specified.
     This generates a constant load on the cloud under test by executing each
-    scenario iteration without pausing between iterations. Each thread runs
-    the scenario method once with passed scenario arguments and context.
-    After execution the result is appended to the queue.
+    scenario iteration without pausing between iterations. Each thread
+    takes the next iteration number from the shared iteration_gen, runs the
+    scenario method with passed scenario arguments and context and appends
+    the result to the queue, until there is no more work to do.
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
@@ -66,30 +67,13 @@ def _worker_process(
     :param event_queue: queue object to append events
     :param aborted: multiprocessing.Event that aborts load generation if
                     the flag is set
+    :param phases: the warm-up and the cool-down of the load
     :param info: info about all processes count and counter of launched process
     """
 
-    def _to_be_continued(
-        iteration: int,
-        current_duration: float,
-        aborted: multiprocessing.synchronize.Event,
-        times: int | None = None,
-        duration: float | None = None,
-    ) -> bool:
-        if times is not None:
-            return iteration < times and not aborted.is_set()
-        elif duration is not None:
-            return current_duration < duration and not aborted.is_set()
-        else:
-            return False
-
     if times is None and duration is None:
         raise ValueError("times or duration must be specified")
 
-    pool: collections.deque[threading.Thread] = collections.deque()
-    alive_threads_in_pool = 0
-    finished_threads_in_pool = 0
-
     runner._log_worker_info(
         times=times,
         duration=duration,
@@ -100,74 +84,172 @@ def _worker_process(
         args=args,
     )
 
+    timeout_service = utils.TimeoutService()
     if timeout:
-        timeout_queue: Queue.Queue[
-            tuple[threading.Thread, float] | tuple[None, None]
-        ] = Queue.Queue()
-        collector_thr_by_timeout = threading.Thread(
-            target=utils.timeout_thread, args=(timeout_queue,)
-        )
-        collector_thr_by_timeout.start()
+        timeout_service.start()
 
-    iteration = next(iteration_gen)
     start_time = time.time()
-    # NOTE(msimonin): keep the previous behaviour
-    # > when duration is 0, scenario executes exactly 1 time
-    current_duration = -1.0
-    while _to_be_continued(
-        iteration, current_duration, aborted, times=times, duration=duration
-    ):
-        scenario_context = runner._get_scenario_context(iteration, context)
-        worker_args = (
-            queue,
-            cls,
-            method_name,
-            scenario_context,
-            args,
-            event_queue,
-        )
 
-        thread = threading.Thread(
-            target=runner._worker_thread, args=worker_args
-        )
+    def _to_be_continued(iteration: int, is_first: bool) -> bool:
+        if aborted.is_set():
+            return False
+        if times is not None:
+            return iteration < times
+        # NOTE(msimonin): keep the previous behaviour
+        # > when duration is 0, scenario executes exactly 1 time
+        # Each thread of the pool runs its first iteration unconditionally, so
+        # it is 1 time per unit of concurrency.
+        return is_first or time.time() - start_time < t.cast(float, duration)
+
+    def _thread_loop() -> None:
+        is_first = True
+        while True:
+            iteration = next(iteration_gen)
+            if not _to_be_continued(iteration, is_first):
+                break
+            is_first = False
+            scenario_context = runner._get_scenario_context(iteration, context)
+            elapsed = time.time() - start_time if phases.timed else 0
+            phase = phases.get(iteration, elapsed)
+            timeout_guard = None
+            if timeout:
+                timeout_guard = timeout_service.watch(timeout)
+            result = runner._run_scenario_once(
+                cls,
+                method_name,
+                scenario_context,
+                args,
+                event_queue,
+                timeout_guard=timeout_guard,
+            )
+            if phase is not None:
+                result["phase"] = phase
+            queue.put(result)
 
+    pool = [threading.Thread(target=_thread_loop) for _ in range(concurrency)]
+    for thread in pool:
         thread.start()
-        if timeout:
-            timeout_queue.put((thread, time.time() + timeout))
-        pool.append(thread)
-        alive_threads_in_pool += 1
-
-        while alive_threads_in_pool == concurrency:
-            prev_finished_threads_in_pool = finished_threads_in_pool
-            finished_threads_in_pool = 0
-            for thread in pool:
-                if not thread.is_alive():
-                    finished_threads_in_pool += 1
-
-            alive_threads_in_pool -= finished_threads_in_pool
-            alive_threads_in_pool += prev_finished_threads_in_pool
-
-            if alive_threads_in_pool < concurrency:
-                # NOTE(boris-42): cleanup pool array. This is required because
-                # in other case array length will be equal to times which
-                # is unlimited big
-                while pool and not pool[0].is_alive():
-                    pool.popleft().join()
-                    finished_threads_in_pool -= 1
+
+    # Wait until all threads are done
+    for thread in pool:
+        thread.join()
+    queue.flush()
+
+    if timeout:
+        timeout_service.stop()
+
+
+class SlotSchedule(abc.ABC):
+    """When the concurrent slots of slot_worker_process() run iterations.
+
+    The schedule is shared by the runner and its worker processes, so it
+    keeps the shared state in multiprocessing primitives.
+    """
+
+    @abc.abstractmethod
+    def wait(
+        self, slot: int, aborted: multiprocessing.synchronize.Event
+    ) -> dict[str, t.Any] | None:
+        """Wait until the slot may start the next iteration.
+
+        The slot must sleep while it waits, the `aborted` event should wake
+        it up as well.
+
+        :param slot: the number of the slot
+        :param aborted: multiprocessing.Event that aborts load generation if
+            the flag is set
+        :returns: the fields to add to the result of the iteration, or None
+            if the load is over
+        """
+
+
+def slot_worker_process(
+    queue: runner.transport.BatchedResultQueue,
+    iteration_gen: t.Iterator[int],
+    schedule: SlotSchedule,
+    max_concurrency: int,
+    timeout: float | None,
+    context: dict[str, t.Any],
+    cls: type[runner.scenario.Scenario],
+    method_name: t.Literal["run"],
+    args: dict[str, t.Any],
+    event_queue: multiprocessing.Queue[dict[str, t.Any]],
+    aborted: multiprocessing.synchronize.Event,
+    info: dict[str, t.Any],
+) -> None:
+    """Run the scenario within the concurrent slots of the worker.
+
+    The worker process of the runners which change the concurrency while
+    the load runs. Like the threads of _worker_process() for
+    constant_for_duration runner, every concurrent slot is a thread which
+    runs iterations one after another. The slots are numbered from 0 to
+    `max_concurrency` - 1 and the worker gets every N-th of them, where N is
+    the number of workers. A slot asks the schedule before every iteration
+    whether it may run one, so the runner changes the number of iterations
+    in flight of all workers at once.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param schedule: the schedule of the slots
+    :param max_concurrency: total number of concurrent slots
+    :param timeout: operation's timeout
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param event_queue: queue object to append events
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param info: info about all processes count and counter of launched process
+    """
+    slots = range(
+        info["processes_counter"], max_concurrency, info["processes_to_start"]
+    )
+
+    runner._log_worker_info(
+        slots=list(slots),
+        timeout=timeout,
+        cls=cls,
+        method_name=method_name,
+        args=args,
+    )
+
+    timeout_service = utils.TimeoutService()
+    if timeout:
+        timeout_service.start()
+
+    def _thread_loop(slot: int) -> None:
+        while True:
+            fields = schedule.wait(slot, aborted)
+            if fields is None:
                 break
+            iteration = next(iteration_gen)
+            timeout_guard = None
+            if timeout:
+                timeout_guard = timeout_service.watch(timeout)
+            result = runner._run_scenario_once(
+                cls,
+                method_name,
+                runner._get_scenario_context(iteration, context),
+                args,
+                event_queue,
+                timeout_guard=timeout_guard,
+            )
+            result.update(fields)  # type: ignore[typeddict-item]
+            queue.put(result)
 
-            # we should wait to not create big noise with these checks
-            time.sleep(0.001)
-        iteration = next(iteration_gen)
-        current_duration = time.time() - start_time
+    pool = [
+        threading.Thread(target=_thread_loop, args=(slot,)) for slot in slots
+    ]
+    for thread in pool:
+        thread.start()
 
-    # Wait until all threads are done
-    while pool:
-        pool.popleft().join()
+    for thread in pool:
+        thread.join()
+    queue.flush()
 
     if timeout:
-        timeout_queue.put((None, None))
-        collector_thr_by_timeout.join()
+        timeout_service.stop()
 
 
 @validation.configure("check_constant")
@@ -191,6 +273,9 @@ class CheckConstantValidator(validation.Validator):
                 "(and restricted) to have number of parallel iterations "
                 "bigger then total number of iterations."
             )
+        error = runner.LoadPhases.check(plugin_cfg or {})
+        if error:
+            self.fail(error)
 
 
 @validation.add("check_constant")
@@ -232,6 +317,16 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
                 "description": "The maximum number of processes to create load"
                 " from.",
             },
+            "warmup": runner.LoadPhases.schema(
+                "The first iterations, or the iterations started within the "
+                "first seconds, of the load. They are run and saved, but the "
+                "SLA and the statistics of durations ignore them."
+            ),
+            "cooldown": runner.LoadPhases.schema(
+                "The last iterations of the load which the SLA and the "
+                "statistics of durations ignore.",
+                units=("iterations",),
+            ),
         },
         "additionalProperties": False,
     }
@@ -263,7 +358,6 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
         timeout = self.config.get("timeout", 0)  # 0 means no timeout
         times = self.config.get("times", 1)
         concurrency = self.config.get("concurrency", 1)
-        iteration_gen = utils.RAMInt()
 
         cpu_count = multiprocessing.cpu_count()
         max_cpu_used = min(
@@ -271,6 +365,9 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
         )
 
         processes_to_start = min(max_cpu_used, times, concurrency)
+        iteration_gen = self._create_iteration_counter(
+            limit=times, workers=processes_to_start
+        )
         concurrency_per_worker, concurrency_overhead = divmod(
             concurrency, processes_to_start
         )
@@ -285,9 +382,7 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
             concurrency_overhead=concurrency_overhead,
         )
 
-        result_queue: multiprocessing.Queue[runner.ScenarioRunnerResult] = (
-            multiprocessing.Queue()
-        )
+        result_queue = self._create_result_queue(processes_to_start)
         event_queue: multiprocessing.Queue[dict[str, t.Any]] = (
             multiprocessing.Queue()
         )
@@ -309,6 +404,7 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
                     args,
                     event_queue,
                     self.aborted,
+                    runner.LoadPhases(self.config, times=times),
                 )
                 if concurrency_overhead:
                     concurrency_overhead -= 1
@@ -321,6 +417,23 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
         self._join_processes(process_pool, result_queue, event_queue)
 
 
+@validation.configure("check_constant_for_duration")
+class CheckConstantForDurationValidator(validation.Validator):
+    """Additional schema validation for constant_for_duration runner"""
+
+    def validate(
+        self,
+        context: dict[str, t.Any],
+        config: dict[str, t.Any] | None,
+        plugin_cls: type[runner.plugin.Plugin],
+        plugin_cfg: dict[str, t.Any] | None,
+    ) -> None:
+        error = runner.LoadPhases.check(plugin_cfg or {})
+        if error:
+            self.fail(error)
+
+
+@validation.add("check_constant_for_duration")
 @runner.configure(name="constant_for_duration")
 class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
     """Creates constant load executing a scenario for an interval of time.
@@ -356,6 +469,16 @@ class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
                 "minimum": 1,
                 "description": "Operation's timeout.",
             },
+            "warmup": runner.LoadPhases.schema(
+                "The first iterations, or the iterations started within the "
+                "first seconds, of the load. They are run and saved, but the "
+                "SLA and the statistics of durations ignore them."
+            ),
+            "cooldown": runner.LoadPhases.schema(
+                "The iterations started within the last seconds of the load "
+                "which the SLA and the statistics of durations ignore.",
+                units=("duration",),
+            ),
         },
         "required": ["duration"],
         "additionalProperties": False,
@@ -388,7 +511,6 @@ class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
         timeout = self.config.get("timeout", 600)
         duration = self.config.get("duration", 0)
         concurrency = self.config.get("concurrency", 1)
-        iteration_gen = utils.RAMInt()
 
         cpu_count = multiprocessing.cpu_count()
         max_cpu_used = min(
@@ -396,6 +518,10 @@ class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
         )
 
         processes_to_start = min(max_cpu_used, concurrency)
+        # the workers stop when the duration ends, while they might still
+        # hold leased iteration numbers, so the numbers are not leased in
+        # blocks here to keep them contiguous for the hooks
+        iteration_gen = utils.RAMInt()
         concurrency_per_worker, concurrency_overhead = divmod(
             concurrency, processes_to_start
         )
@@ -410,9 +536,7 @@ class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
             concurrency_overhead=concurrency_overhead,
         )
 
-        result_queue: multiprocessing.Queue[runner.ScenarioRunnerResult] = (
-            multiprocessing.Queue()
-        )
+        result_queue = self._create_result_queue(processes_to_start)
         event_queue: multiprocessing.Queue[dict[str, t.Any]] = (
             multiprocessing.Queue()
         )
@@ -434,6 +558,7 @@ class ConstantForDurationScenarioRunner(runner.ScenarioRunner):
                     args,
                     event_queue,
                     self.aborted,
+                    runner.LoadPhases(self.config, duration=duration),
                 )
                 if concurrency_overhead:
                     concurrency_overhead -= 1
@@ -0,0 +1,248 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import multiprocessing
+import typing as t
+
+from rally import consts
+from rally import exceptions
+from rally.common import validation
+from rally.task import runner
+
+
+async def _iterations_loop(
+    queue: runner.transport.BatchedResultQueue,
+    iteration_gen: t.Iterator[int],
+    timeout: float | None,
+    times: int,
+    context: dict[str, t.Any],
+    cls: type[runner.scenario.Scenario],
+    method_name: t.Literal["run"],
+    args: dict[str, t.Any],
+    event_queue: multiprocessing.Queue[dict[str, t.Any]],
+    aborted: multiprocessing.synchronize.Event,
+) -> None:
+    """Run iterations one after another until the workload is over.
+
+    Each running copy of this coroutine represents one unit of concurrency.
+    """
+    while True:
+        iteration = next(iteration_gen)
+        if iteration >= times or aborted.is_set():
+            return
+        result = await runner._run_scenario_once_async(
+            cls,
+            method_name,
+            runner._get_scenario_context(iteration, context),
+            args,
+            event_queue,
+            timeout=timeout,
+        )
+        queue.put(result)
+
+
+def _worker_process(
+    queue: runner.transport.BatchedResultQueue,
+    iteration_gen: t.Iterator[int],
+    timeout: float | None,
+    concurrency: int,
+    times: int,
+    context: dict[str, t.Any],
+    cls: type[runner.scenario.Scenario],
+    method_name: t.Literal["run"],
+    args: dict[str, t.Any],
+    event_queue: multiprocessing.Queue[dict[str, t.Any]],
+    aborted: multiprocessing.synchronize.Event,
+    info: dict[str, t.Any],
+) -> None:
+    """Run the coroutine scenario within a single event loop.
+
+    Instead of spawning a thread per iteration, the process runs
+    `concurrency` coroutines on its own event loop. Each of them takes the
+    next iteration number from the shared generator, awaits the scenario and
+    appends the result to the queue.
+
+    :param queue: queue object to append results
+    :param iteration_gen: next iteration number generator
+    :param timeout: operation's timeout
+    :param concurrency: number of concurrently running scenario iterations
+    :param times: total number of scenario iterations to be run
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    :param event_queue: queue object to append events
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param info: info about all processes count and counter of launched process
+    """
+    runner._log_worker_info(
+        times=times,
+        concurrency=concurrency,
+        timeout=timeout,
+        cls=cls,
+        method_name=method_name,
+        args=args,
+    )
+
+    async def _run() -> None:
+        await asyncio.gather(
+            *[
+                _iterations_loop(
+                    queue,
+                    iteration_gen,
+                    timeout or None,
+                    times,
+                    context,
+                    cls,
+                    method_name,
+                    args,
+                    event_queue,
+                    aborted,
+                )
+                for _ in range(concurrency)
+            ]
+        )
+
+    asyncio.run(_run())
+    queue.flush()
+
+
+@validation.add("check_constant")
+@runner.configure(name="constant_async")
+class ConstantAsyncScenarioRunner(runner.ScenarioRunner):
+    """Creates constant load of a coroutine scenario on asyncio event loops.
+
+    This runner places the same load as the "constant" one, but it is meant
+    for scenarios whose run() method is a coroutine (`async def run()`).
+    Every worker process drives its share of the concurrency from a single
+    event loop instead of starting a thread per iteration, so the number of
+    in-flight iterations is not limited by the number of OS threads the
+    load generator can handle.
+
+    The scenario must not block the event loop (e.g. by sleeping or doing
+    synchronous I/O), otherwise all iterations of the worker are stalled.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The number of parallel iteration executions.",
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "Total number of iteration executions.",
+            },
+            "timeout": {
+                "type": "number",
+                "description": "Operation's timeout.",
+            },
+            "max_cpu_count": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "The maximum number of processes to create load"
+                " from.",
+            },
+        },
+        "additionalProperties": False,
+    }
+
+    def _run_scenario(
+        self,
+        cls: type[runner.scenario.Scenario],
+        method_name: t.Literal["run"],
+        context: dict[str, t.Any],
+        args: dict[str, t.Any],
+    ) -> None:
+        """Runs the specified coroutine scenario with given arguments.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: context that contains users, admin & other
+                        information, that was created before scenario
+                        execution starts.
+        :param args: Arguments to call the scenario method with
+        """
+        if not inspect.iscoroutinefunction(getattr(cls, method_name)):
+            raise exceptions.InvalidArgumentsException(
+                "Scenario %s does not implement `async def %s()` and can "
+                "not be launched by %s runner."
+                % (cls.get_name(), method_name, self.get_name())
+            )
+
+        timeout = self.config.get("timeout", 0)  # 0 means no timeout
+        times = self.config.get("times", 1)
+        concurrency = self.config.get("concurrency", 1)
+
+        cpu_count = multiprocessing.cpu_count()
+        max_cpu_used = min(
+            cpu_count, self.config.get("max_cpu_count", cpu_count)
+        )
+
+        processes_to_start = min(max_cpu_used, times, concurrency)
+        iteration_gen = self._create_iteration_counter(
+            limit=times, workers=processes_to_start
+        )
+        concurrency_per_worker, concurrency_overhead = divmod(
+            concurrency, processes_to_start
+        )
+
+        self._log_debug_info(
+            times=times,
+            concurrency=concurrency,
+            timeout=timeout,
+            max_cpu_used=max_cpu_used,
+            processes_to_start=processes_to_start,
+            concurrency_per_worker=concurrency_per_worker,
+            concurrency_overhead=concurrency_overhead,
+        )
+
+        result_queue = self._create_result_queue(processes_to_start)
+        event_queue: multiprocessing.Queue[dict[str, t.Any]] = (
+            multiprocessing.Queue()
+        )
+
+        def worker_args_gen(
+            concurrency_overhead: int,
+        ) -> t.Generator[tuple[t.Any, ...], None, None]:
+            while True:
+                yield (
+                    result_queue,
+                    iteration_gen,
+                    timeout,
+                    concurrency_per_worker + (concurrency_overhead and 1),
+                    times,
+                    context,
+                    cls,
+                    method_name,
+                    args,
+                    event_queue,
+                    self.aborted,
+                )
+                if concurrency_overhead:
+                    concurrency_overhead -= 1
+
+        process_pool = self._create_process_pool(
+            processes_to_start,
+            _worker_process,
+            worker_args_gen(concurrency_overhead),
+        )
+        self._join_processes(process_pool, result_queue, event_queue)
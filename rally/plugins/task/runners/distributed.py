@@ -0,0 +1,288 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing.connection
+import threading
+import typing as t
+
+from rally import consts
+from rally import exceptions
+from rally.common import logging
+from rally.common import validation
+from rally.task import agent
+from rally.task import runner
+
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from rally.task import scenario
+
+
+LOG = logging.getLogger(__name__)
+
+# the parameters of the runners which define the amount of the load and
+# which are split between the agents
+_INTEGER_LOADS = ("times", "concurrency", "max_concurrency")
+
+
+def _split_integer(value: int, parts: int) -> list[int]:
+    share, overhead = divmod(value, parts)
+    return [share + (i < overhead) for i in range(parts)]
+
+
+def split_config(
+    config: dict[str, t.Any], agents: int
+) -> list[dict[str, t.Any] | None]:
+    """Split the load defined by the config of a runner between the agents.
+
+    The integer parameters (`times`, `concurrency`, `max_concurrency`) are
+    divided as evenly as possible, the rate (`rps`, including the start,
+    the end and the step of a ramp) is divided exactly. The rest of the
+    parameters are given to every agent as is.
+
+    :param config: the config of the runner
+    :param agents: the number of agents
+    :returns: the config for every agent, or None if the agent gets
+        nothing to do
+    """
+    shares = [dict(config) for _ in range(agents)]
+    for key in _INTEGER_LOADS:
+        if key in config:
+            values = _split_integer(config[key], agents)
+            for share, value in zip(shares, values):
+                share[key] = value
+    if isinstance(config.get("rps"), dict):
+        rps = dict(config["rps"])
+        for key in ("start", "end", "step"):
+            rps[key] = rps[key] / agents
+        for share in shares:
+            share["rps"] = rps
+    elif "rps" in config:
+        for share in shares:
+            share["rps"] = config["rps"] / agents
+    return [
+        share if all(share[k] for k in _INTEGER_LOADS if k in share) else None
+        for share in shares
+    ]
+
+
+@validation.configure("check_distributed_runner")
+class CheckDistributedRunnerValidator(validation.Validator):
+    """Check the agents and the runner of distributed runner."""
+
+    def validate(
+        self,
+        context: dict[str, t.Any],
+        config: dict[str, t.Any] | None,
+        plugin_cls: type[runner.plugin.Plugin],
+        plugin_cfg: dict[str, t.Any] | None,
+    ) -> None:
+        if not plugin_cfg:
+            return
+        for address in plugin_cfg["agents"]:
+            try:
+                agent.parse_address(address)
+            except ValueError as e:
+                self.fail(str(e))
+        name, runner_cfg = next(iter(plugin_cfg["runner"].items()))
+        if name == plugin_cls.get_name():
+            self.fail("Distributed runner can not distribute itself.")
+        errors = runner.ScenarioRunner.validate(
+            name=name,
+            context=context,
+            config=config,
+            plugin_cfg=runner_cfg,
+            vtype="syntax",
+        )
+        if errors:
+            self.fail("\n".join(errors))
+
+
+@validation.add("check_distributed_runner")
+@runner.configure(name="distributed")
+class DistributedScenarioRunner(runner.ScenarioRunner):
+    """Scenario runner that generates the load from several agents.
+
+    The load of the given runner is split between the agents: the number of
+    iterations, the concurrency and the rate are divided, and every agent
+    runs the runner with its share. The agents stream the results back while
+    they work, so the SLA is checked and the progress is saved as usual, and
+    an abort of the workload (including the one on SLA failure) reaches all
+    of them. The iterations are numbered in the order the agents report
+    them, so the hooks see every number once.
+
+    An agent is started on every host by `rally task agent --listen ADDRESS`
+    with the same `runner_agent_authkey` option as the task engine. The
+    address is either "<host>:<port>" or "unix:<path>". The context and the
+    arguments of the workload are sent to the agents, so the plugins the
+    workload uses should be available on every host.
+
+    .. code-block:: yaml
+
+        distributed:
+          agents: ["10.0.0.2:8000", "10.0.0.3:8000"]
+          runner:
+            constant:
+              times: 1000
+              concurrency: 40
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA7,
+        "properties": {
+            "agents": {
+                "type": "array",
+                "items": {"type": "string"},
+                "minItems": 1,
+                "uniqueItems": True,
+                "description": "Addresses of the agents.",
+            },
+            "runner": {
+                "type": "object",
+                "minProperties": 1,
+                "maxProperties": 1,
+                "additionalProperties": True,
+                "description": "The runner which generates the load on "
+                "every agent, in the same format as the runner of the "
+                "workload.",
+            },
+        },
+        "required": ["agents", "runner"],
+        "additionalProperties": False,
+    }
+
+    def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._connections: list[multiprocessing.connection.Connection] = []
+        self._connections_lock = threading.Lock()
+
+    def abort(self) -> None:
+        """Abort the load of all agents."""
+        super().abort()
+        with self._connections_lock:
+            for conn in self._connections:
+                try:
+                    conn.send({"abort": True})
+                except OSError:
+                    # the agent has already finished
+                    pass
+
+    def _run_scenario(
+        self,
+        cls: type[scenario.Scenario],
+        method_name: t.Literal["run"],
+        context: dict[str, t.Any],
+        args: dict[str, t.Any],
+    ) -> None:
+        """Runs the specified scenario on the agents.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Context that contains users, admin & other
+                        information, that was created before scenario
+                        execution starts.
+        :param args: Arguments to call the scenario method with
+        """
+        name, runner_cfg = next(iter(self.config["runner"].items()))
+        shares = split_config(runner_cfg, len(self.config["agents"]))
+
+        self._log_debug_info(runner=name, agents=self.config["agents"])
+
+        # every agent has its own task object
+        context = {k: v for k, v in context.items() if k != "task"}
+        agents = {}
+        try:
+            for address, share in zip(self.config["agents"], shares):
+                if share is None:
+                    continue
+                conn = agent.connect(address)
+                agents[conn] = address
+                conn.send(
+                    {
+                        "task": self.task["uuid"],
+                        "runner": name,
+                        "config": share,
+                        "sla": self.workload_sla,
+                        "scenario": cls.get_name(),
+                        "context": context,
+                        "args": args,
+                    }
+                )
+                with self._connections_lock:
+                    self._connections.append(conn)
+                if self.aborted.is_set():
+                    conn.send({"abort": True})
+
+            failures = self._collect(agents)
+        finally:
+            with self._connections_lock:
+                self._connections = []
+            for conn in agents:
+                conn.close()
+        self._flush_results()
+
+        if failures:
+            raise exceptions.AgentFailure(
+                agent=", ".join(failures),
+                message="\n".join(failures.values()),
+            )
+
+    def _collect(
+        self, agents: dict[multiprocessing.connection.Connection, str]
+    ) -> dict[str, str]:
+        """Receive the results of the agents until all of them finish.
+
+        If an agent fails, the rest of them are aborted.
+
+        :param agents: the connections to the agents and their addresses
+        :returns: the error messages of the failed agents by their addresses
+        """
+        failures = {}
+        running = dict(agents)
+        # every agent numbers its iterations from 1, while the hooks expect
+        # the numbers to be unique within the workload
+        iterations = itertools.count(1)
+        while running:
+            ready = t.cast(
+                list[multiprocessing.connection.Connection],
+                multiprocessing.connection.wait(list(running)),
+            )
+            for conn in ready:
+                address = running[conn]
+                message: dict[str, t.Any]
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    message = {
+                        "finished": True,
+                        "error": ["", "Connection is lost."],
+                    }
+                for result in message.get("results", []):
+                    self._send_result(result)
+                for event in message.get("events", []):
+                    if event["type"] == "iteration":
+                        event = dict(event, value=next(iterations))
+                    self.send_event(**event)
+                if not message.get("finished"):
+                    continue
+                del running[conn]
+                if message["error"]:
+                    LOG.error(
+                        "Task %s | Agent %s failed: %s"
+                        % (self.task["uuid"], address, message["error"][1])
+                    )
+                    failures[address] = message["error"][1]
+                    self.abort()
+        return failures
@@ -17,7 +17,7 @@ from __future__ import annotations
 
 import collections
 import multiprocessing
-import queue as Queue
+import random
 import threading
 import time
 import typing as t
@@ -36,7 +36,7 @@ LOG = logging.getLogger(__name__)
 
 
 def _worker_process(
-    queue: multiprocessing.Queue[runner.ScenarioRunnerResult],
+    queue: runner.transport.BatchedResultQueue,
     iteration_gen: t.Iterator[int],
     timeout: float | None,
     times: int,
@@ -47,9 +47,12 @@ def _worker_process(
     args: dict[str, t.Any],
     event_queue: multiprocessing.Queue[dict[str, t.Any]],
     aborted: multiprocessing.synchronize.Event,
-    runs_per_second: t.Callable[[dict[str, float] | float, float, int], float],
+    runs_per_second: t.Callable[..., float],
     rps_cfg: dict[str, float] | float,
     processes_to_start: int,
+    open_loop: bool,
+    arrivals: dict[str, t.Any] | None,
+    phases: runner.LoadPhases,
     info: dict[str, t.Any],
 ) -> None:
     """Start scenario within threads.
@@ -58,6 +61,16 @@ def _worker_process(
     result to queue. A maximum of max_concurrent threads will be ran
     concurrently.
 
+    In the open-loop mode every iteration has the start time which the
+    schedule intends for it. An iteration which can not be started in time,
+    because all concurrent slots are busy, is started as soon as a slot is
+    free, the rest of the schedule does not move and the intended start time
+    is reported as the `scheduled_at` field of the result.
+
+    The intervals between the iterations follow the arrivals distribution,
+    if it is given. Without the open-loop mode an iteration started late
+    moves the rest of the schedule.
+
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
     :param timeout: operation's timeout
@@ -73,6 +86,9 @@ def _worker_process(
     :param rps_cfg: rps section from task config
     :param processes_to_start: int, number of started processes for scenario
                                execution
+    :param open_loop: start the iterations at the times fixed by the schedule
+    :param arrivals: arrivals section from task config
+    :param phases: the warm-up and the cool-down of the load
     :param info: info about all processes count and counter of runned process
     """
 
@@ -97,39 +113,74 @@ def _worker_process(
     )
 
     start = time.time()
-    timeout_queue: Queue.Queue[
-        tuple[threading.Thread, float] | tuple[None, None]
-    ] = Queue.Queue()
-
+    timeout_service = utils.TimeoutService()
     if timeout:
-        collector_thr_by_timeout = threading.Thread(
-            target=utils.timeout_thread, args=(timeout_queue,)
+        timeout_service.start()
+
+    schedule = None
+    if open_loop or arrivals:
+        schedule = _Schedule(
+            rps_cfg,
+            start,
+            processes_to_start,
+            runs_per_second,
+            arrivals=arrivals,
+            worker=info["processes_counter"],
         )
-        collector_thr_by_timeout.start()
 
     i = 0
     while i < times and not aborted.is_set():
-        scenario_context = runner._get_scenario_context(
-            next(iteration_gen), context
-        )
-        worker_args = (
-            queue,
-            cls,
-            method_name,
-            scenario_context,
-            args,
-            event_queue,
-        )
+        scheduled_at = None
+        if schedule is not None:
+            scheduled_at = schedule.next_start
+            if not runner._wait_for_start(
+                pool, max_concurrent, scheduled_at, aborted
+            ):
+                break
+            if open_loop:
+                schedule.advance(scheduled_at)
+            else:
+                schedule.advance(max(scheduled_at, time.time()))
+
+        iteration = next(iteration_gen)
+        scenario_context = runner._get_scenario_context(iteration, context)
+        elapsed = time.time() - start if phases.timed else 0
         thread = threading.Thread(
-            target=runner._worker_thread, args=worker_args
+            target=runner._worker_thread,
+            args=(
+                queue,
+                cls,
+                method_name,
+                scenario_context,
+                args,
+                event_queue,
+            ),
+            kwargs={
+                "scheduled_at": scheduled_at if open_loop else None,
+                "timeout_service": timeout_service,
+                "timeout": timeout,
+                "phase": phases.get(iteration, elapsed),
+            },
         )
 
         i += 1
         thread.start()
-        if timeout:
-            timeout_queue.put((thread, time.time() + timeout))
         pool.append(thread)
 
+        if scheduled_at is not None:
+            LOG.debug(
+                "Worker: %s started %.3f sec after the scheduled time "
+                "(requested rps: %s)"
+                % (
+                    i,
+                    time.time() - scheduled_at,
+                    runs_per_second(
+                        rps_cfg, start, processes_to_start, scheduled_at
+                    ),
+                )
+            )
+            continue
+
         time_gap = time.time() - start
         real_rps = i / time_gap if time_gap else "Infinity"
 
@@ -156,15 +207,77 @@ def _worker_process(
 
     while pool:
         pool.popleft().join()
+    queue.flush()
 
     if timeout:
-        timeout_queue.put(
-            (
-                None,
-                None,
-            )
+        timeout_service.stop()
+
+
+class _Schedule:
+    """Start times of the iterations of a worker.
+
+    The interval between two iterations is drawn from the arrivals
+    distribution with the mean given by the requested rps at the start of
+    the first of them. The random numbers of every worker are generated from
+    the seed of the distribution and the number of the worker, so a task
+    with a seed makes the same schedule each time it is started.
+    """
+
+    def __init__(
+        self,
+        rps_cfg: dict[str, float] | float,
+        start_timer: float,
+        number_of_processes: int,
+        runs_per_second: t.Callable[..., float],
+        arrivals: dict[str, t.Any] | None = None,
+        worker: int = 0,
+    ) -> None:
+        self._rps_cfg = rps_cfg
+        self._start_timer = start_timer
+        self._number_of_processes = number_of_processes
+        self._runs_per_second = runs_per_second
+        self._arrivals = arrivals or {"distribution": "constant"}
+        seed = self._arrivals.get("seed")
+        self._random = random.Random(
+            None if seed is None else "%s:%s" % (seed, worker)
+        )
+        if self._arrivals["distribution"] == "custom":
+            samples = self._arrivals["intervals"]
+            self._samples_mean = sum(samples) / len(samples)
+        # the rps of a ramp is not allowed to drop below its start value,
+        # otherwise the first interval could be endless
+        if isinstance(rps_cfg, dict):
+            self._lowest_rps = float(rps_cfg["start"]) / number_of_processes
+        else:
+            self._lowest_rps = float(rps_cfg) / number_of_processes
+        self.next_start = start_timer
+
+    def _interval(self, mean: float) -> float:
+        distribution = self._arrivals["distribution"]
+        if distribution == "poisson":
+            return self._random.expovariate(1.0 / mean)
+        elif distribution == "uniform":
+            jitter = self._arrivals["jitter"]
+            return mean * self._random.uniform(1 - jitter, 1 + jitter)
+        elif distribution == "custom":
+            sample = self._random.choice(self._arrivals["intervals"])
+            return mean * sample / self._samples_mean
+        return mean
+
+    def advance(self, since: float) -> float:
+        """Schedule the next iteration.
+
+        :param since: the time from which the interval is counted, i.e. the
+            start time of the previous iteration
+        :returns: the start time of the next iteration
+        """
+        rps = self._runs_per_second(
+            self._rps_cfg, self._start_timer, self._number_of_processes, since
+        )
+        self.next_start = since + self._interval(
+            1.0 / max(rps, self._lowest_rps)
         )
-        collector_thr_by_timeout.join()
+        return self.next_start
 
 
 @validation.configure("check_rps")
@@ -182,18 +295,31 @@ class CheckPRSValidator(validation.Validator):
             if plugin_cfg["rps"]["end"] < plugin_cfg["rps"]["start"]:
                 msg = "rps end value must not be less than rps start value."
                 self.fail(msg)
+        arrivals = (plugin_cfg or {}).get("arrivals") or {}
+        if arrivals.get("distribution") == "custom":
+            if not any(arrivals["intervals"]):
+                self.fail("arrivals intervals must not be all zero.")
+        error = runner.LoadPhases.check(plugin_cfg or {})
+        if error:
+            self.fail(error)
 
 
 def _runs_per_second(
     rps_cfg: dict[str, float] | float,
     start_timer: float,
     number_of_processes: int,
+    now: float | None = None,
 ) -> float:
-    """At the given second return desired rps."""
+    """At the given second return desired rps.
+
+    :param now: the moment to return rps for, the current time by default
+    """
 
     if not isinstance(rps_cfg, dict):
         return float(rps_cfg) / number_of_processes
-    stage_order = (time.time() - start_timer) / rps_cfg.get("duration", 1) - 1
+    if now is None:
+        now = time.time()
+    stage_order = (now - start_timer) / rps_cfg.get("duration", 1) - 1
     rps = (
         float(rps_cfg["start"] + rps_cfg["step"] * stage_order)
         / number_of_processes
@@ -214,6 +340,15 @@ class RPSScenarioRunner(runner.ScenarioRunner):
     An example of a rps scenario is booting 1 VM per second. This
     execution type is thus very helpful in understanding the maximal load that
     a certain cloud can handle.
+
+    With `open_loop` enabled, iterations are started at the times given by
+    the schedule instead of catching up with the requested rps, and the
+    latency measured from those times is reported along with the durations.
+
+    The `arrivals` section makes the intervals between the iterations random,
+    e.g. a Poisson process instead of evenly spaced requests, since the
+    bursts of real traffic make the services queue the requests. The random
+    numbers are reproducible if the seed is given.
     """
 
     CONFIG_SCHEMA = {
@@ -251,6 +386,88 @@ class RPSScenarioRunner(runner.ScenarioRunner):
             },
             "max_concurrency": {"type": "integer", "minimum": 1},
             "max_cpu_count": {"type": "integer", "minimum": 1},
+            "arrivals": {
+                "description": "Distribution of the intervals between the "
+                "iterations. Its mean follows the requested rps. The "
+                "iterations are evenly spaced by default.",
+                "oneOf": [
+                    {
+                        "description": "Evenly spaced iterations.",
+                        "type": "object",
+                        "properties": {
+                            "distribution": {"enum": ["constant"]},
+                        },
+                        "required": ["distribution"],
+                        "additionalProperties": False,
+                    },
+                    {
+                        "description": "Exponentially distributed "
+                        "intervals, i.e. the iterations arrive as a Poisson "
+                        "process.",
+                        "type": "object",
+                        "properties": {
+                            "distribution": {"enum": ["poisson"]},
+                            "seed": {"type": "integer"},
+                        },
+                        "required": ["distribution"],
+                        "additionalProperties": False,
+                    },
+                    {
+                        "description": "Intervals which deviate from the "
+                        "mean by up to `jitter` part of it, uniformly.",
+                        "type": "object",
+                        "properties": {
+                            "distribution": {"enum": ["uniform"]},
+                            "jitter": {
+                                "type": "number",
+                                "minimum": 0,
+                                "maximum": 1,
+                            },
+                            "seed": {"type": "integer"},
+                        },
+                        "required": ["distribution", "jitter"],
+                        "additionalProperties": False,
+                    },
+                    {
+                        "description": "Intervals randomly picked from the "
+                        "given samples, scaled so their mean is the one of "
+                        "the requested rps.",
+                        "type": "object",
+                        "properties": {
+                            "distribution": {"enum": ["custom"]},
+                            "intervals": {
+                                "type": "array",
+                                "items": {
+                                    "type": "number",
+                                    "minimum": 0,
+                                },
+                                "minItems": 1,
+                            },
+                            "seed": {"type": "integer"},
+                        },
+                        "required": ["distribution", "intervals"],
+                        "additionalProperties": False,
+                    },
+                ],
+            },
+            "open_loop": {
+                "type": "boolean",
+                "description": "Start every iteration at the time fixed by "
+                "the schedule, even if earlier iterations were started "
+                "late because of max_concurrency. The scheduled time is "
+                "saved with the results, so the latency includes the "
+                "time the iteration waited for its start.",
+            },
+            "warmup": runner.LoadPhases.schema(
+                "The first iterations, or the iterations started within the "
+                "first seconds, of the load. They are run and saved, but the "
+                "SLA and the statistics of durations ignore them."
+            ),
+            "cooldown": runner.LoadPhases.schema(
+                "The last iterations of the load which the SLA and the "
+                "statistics of durations ignore.",
+                units=("iterations",),
+            ),
         },
         "required": ["times", "rps"],
         "additionalProperties": False,
@@ -310,9 +527,7 @@ class RPSScenarioRunner(runner.ScenarioRunner):
             concurrency_overhead=concurrency_overhead,
         )
 
-        result_queue: multiprocessing.Queue[runner.ScenarioRunnerResult] = (
-            multiprocessing.Queue()
-        )
+        result_queue = self._create_result_queue(processes_to_start)
         event_queue: multiprocessing.Queue[dict[str, t.Any]] = (
             multiprocessing.Queue()
         )
@@ -348,6 +563,9 @@ class RPSScenarioRunner(runner.ScenarioRunner):
                     _runs_per_second,
                     self.config["rps"],
                     processes_to_start,
+                    self.config.get("open_loop", False),
+                    self.config.get("arrivals"),
+                    runner.LoadPhases(self.config, times=times),
                 )
                 if times_overhead:
                     times_overhead -= 1
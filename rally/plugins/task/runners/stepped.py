@@ -0,0 +1,257 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import time
+import typing as t
+
+from rally import consts
+from rally.common import utils
+from rally.plugins.task.runners import constant
+from rally.task import runner
+
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from rally.task import scenario
+
+
+def _get_stage(
+    stages: list[dict[str, t.Any]], elapsed: float
+) -> tuple[int, int] | None:
+    """Find the stage of the load and its concurrency at the given moment.
+
+    The concurrency of a stage with "ramp" goes linearly from the one of
+    the previous stage (0 for the first stage) to its own over its duration.
+
+    :param stages: the stages of the load
+    :param elapsed: seconds since the load started
+    :returns: a pair of the number of the stage and the concurrency, or None
+        if the load is over
+    """
+    previous = 0
+    for number, stage in enumerate(stages):
+        if elapsed < stage["duration"]:
+            concurrency = stage["concurrency"]
+            if stage.get("ramp"):
+                progress = elapsed / stage["duration"]
+                concurrency = max(
+                    1,
+                    math.ceil(previous + (concurrency - previous) * progress),
+                )
+            return number, concurrency
+        elapsed -= stage["duration"]
+        previous = stage["concurrency"]
+    return None
+
+
+def _starts_in(
+    stages: list[dict[str, t.Any]], elapsed: float, slot: int
+) -> float:
+    """Find when the concurrency of the load gets above the slot.
+
+    :param stages: the stages of the load
+    :param elapsed: seconds since the load started
+    :param slot: the number of the slot
+    :returns: seconds until the slot may run iterations, or until the end of
+        the load if it may not run them anymore
+    """
+    previous = 0
+    start = 0.0
+    for stage in stages:
+        end = start + stage["duration"]
+        concurrency = stage["concurrency"]
+        if elapsed < end and concurrency > slot:
+            if stage.get("ramp") and previous <= slot:
+                # the concurrency of the ramp gets above the slot once
+                # previous + (concurrency - previous) * progress > slot
+                start += (
+                    stage["duration"]
+                    * (slot - previous)
+                    / (concurrency - previous)
+                )
+            return start - elapsed
+        previous = concurrency
+        start = end
+    return start - elapsed
+
+
+class _Stages(constant.SlotSchedule):
+    """The schedule of the slots which follows the stages of the load.
+
+    A slot runs iterations only while its number is less than the
+    concurrency of the current stage and sleeps until the stage which lets
+    it run otherwise, so all workers follow the stages without talking to
+    each other. The number of the stage and the concurrency are reported as
+    the `stage` and `concurrency` fields of the result.
+    """
+
+    def __init__(
+        self, stages: list[dict[str, t.Any]], started_at: float
+    ) -> None:
+        """Create the schedule.
+
+        :param stages: the stages of the load
+        :param started_at: the time at which the load starts
+        """
+        self.stages = stages
+        self.started_at = started_at
+
+    def wait(
+        self, slot: int, aborted: multiprocessing.synchronize.Event
+    ) -> dict[str, t.Any] | None:
+        while not aborted.is_set():
+            elapsed = time.time() - self.started_at
+            stage = _get_stage(self.stages, elapsed)
+            if stage is None:
+                break
+            number, concurrency = stage
+            if slot < concurrency:
+                return {"stage": number, "concurrency": concurrency}
+            # the moment is not exact because of the float arithmetic, so
+            # the slot does not wake up too often around it
+            aborted.wait(max(_starts_in(self.stages, elapsed, slot), 0.001))
+        return None
+
+
+@runner.configure(name="stepped_concurrency")
+class SteppedConcurrencyScenarioRunner(runner.ScenarioRunner):
+    """Scenario runner that runs a sequence of concurrency stages.
+
+    Every stage keeps its concurrency for its duration, or, if "ramp" is
+    set, changes it linearly from the concurrency of the previous stage, so
+    a step or a ramp load is generated by a single workload with a single
+    context setup and cleanup:
+
+    .. code-block:: yaml
+
+        stepped_concurrency:
+          stages:
+            - {concurrency: 10, duration: 60}
+            - {concurrency: 50, duration: 60, ramp: true}
+            - {concurrency: 100, duration: 60}
+
+    An iteration keeps running when its stage is over, but the next stage
+    does not start new iterations in the slots above its concurrency. Every
+    iteration result has the number of its stage (from 0) as the `stage`
+    field, the report shows the durations of every stage.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA7,
+        "properties": {
+            "stages": {
+                "type": "array",
+                "minItems": 1,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "concurrency": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "description": "The number of iterations "
+                            "in flight.",
+                        },
+                        "duration": {
+                            "type": "number",
+                            "minimum": 0,
+                            "description": "Duration of the stage in "
+                            "seconds.",
+                        },
+                        "ramp": {
+                            "type": "boolean",
+                            "description": "Change the concurrency "
+                            "linearly from the one of the previous stage "
+                            "over the duration of the stage.",
+                        },
+                    },
+                    "required": ["concurrency", "duration"],
+                    "additionalProperties": False,
+                },
+                "description": "The stages of the load in the order of "
+                "their execution.",
+            },
+            "timeout": {
+                "type": "number",
+            },
+            "max_cpu_count": {"type": "integer", "minimum": 1},
+        },
+        "required": ["stages"],
+        "additionalProperties": False,
+    }
+
+    def _run_scenario(
+        self,
+        cls: type[scenario.Scenario],
+        method_name: t.Literal["run"],
+        context: dict[str, t.Any],
+        args: dict[str, t.Any],
+    ) -> None:
+        """Runs the specified scenario stage by stage.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Context that contains users, admin & other
+                        information, that was created before scenario
+                        execution starts.
+        :param args: Arguments to call the scenario method with
+        """
+        stages = self.config["stages"]
+        timeout = self.config.get("timeout", 0)  # 0 means no timeout
+
+        cpu_count = multiprocessing.cpu_count()
+        max_cpu_used = min(
+            cpu_count, self.config.get("max_cpu_count", cpu_count)
+        )
+        max_concurrency = max(s["concurrency"] for s in stages)
+        processes_to_start = min(max_cpu_used, max_concurrency)
+
+        self._log_debug_info(
+            stages=stages,
+            timeout=timeout,
+            max_cpu_used=max_cpu_used,
+            processes_to_start=processes_to_start,
+        )
+
+        result_queue = self._create_result_queue(processes_to_start)
+        event_queue: multiprocessing.Queue[dict[str, t.Any]] = (
+            multiprocessing.Queue()
+        )
+        # the workers stop when the last stage ends, so the iteration
+        # numbers are not leased in blocks, see
+        # ConstantForDurationScenarioRunner
+        iteration_gen = utils.RAMInt()
+        schedule = _Stages(stages, time.time())
+
+        def worker_args_gen() -> t.Generator[tuple[t.Any, ...], None, None]:
+            while True:
+                yield (
+                    result_queue,
+                    iteration_gen,
+                    schedule,
+                    max_concurrency,
+                    timeout,
+                    context,
+                    cls,
+                    method_name,
+                    args,
+                    event_queue,
+                    self.aborted,
+                )
+
+        process_pool = self._create_process_pool(
+            processes_to_start, constant.slot_worker_process, worker_args_gen()
+        )
+        self._join_processes(process_pool, result_queue, event_queue)
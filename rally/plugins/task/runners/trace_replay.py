@@ -0,0 +1,320 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import annotations
+
+import collections
+import json
+import multiprocessing
+import os
+import threading
+import time
+import typing as t
+
+from rally import consts
+from rally.common import utils
+from rally.common import validation
+from rally.task import runner
+
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from rally.task import scenario
+
+
+def _read_trace(
+    path: str, worker: int = 0, workers: int = 1
+) -> t.Iterator[tuple[int, dict[str, t.Any]]]:
+    """Read the records of the trace which belong to the worker.
+
+    The file is read line by line. Every non-empty line is a record: either
+    an offset in seconds or an object with the "offset" and, optionally, the
+    "args" keys. The records are numbered from 0 and the worker gets every
+    `workers`-th of them, so the lines of other workers are not parsed.
+
+    :param path: path to the trace file
+    :param worker: number of the worker
+    :param workers: total number of workers
+    :returns: generator of pairs of the number of a record and the record
+    """
+    with open(os.path.expanduser(path)) as f:
+        number = -1
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            number += 1
+            if number % workers != worker:
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                record = {"offset": record}
+            yield number, record
+
+
+def _worker_process(
+    queue: runner.transport.BatchedResultQueue,
+    trace: str,
+    started_at: float,
+    speed: float,
+    timeout: float | None,
+    max_concurrent: float,
+    context: dict[str, t.Any],
+    cls: type[scenario.Scenario],
+    method_name: str,
+    args: dict[str, t.Any],
+    event_queue: multiprocessing.Queue[dict[str, t.Any]],
+    aborted: multiprocessing.synchronize.Event,
+    info: dict[str, t.Any],
+) -> None:
+    """Start the iterations of the records of the trace within threads.
+
+    Every record is started at `started_at` plus its offset divided by
+    `speed`. If it can not be started in time, because all concurrent slots
+    are busy, it is started as soon as a slot is free and the rest of the
+    records keep their times. The intended start time is reported as the
+    `scheduled_at` field of the result.
+
+    :param queue: queue object to append results
+    :param trace: path to the trace file
+    :param started_at: the time at which the replay starts
+    :param speed: how many times faster than recorded the trace is replayed
+    :param timeout: operation's timeout
+    :param max_concurrent: maximum worker concurrency
+    :param context: scenario context object
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args, the args of a record override them
+    :param event_queue: queue object to append events
+    :param aborted: multiprocessing.Event that aborts load generation if
+                    the flag is set
+    :param info: info about all processes count and counter of runned process
+    """
+    pool: collections.deque[threading.Thread] = collections.deque()
+
+    runner._log_worker_info(
+        trace=trace,
+        speed=speed,
+        timeout=timeout,
+        max_concurrent=max_concurrent,
+        cls=cls,
+        method_name=method_name,
+        args=args,
+    )
+
+    timeout_service = utils.TimeoutService()
+    if timeout:
+        timeout_service.start()
+
+    records = _read_trace(
+        trace, info["processes_counter"], info["processes_to_start"]
+    )
+    for number, record in records:
+        scheduled_at = started_at + record["offset"] / speed
+        if not runner._wait_for_start(
+            pool, max_concurrent, scheduled_at, aborted
+        ):
+            break
+
+        scenario_args = args
+        if record.get("args"):
+            scenario_args = dict(args, **record["args"])
+        worker_args = (
+            queue,
+            cls,
+            method_name,
+            runner._get_scenario_context(number, context),
+            scenario_args,
+            event_queue,
+            scheduled_at,
+            timeout_service,
+            timeout,
+        )
+        thread = threading.Thread(
+            target=runner._worker_thread, args=worker_args
+        )
+        thread.start()
+        pool.append(thread)
+
+    while pool:
+        pool.popleft().join()
+    queue.flush()
+
+    if timeout:
+        timeout_service.stop()
+
+
+@validation.configure("check_trace")
+class CheckTraceValidator(validation.Validator):
+    """Check that the trace file of trace_replay runner can be replayed."""
+
+    def validate(
+        self,
+        context: dict[str, t.Any],
+        config: dict[str, t.Any] | None,
+        plugin_cls: type[runner.plugin.Plugin],
+        plugin_cfg: dict[str, t.Any] | None,
+    ) -> None:
+        if not plugin_cfg:
+            return
+        path = plugin_cfg["trace"]
+        if not os.access(os.path.expanduser(path), os.R_OK):
+            self.fail("Could not read the trace file %s." % path)
+        number = -1
+        try:
+            for number, record in _read_trace(path):
+                offset = record.get("offset")
+                if (
+                    isinstance(offset, bool)
+                    or not isinstance(offset, (int, float))
+                    or offset < 0
+                ):
+                    self.fail(
+                        "Record #%s of the trace %s has no valid offset."
+                        % (number + 1, path)
+                    )
+                if not isinstance(record.get("args", {}), dict):
+                    self.fail(
+                        "Arguments of record #%s of the trace %s should be "
+                        "an object." % (number + 1, path)
+                    )
+        except ValueError as e:
+            self.fail(
+                "Record #%s of the trace %s is not valid JSON: %s"
+                % (number + 2, path, e)
+            )
+
+
+@validation.add("check_trace")
+@runner.configure(name="trace_replay")
+class TraceReplayScenarioRunner(runner.ScenarioRunner):
+    """Scenario runner that replays the recorded arrivals of requests.
+
+    The trace is a file with a record per line. A record is either a number,
+    the offset in seconds from the beginning of the replay at which an
+    iteration starts, or a JSON object with the "offset" key and the
+    optional "args" key, the scenario arguments which override the ones of
+    the workload for this iteration only:
+
+    .. code-block:: text
+
+        0.0
+        {"offset": 0.25, "args": {"sleep": 0.5}}
+        {"offset": 1.5}
+
+    The records are expected to be sorted by offset. The trace is never
+    loaded at once, every worker process streams it and takes every N-th
+    record, so a timeline of any length can be replayed.
+    """
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA7,
+        "properties": {
+            "trace": {
+                "type": "string",
+                "description": "Path to the trace file.",
+            },
+            "speed": {
+                "type": "number",
+                "exclusiveMinimum": 0,
+                "minimum": 0,
+                "description": "How many times faster than recorded the "
+                "trace is replayed.",
+            },
+            "timeout": {
+                "type": "number",
+            },
+            "max_concurrency": {"type": "integer", "minimum": 1},
+            "max_cpu_count": {"type": "integer", "minimum": 1},
+        },
+        "required": ["trace"],
+        "additionalProperties": False,
+    }
+
+    def _run_scenario(
+        self,
+        cls: type[scenario.Scenario],
+        method_name: t.Literal["run"],
+        context: dict[str, t.Any],
+        args: dict[str, t.Any],
+    ) -> None:
+        """Runs the specified scenario at the offsets of the trace.
+
+        :param cls: The Scenario class where the scenario is implemented
+        :param method_name: Name of the method that implements the scenario
+        :param context: Context that contains users, admin & other
+                        information, that was created before scenario
+                        execution starts.
+        :param args: Arguments to call the scenario method with
+        """
+        trace = self.config["trace"]
+        speed = self.config.get("speed", 1)
+        timeout = self.config.get("timeout", 0)  # 0 means no timeout
+
+        cpu_count = multiprocessing.cpu_count()
+        max_cpu_used = min(
+            cpu_count, self.config.get("max_cpu_count", cpu_count)
+        )
+        max_concurrency = self.config.get("max_concurrency")
+        processes_to_start = min(max_cpu_used, max_concurrency or cpu_count)
+
+        # Determine concurrency per worker, unlimited if it is not set
+        concurrency_per_worker: float = float("inf")
+        concurrency_overhead = 0
+        if max_concurrency:
+            concurrency_per_worker, concurrency_overhead = divmod(
+                max_concurrency, processes_to_start
+            )
+
+        self._log_debug_info(
+            trace=trace,
+            speed=speed,
+            timeout=timeout,
+            max_cpu_used=max_cpu_used,
+            processes_to_start=processes_to_start,
+            concurrency_per_worker=concurrency_per_worker,
+            concurrency_overhead=concurrency_overhead,
+        )
+
+        result_queue = self._create_result_queue(processes_to_start)
+        event_queue: multiprocessing.Queue[dict[str, t.Any]] = (
+            multiprocessing.Queue()
+        )
+        started_at = time.time()
+
+        def worker_args_gen(
+            concurrency_overhead: int,
+        ) -> t.Generator[tuple[t.Any, ...], None, None]:
+            while True:
+                yield (
+                    result_queue,
+                    trace,
+                    started_at,
+                    speed,
+                    timeout,
+                    concurrency_per_worker + (concurrency_overhead and 1),
+                    context,
+                    cls,
+                    method_name,
+                    args,
+                    event_queue,
+                    self.aborted,
+                )
+                if concurrency_overhead:
+                    concurrency_overhead -= 1
+
+        process_pool = self._create_process_pool(
+            processes_to_start,
+            _worker_process,
+            worker_args_gen(concurrency_overhead),
+        )
+        self._join_processes(process_pool, result_queue, event_queue)
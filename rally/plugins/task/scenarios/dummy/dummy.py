@@ -12,6 +12,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import random
 import typing as t
 
@@ -78,6 +79,21 @@ class Dummy(scenario.Scenario):
         self.foo(sleep)
 
 
+@scenario.configure(name="Dummy.dummy_async")
+class DummyAsync(scenario.Scenario):
+    async def run(self, sleep: float = 0) -> None:
+        """Do nothing and asynchronously sleep for the given number of seconds.
+
+        Dummy.dummy_async is a coroutine counterpart of Dummy.dummy. It can
+        be used for testing the ability of the constant_async runner to keep
+        a lot of iterations in flight.
+
+        :param sleep: idle time of method (in seconds).
+        """
+        with atomic.ActionTimer(self, "sleep"):
+            await asyncio.sleep(sleep)
+
+
 @validation.add(
     "number",
     param_name="size_of_message",
@@ -0,0 +1,268 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Delivery of the abort requests to the task engine running the task.
+
+The task engine listens on a UNIX datagram socket under the Rally home
+directory while it runs the task, and `rally task abort` sends the request
+to it right after it has changed the status of the task in the database.
+The status in the database is still checked every `task_abort_poll_interval`
+seconds, so the task is aborted even if the request can not be delivered,
+e.g. when the task is aborted from another host.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import types
+
+from rally import consts
+from rally import exceptions
+from rally.common import cfg
+from rally.common import logging
+from rally.common import objects
+
+
+LOG = logging.getLogger(__name__)
+
+CONF_OPTS = [
+    cfg.FloatOpt(
+        "task_abort_poll_interval",
+        default=2.0,
+        min=0.1,
+        help="How often in seconds the task engine checks the status of the "
+        "running task in the database, in case a request to abort the task "
+        "was not delivered to it directly.",
+    ),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(CONF_OPTS)
+
+_SOFT = b"soft"
+_HARD = b"hard"
+_WAKE_UP = b"wake-up"
+
+
+def get_path(task_uuid: str) -> str:
+    """Return the path of the socket of the task engine running the task."""
+    return os.path.expanduser("~/.rally/tasks/%s.sock" % task_uuid)
+
+
+def notify(task_uuid: str, soft: bool = False) -> bool:
+    """Ask the task engine running the task to abort it.
+
+    The status of the task should be changed in the database first, the
+    request only saves the engine from waiting for the next check of it.
+
+    :param task_uuid: the UUID of the task
+    :param soft: abort the task after the running workload
+    :returns: whether the request was delivered
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        try:
+            sock.sendto(_SOFT if soft else _HARD, get_path(task_uuid))
+        except OSError:
+            return False
+    return True
+
+
+def is_listening(task_uuid: str) -> bool:
+    """Check whether a task engine running the task listens on this host.
+
+    :param task_uuid: the UUID of the task
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        try:
+            # nothing is sent, but it fails if nobody is bound to the socket
+            sock.connect(get_path(task_uuid))
+        except OSError:
+            return False
+    return True
+
+
+class AbortChannel:
+    """Receiver of the abort requests of the task.
+
+    The requests come either from notify() or from the status of the task
+    in the database. A channel which is not started or failed to listen on
+    its socket checks the database each time it is asked.
+    """
+
+    def __init__(self, task_uuid: str) -> None:
+        """Create the channel.
+
+        :param task_uuid: the UUID of the task
+        """
+        self.task_uuid = task_uuid
+        self.path = get_path(task_uuid)
+        # set when no more workloads should be started
+        self.soft = threading.Event()
+        # set when the running workload should be stopped as well
+        self.hard = threading.Event()
+        self._cond = threading.Condition()
+        self._sock: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def __enter__(self) -> AbortChannel:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        exc_traceback: types.TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    @property
+    def listening(self) -> bool:
+        return self._thread is not None
+
+    def start(self, poll: bool = True) -> None:
+        """Start listening for the abort requests.
+
+        :param poll: check the status of the task in the database at once,
+            since the request could be sent before the socket was bound;
+            if the status is about to be replaced, e.g. the task being
+            resumed has the status it was aborted with, poll() should be
+            called after that instead
+        :raises RallyException: if another task engine listens for the
+            abort requests of the task, i.e. it runs the task already
+        """
+        if is_listening(self.task_uuid):
+            raise exceptions.RallyException(
+                "Task %s is already run by another task engine which "
+                "listens on %s." % (self.task_uuid, self.path)
+            )
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            if os.path.exists(self.path):
+                # left by the engine which crashed
+                os.unlink(self.path)
+            sock.bind(self.path)
+            os.chmod(self.path, 0o600)
+        except OSError as e:
+            sock.close()
+            LOG.warning(
+                "Task %s | Failed to listen for abort requests on %s, the "
+                "status of the task will be checked in the database "
+                "instead: %s" % (self.task_uuid, self.path, e)
+            )
+            return
+        sock.settimeout(CONF.task_abort_poll_interval)
+        self._sock = sock
+        if poll:
+            self.poll()
+        self._thread = threading.Thread(
+            target=self._listen, args=(sock,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop listening for the abort requests."""
+        if self._thread is None or self._sock is None:
+            return
+        self._stopped.set()
+        # closing of the socket does not interrupt recv() which is waiting
+        # in another thread, so wake it up
+        notify_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        with notify_sock:
+            try:
+                notify_sock.sendto(_WAKE_UP, self.path)
+            except OSError:
+                pass
+        self._thread.join()
+        self._thread = None
+        self._sock.close()
+        self._sock = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def _listen(self, sock: socket.socket) -> None:
+        while not self._stopped.is_set():
+            try:
+                message = sock.recv(16)
+            except TimeoutError:
+                self.poll()
+                continue
+            except OSError:
+                return
+            if message in (_SOFT, _HARD):
+                LOG.info(
+                    "Task %s | Received a request to abort the task."
+                    % self.task_uuid
+                )
+                self.abort(soft=message == _SOFT)
+
+    def poll(self) -> bool:
+        """Check the status of the task in the database.
+
+        :returns: whether the task is being aborted
+        """
+        status = objects.Task.get_status(self.task_uuid)
+        if status == consts.TaskStatus.SOFT_ABORTING:
+            self.abort(soft=True)
+        elif status in (consts.TaskStatus.ABORTING, consts.TaskStatus.ABORTED):
+            self.abort()
+        else:
+            return False
+        return True
+
+    def abort(self, soft: bool = False) -> None:
+        """Mark the task as being aborted.
+
+        :param soft: abort the task after the running workload
+        """
+        with self._cond:
+            self.soft.set()
+            if not soft:
+                self.hard.set()
+            self._cond.notify_all()
+
+    def is_aborting(self, soft: bool = True) -> bool:
+        """Check whether the task is being aborted.
+
+        :param soft: take the soft abort into account
+        """
+        if not self.listening:
+            self.poll()
+        return (self.soft if soft else self.hard).is_set()
+
+    def wait(self, stop_event: threading.Event) -> bool:
+        """Wait until the task is aborted, not softly.
+
+        :param stop_event: stop waiting if this event is set; wake() should
+            be called after setting it
+        :returns: whether the task is aborted
+        """
+        with self._cond:
+            while not (self.hard.is_set() or stop_event.is_set()):
+                if self.listening:
+                    self._cond.wait()
+                else:
+                    self.poll()
+                    if not self.hard.is_set():
+                        self._cond.wait(CONF.task_abort_poll_interval)
+            return self.hard.is_set()
+
+    def wake(self) -> None:
+        """Wake up the threads waiting for the abort."""
+        with self._cond:
+            self._cond.notify_all()
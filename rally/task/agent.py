@@ -0,0 +1,228 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Agents which generate the load of workloads on behalf of the task engine.
+
+An agent listens on a TCP or a UNIX socket. The task engine (the
+coordinator) connects to it and sends the share of the load the agent
+should generate: the runner and its config, the scenario, the context and
+the arguments. The agent runs the runner as it would be run by the task
+engine itself and streams the results and the events back while the runner
+works. The coordinator may ask the agent to abort the load at any moment.
+
+The messages are pickled, so the connection is authenticated by
+`runner_agent_authkey` which must be the same for the agents and the task
+engine.
+"""
+
+from __future__ import annotations
+
+import multiprocessing.connection
+import socket
+import threading
+
+from rally import exceptions
+from rally.common import cfg
+from rally.common import logging
+from rally.common import objects
+from rally.task import runner
+from rally.task import scenario
+from rally.task import utils
+
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+# how often in seconds the results of a running load are sent to the
+# coordinator
+FORWARD_INTERVAL = 0.1
+
+
+def parse_address(address: str) -> tuple[str | tuple[str, int], str]:
+    """Parse the address of an agent.
+
+    :param address: "unix:<path>" for a UNIX socket or "<host>:<port>" for
+        a TCP one
+    :returns: a pair of the address and the family of the socket in the
+        format of multiprocessing.connection
+    """
+    if address.startswith("unix:"):
+        return address[len("unix:") :], "AF_UNIX"
+    host, _sep, port = address.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(
+            "Address '%s' of the agent should be either <host>:<port> or "
+            "unix:<path>." % address
+        )
+    return (host, int(port)), "AF_INET"
+
+
+def _get_authkey() -> bytes:
+    if not CONF.runner_agent_authkey:
+        raise exceptions.RallyException(
+            "The agents of distributed runner require the "
+            "runner_agent_authkey option to be set."
+        )
+    return CONF.runner_agent_authkey.encode()
+
+
+def connect(address: str) -> multiprocessing.connection.Connection:
+    """Connect to the agent.
+
+    :param address: the address of the agent
+    """
+    addr, family = parse_address(address)
+    return multiprocessing.connection.Client(
+        addr, family=family, authkey=_get_authkey()
+    )
+
+
+class Agent:
+    """Agent which runs the workloads sent by the task engine."""
+
+    def __init__(self, address: str) -> None:
+        """Create the agent.
+
+        :param address: the address to listen on, see parse_address()
+        """
+        self.address = address
+        addr, family = parse_address(address)
+        self._listener = multiprocessing.connection.Listener(
+            addr, family=family, authkey=_get_authkey()
+        )
+        self._closed = threading.Event()
+
+    def serve(self) -> None:
+        """Serve the workloads until the agent is closed.
+
+        Every connection of the task engine is served by its own thread,
+        so an agent may run several workloads at once.
+        """
+        LOG.info("Agent is listening on %s." % self.address)
+        while not self._closed.is_set():
+            try:
+                conn = self._listener.accept()
+            except (
+                multiprocessing.AuthenticationError,
+                EOFError,
+                ConnectionError,
+            ) as e:
+                if not self._closed.is_set():
+                    LOG.warning("Rejected a connection to the agent: %s" % e)
+                continue
+            except OSError:
+                # the listener is closed
+                return
+            threading.Thread(
+                target=self._handle, args=(conn,), daemon=True
+            ).start()
+
+    def close(self) -> None:
+        """Stop serving new workloads."""
+        self._closed.set()
+        # closing of the listener does not interrupt accept() which is
+        # waiting in another thread, so wake it up by connecting to it
+        addr, family = parse_address(self.address)
+        with socket.socket(getattr(socket, family)) as sock:
+            try:
+                sock.connect(addr)
+            except OSError:
+                pass
+        self._listener.close()
+
+    @staticmethod
+    def _watch(
+        conn: multiprocessing.connection.Connection,
+        runner_obj: runner.ScenarioRunner,
+    ) -> None:
+        """Abort the load when the task engine asks for it or goes away."""
+        try:
+            while not conn.recv().get("abort"):
+                pass
+        except (EOFError, OSError):
+            pass
+        runner_obj.abort()
+
+    @staticmethod
+    def _forward(
+        conn: multiprocessing.connection.Connection,
+        runner_obj: runner.ScenarioRunner,
+    ) -> None:
+        """Send everything the runner has collected to the task engine."""
+        results: list[runner.ScenarioRunnerResult] = []
+        while runner_obj.result_queue:
+            results.extend(runner_obj.result_queue.popleft())
+        events = []
+        while runner_obj.event_queue:
+            events.append(runner_obj.event_queue.popleft())
+        if results or events:
+            conn.send({"results": results, "events": events})
+
+    def _handle(self, conn: multiprocessing.connection.Connection) -> None:
+        """Run the workload sent by the task engine over the connection."""
+        with conn:
+            try:
+                request = conn.recv()
+                task = objects.Task(
+                    task={"uuid": request["task"]}, temporary=True
+                )
+                runner_obj = runner.ScenarioRunner.get(request["runner"])(
+                    task, request["config"]
+                )
+                runner_obj.workload_sla = request.get("sla", {})
+                scenario_cls = scenario.Scenario.get(request["scenario"])
+            except Exception as e:
+                LOG.exception("Agent failed to accept a workload")
+                conn.send({"finished": True, "error": utils.format_exc(e)})
+                return
+
+            LOG.info(
+                "Task %s | Agent starts %s runner with %s."
+                % (request["task"], request["runner"], request["config"])
+            )
+            threading.Thread(
+                target=self._watch, args=(conn, runner_obj), daemon=True
+            ).start()
+
+            errors: list[list[str]] = []
+
+            def _run() -> None:
+                try:
+                    runner_obj._run_scenario(
+                        scenario_cls,
+                        "run",
+                        dict(request["context"], task=task),
+                        request["args"],
+                    )
+                except Exception as e:
+                    LOG.exception("Agent failed to run a workload")
+                    errors.append(utils.format_exc(e))
+                finally:
+                    runner._scenario_pool.clear(
+                        request["context"].get("owner_id")
+                    )
+
+            thread = threading.Thread(target=_run)
+            thread.start()
+            try:
+                while thread.is_alive():
+                    thread.join(FORWARD_INTERVAL)
+                    self._forward(conn, runner_obj)
+                self._forward(conn, runner_obj)
+                conn.send({"finished": True, "error": errors and errors[0]})
+            except OSError:
+                LOG.warning(
+                    "Task %s | Agent lost the connection to the task engine."
+                    % request["task"]
+                )
+                runner_obj.abort()
+                thread.join()
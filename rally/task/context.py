@@ -17,6 +17,7 @@ from __future__ import annotations
 
 import abc
 import collections
+from concurrent import futures
 import typing as t
 
 from rally.common import cfg
@@ -57,13 +58,24 @@ CONF_OPTS = [
         "segments of at least three 'X's; the first one will be replaced "
         "by a portion of the owner ID (i.e task/subtask ID), and the "
         "second will be replaced with a random string.",
-    )
+    ),
+    cfg.BoolOpt(
+        "independent_same_order_contexts",
+        default=False,
+        help="Treat the contexts of a workload which have the same order as "
+        "independent of each other, so they are set up and cleaned up at "
+        "the same time even if they are not declared independent.",
+    ),
 ]
 CONF.register_opts(CONF_OPTS)
 
 
 def configure(
-    name: str, order: int, platform: str = "default", hidden: bool = False
+    name: str,
+    order: int,
+    platform: str = "default",
+    hidden: bool = False,
+    independent: bool = False,
 ) -> t.Callable[[type[C]], type[C]]:
     """Context class wrapper.
 
@@ -78,6 +90,10 @@ def configure(
                   Contexts with smaller order are run first
     :param hidden: If it is true you won't be able to specify context via
                    task config
+    :param independent: If it is true, the context neither uses nor changes
+                        what other contexts with the same order do, so it is
+                        set up and cleaned up at the same time with other
+                        independent contexts of the same order
     """
 
     def wrapper(cls: type[C]) -> type[C]:
@@ -85,6 +101,7 @@ def configure(
             cls
         )
         cls._meta_set("order", order)
+        cls._meta_set("independent", independent)
         return cls
 
     return wrapper
@@ -169,6 +186,10 @@ class BaseContext(
     def get_order(cls) -> int:
         return cls._meta_get("order")
 
+    @classmethod
+    def is_independent(cls) -> bool:
+        return cls._meta_get("independent", False)
+
     @abc.abstractmethod
     def setup(self) -> None:
         """Prepare environment for test.
@@ -270,94 +291,146 @@ class ContextManager:
     def _log_prefix(self) -> str:
         return "Task %s |" % self.context_obj["task"]["uuid"]
 
+    @staticmethod
+    def _get_groups(ctx_lst: list[BaseContext]) -> list[list[BaseContext]]:
+        """Split the sorted contexts into groups to set up at the same time.
+
+        A group is either a single context or independent contexts with
+        the same order.
+        """
+
+        def independent(ctx: BaseContext) -> bool:
+            return (
+                CONF.independent_same_order_contexts or ctx.is_independent()
+            )
+
+        groups: list[list[BaseContext]] = []
+        for ctx in ctx_lst:
+            last = groups[-1][-1] if groups else None
+            if (
+                last is not None
+                and last.get_order() == ctx.get_order()
+                and independent(last)
+                and independent(ctx)
+            ):
+                groups[-1].append(ctx)
+            else:
+                groups.append([ctx])
+        return groups
+
+    @staticmethod
+    def _run_at_once(
+        method: t.Callable[[BaseContext], None], group: list[BaseContext]
+    ) -> None:
+        """Call the method for every context of the group at the same time.
+
+        :raises: the first error of the contexts, after all of them finish
+        """
+        if len(group) == 1:
+            method(group[0])
+            return
+        with futures.ThreadPoolExecutor(
+            max_workers=len(group), thread_name_prefix="context"
+        ) as executor:
+            fs = [executor.submit(method, ctx) for ctx in group]
+        for f in fs:
+            f.result()
+
     def setup(self) -> dict[str, t.Any]:
         """Creates environment by executing provided context plugins."""
         self._visited = []
-        for ctx in self._get_sorted_context_lst():
-            ctx_data: _ContextExecutionData = {
-                "plugin_name": ctx.get_fullname(),
-                "plugin_cfg": ctx.config,
-                "setup": {
-                    "started_at": None,
-                    "finished_at": None,
-                    "atomic_actions": None,
-                    "error": None,
-                },
-                "cleanup": {
-                    "started_at": None,
-                    "finished_at": None,
-                    "atomic_actions": None,
-                    "error": None,
-                },
-            }
-            self._data[ctx.get_fullname()] = ctx_data
-            self._visited.append(ctx)
-            msg = "%(log_prefix)s Context %(name)s setup() " % {
-                "log_prefix": self._log_prefix(),
-                "name": ctx.get_fullname(),
-            }
-
-            timer = utils.Timer()
-            try:
-                with timer:
-                    ctx.setup()
-            except Exception as exc:
-                ctx_data["setup"]["error"] = task_utils.format_exc(exc)
-                raise
-            finally:
-                ctx_data["setup"]["atomic_actions"] = ctx.atomic_actions()
-                ctx_data["setup"]["started_at"] = timer.timestamp()
-                ctx_data["setup"]["finished_at"] = timer.finish_timestamp()
-
-            LOG.info(
-                "%(msg)s finished in %(duration)s"
-                % {"msg": msg, "duration": timer.duration(fmt=True)}
-            )
+        for group in self._get_groups(self._get_sorted_context_lst()):
+            for ctx in group:
+                self._data[ctx.get_fullname()] = {
+                    "plugin_name": ctx.get_fullname(),
+                    "plugin_cfg": ctx.config,
+                    "setup": {
+                        "started_at": None,
+                        "finished_at": None,
+                        "atomic_actions": None,
+                        "error": None,
+                    },
+                    "cleanup": {
+                        "started_at": None,
+                        "finished_at": None,
+                        "atomic_actions": None,
+                        "error": None,
+                    },
+                }
+                self._visited.append(ctx)
+            self._run_at_once(self._setup_context, group)
 
         return self.context_obj
 
+    def _setup_context(self, ctx: BaseContext) -> None:
+        ctx_data = self._data[ctx.get_fullname()]
+        msg = "%(log_prefix)s Context %(name)s setup() " % {
+            "log_prefix": self._log_prefix(),
+            "name": ctx.get_fullname(),
+        }
+
+        timer = utils.Timer()
+        try:
+            with timer:
+                ctx.setup()
+        except Exception as exc:
+            ctx_data["setup"]["error"] = task_utils.format_exc(exc)
+            raise
+        finally:
+            ctx_data["setup"]["atomic_actions"] = ctx.atomic_actions()
+            ctx_data["setup"]["started_at"] = timer.timestamp()
+            ctx_data["setup"]["finished_at"] = timer.finish_timestamp()
+
+        LOG.info(
+            "%(msg)s finished in %(duration)s"
+            % {"msg": msg, "duration": timer.duration(fmt=True)}
+        )
+
     def cleanup(self) -> None:
         """Cleans up  environment by executing provided context plugins."""
         ctxlst = self._visited or self._get_sorted_context_lst()
-        for ctx in ctxlst[::-1]:
-            ctx.reset_atomic_actions()
-            msg = "%(log_prefix)s Context %(name)s cleanup()" % {
-                "log_prefix": self._log_prefix(),
-                "name": ctx.get_fullname(),
-            }
-            # NOTE(andreykurilin): As for our code, ctx_data is
-            #   always presented. The further checks for `ctx_data is None` are
-            #   added just for "disaster cleanup". It is not officially
-            #   presented feature and not we provide out-of-the-box, but some
-            #   folks have own scripts which are based on ContextManager and
-            #   it would be nice to not break them.
-            ctx_data = None
-            if ctx.get_fullname() in self._data:
-                ctx_data = self._data[ctx.get_fullname()]
-
-            timer = utils.Timer()
-            try:
-                with timer:
-                    LOG.info("%s started" % msg)
-                    ctx.cleanup()
-                LOG.info(
-                    "%(msg)s finished in %(duration)s"
-                    % {"msg": msg, "duration": timer.duration(fmt=True)}
-                )
-            except Exception as exc:
-                LOG.exception(
-                    "%(msg)s failed after %(duration)s"
-                    % {"msg": msg, "duration": timer.duration(fmt=True)}
-                )
-                if ctx_data is not None:
-                    ctx_data["cleanup"]["error"] = task_utils.format_exc(exc)
-            finally:
-                if ctx_data is not None:
-                    aa = ctx.atomic_actions()
-                    ctx_data["cleanup"]["atomic_actions"] = aa
-                    ctx_data["cleanup"]["started_at"] = timer.timestamp()
-                    finished_at = timer.finish_timestamp()
-                    ctx_data["cleanup"]["finished_at"] = finished_at
+        for group in self._get_groups(ctxlst)[::-1]:
+            self._run_at_once(self._cleanup_context, group[::-1])
+
+    def _cleanup_context(self, ctx: BaseContext) -> None:
+        ctx.reset_atomic_actions()
+        msg = "%(log_prefix)s Context %(name)s cleanup()" % {
+            "log_prefix": self._log_prefix(),
+            "name": ctx.get_fullname(),
+        }
+        # NOTE(andreykurilin): As for our code, ctx_data is
+        #   always presented. The further checks for `ctx_data is None` are
+        #   added just for "disaster cleanup". It is not officially
+        #   presented feature and not we provide out-of-the-box, but some
+        #   folks have own scripts which are based on ContextManager and
+        #   it would be nice to not break them.
+        ctx_data = None
+        if ctx.get_fullname() in self._data:
+            ctx_data = self._data[ctx.get_fullname()]
+
+        timer = utils.Timer()
+        try:
+            with timer:
+                LOG.info("%s started" % msg)
+                ctx.cleanup()
+            LOG.info(
+                "%(msg)s finished in %(duration)s"
+                % {"msg": msg, "duration": timer.duration(fmt=True)}
+            )
+        except Exception as exc:
+            LOG.exception(
+                "%(msg)s failed after %(duration)s"
+                % {"msg": msg, "duration": timer.duration(fmt=True)}
+            )
+            if ctx_data is not None:
+                ctx_data["cleanup"]["error"] = task_utils.format_exc(exc)
+        finally:
+            if ctx_data is not None:
+                aa = ctx.atomic_actions()
+                ctx_data["cleanup"]["atomic_actions"] = aa
+                ctx_data["cleanup"]["started_at"] = timer.timestamp()
+                finished_at = timer.finish_timestamp()
+                ctx_data["cleanup"]["finished_at"] = finished_at
 
     def __enter__(self) -> ContextManager:
         try:
@@ -13,8 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
+import contextlib
 import copy
 import json
+import queue
 import threading
 import time
 import traceback
@@ -24,8 +27,11 @@ from rally import exceptions
 from rally.common import cfg
 from rally.common import logging
 from rally.common import objects
+from rally.common import utils
+from rally.task import abort
 from rally.task import context
 from rally.task import hook
+from rally.task import metrics
 from rally.task import runner
 from rally.task import scenario
 from rally.task import sla
@@ -43,8 +49,52 @@ TASK_ENGINE_OPTS = [
         min=1,
         help="Size of raw result chunk in iterations",
     ),
+    cfg.IntOpt(
+        "raw_result_chunk_queue_size",
+        default=10,
+        min=1,
+        help="Maximum number of raw result chunks of a workload which wait "
+        "to be saved to the database. The results of the workload are not "
+        "consumed while the limit is reached.",
+    ),
+    cfg.BoolOpt(
+        "pipeline_context_setup",
+        default=False,
+        help="Set up the contexts of the next workload of a subtask while "
+        "the current workload generates the load. Only one workload "
+        "generates the load at a time anyway.",
+    ),
+    cfg.BoolOpt(
+        "defer_context_cleanup",
+        default=False,
+        help="Clean up the contexts of a workload while the next workload "
+        "of the subtask generates the load. Works only together with "
+        "pipeline_context_setup.",
+    ),
+    cfg.StrOpt(
+        "live_metrics_address",
+        default=None,
+        help="Address <host>:<port> of the HTTP endpoint which serves the "
+        "live statistics of the workloads of the running task at /metrics "
+        "in the text format of Prometheus and at /metrics.json in JSON. "
+        "The endpoint is disabled by default.",
+    ),
+    cfg.FloatOpt(
+        "live_metrics_window",
+        default=60.0,
+        min=1.0,
+        help="Length in seconds of the rolling window over which the "
+        "throughput, error rate and latency percentiles of the live "
+        "metrics are computed.",
+    ),
 ]
 
+# the criteria which ResultConsumer adds to the SLA results of the workload
+# which has not been let finish
+INTERRUPTED_SLA_CRITERIA = frozenset(
+    ("aborted_manually", "something_went_wrong")
+)
+
 
 class ResultConsumer:
     """ResultConsumer class stores results from ScenarioRunner, checks SLA.
@@ -62,6 +112,8 @@ class ResultConsumer:
         runner,
         abort_on_sla_failure,
         ctx_manager,
+        abort_channel=None,
+        metrics=None,
     ):
         """ResultConsumer constructor.
 
@@ -74,6 +126,9 @@ class ResultConsumer:
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
         :param ctx_manager: ContextManager instance
+        :param abort_channel: AbortChannel of the task; without it, the
+                              status of the task is polled in the database
+        :param metrics: WorkloadMetrics to feed with the live statistics
         """
 
         self.task = task
@@ -88,19 +143,31 @@ class ResultConsumer:
         self.sla_checker = sla.SLAChecker(self.workload_cfg)
         self.hook_executor = hook.HookExecutor(self.workload_cfg, self.task)
         self.abort_on_sla_failure = abort_on_sla_failure
+        self.abort_channel = abort_channel or abort.AbortChannel(task["uuid"])
         self.is_done = threading.Event()
         self.unexpected_failure = {}
         self.results = []
         self.thread = threading.Thread(target=self._consume_results)
+        # the chunks of results are saved by a separate thread, so the
+        # database does not slow the SLA checks down
+        self.chunks: queue.Queue[list | None] = queue.Queue(
+            maxsize=CONF.raw_result_chunk_queue_size
+        )
+        self.writer_thread = threading.Thread(target=self._write_chunks)
         self.aborting_checker = threading.Thread(target=self.wait_and_abort)
-        if self.workload_cfg["hooks"]:
+        self.metrics = metrics
+        # the events are needed by the hooks and to count the started
+        # iterations for the live metrics
+        self.consume_events = bool(self.workload_cfg["hooks"] or metrics)
+        if self.consume_events:
             self.event_thread = threading.Thread(target=self._consume_events)
         self._cm = ctx_manager
 
     def __enter__(self):
+        self.writer_thread.start()
         self.thread.start()
         self.aborting_checker.start()
-        if self.workload_cfg["hooks"]:
+        if self.consume_events:
             self.event_thread.start()
         self.start = time.time()
         return self
@@ -110,7 +177,7 @@ class ResultConsumer:
         while True:
             if self.runner.result_queue:
                 results = self.runner.result_queue.popleft()
-                self.results.extend(results)
+                chunk_size = CONF.raw_result_chunk_size
                 for r in results:
                     self.load_started_at = min(
                         r["timestamp"], self.load_started_at
@@ -119,6 +186,8 @@ class ResultConsumer:
                         r["duration"] + r["timestamp"], self.load_finished_at
                     )
                     success = self.sla_checker.add_iteration(r)
+                    if self.metrics:
+                        self.metrics.add_iteration(r)
                     if (
                         self.abort_on_sla_failure
                         and not success
@@ -129,39 +198,64 @@ class ResultConsumer:
                         self.task.update_status(
                             consts.TaskStatus.SOFT_ABORTING
                         )
+                        self.abort_channel.abort(soft=True)
                         task_aborted = True
 
-                # save results chunks
-                chunk_size = CONF.raw_result_chunk_size
-                while len(self.results) >= chunk_size:
-                    results_chunk = self.results[:chunk_size]
-                    self.results = self.results[chunk_size:]
-                    results_chunk.sort(key=lambda x: x["timestamp"])
-                    self.workload.add_workload_data(
-                        self.workload_data_count, {"raw": results_chunk}
-                    )
-                    self.workload_data_count += 1
+                    self.results.append(r)
+                    if len(self.results) >= chunk_size:
+                        # blocks while the writer is behind by
+                        # raw_result_chunk_queue_size chunks
+                        self.chunks.put(self.results)
+                        self.results = []
 
             elif self.is_done.is_set():
                 break
             else:
-                time.sleep(0.1)
+                self.runner.result_queue.wait(self.is_done)
 
     def _consume_events(self):
         while not self.is_done.is_set() or self.runner.event_queue:
             if self.runner.event_queue:
                 event = self.runner.event_queue.popleft()
-                self.hook_executor.on_event(
-                    event_type=event["type"], value=event["value"]
-                )
+                if self.metrics and event["type"] == "iteration":
+                    self.metrics.iteration_started()
+                if self.workload_cfg["hooks"]:
+                    self.hook_executor.on_event(
+                        event_type=event["type"], value=event["value"]
+                    )
             else:
-                time.sleep(0.01)
+                self.runner.event_queue.wait(self.is_done)
+
+    def _write_chunks(self):
+        while True:
+            results_chunk = self.chunks.get()
+            if results_chunk is None:
+                break
+            results_chunk.sort(key=lambda x: x["timestamp"])
+            try:
+                self.workload.add_workload_data(
+                    self.workload_data_count, {"raw": results_chunk}
+                )
+            except Exception:
+                # keep on taking the chunks, so the consumer is not blocked
+                LOG.exception(
+                    "Failed to save chunk %s of the results of workload %s"
+                    % (self.workload_data_count, self.workload["uuid"])
+                )
+            self.workload_data_count += 1
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         self.finish = time.time()
         self.is_done.set()
+        self.runner.result_queue.wake()
+        self.runner.event_queue.wake()
+        self.abort_channel.wake()
         self.aborting_checker.join()
         self.thread.join()
+        self.chunks.put(None)
+        self.writer_thread.join()
+        if self.metrics:
+            self.metrics.finish()
 
         if exc_type:
             self.sla_checker.set_unexpected_failure(exc_value)
@@ -188,9 +282,12 @@ class ResultConsumer:
         )
 
         results = {}
-        if self.workload_cfg["hooks"]:
+        if self.consume_events:
             self.event_thread.join()
+        if self.workload_cfg["hooks"]:
             results["hooks_results"] = self.hook_executor.results()
+        if self.runner.statistics:
+            results["runner_statistics"] = self.runner.statistics
 
         if self.results:
             # NOTE(boris-42): Sort in order of starting
@@ -234,14 +331,73 @@ class ResultConsumer:
         runner.run method.
         """
 
-        while not self.is_done.is_set():
-            if self.is_task_in_aborting_status(
-                self.task["uuid"], check_soft=False
-            ):
-                self.runner.abort()
-                self.task.update_status(consts.TaskStatus.ABORTED)
-                break
-            time.sleep(2.0)
+        if self.abort_channel.wait(self.is_done):
+            self.runner.abort()
+            self.task.update_status(consts.TaskStatus.ABORTED)
+
+
+class WorkloadPipeline:
+    """Order of the workloads of a subtask which run in a pipeline.
+
+    The contexts of a workload are set up while the previous workload
+    generates the load and, if the cleanup is deferred, are cleaned up while
+    the next workload generates the load. Only one workload generates the
+    load at a time and the workloads start it in the order of their
+    positions.
+    """
+
+    def __init__(self, count, defer_cleanup=False):
+        """Create the pipeline.
+
+        :param count: the number of workloads of the subtask
+        :param defer_cleanup: whether the next workload may start the load
+            before the contexts of the previous one are cleaned up
+        """
+        self.defer_cleanup = defer_cleanup
+        self._may_setup = [threading.Event() for _i in range(count)]
+        self._may_run = [threading.Event() for _i in range(count)]
+        self._stopped = False
+        if count:
+            self._may_setup[0].set()
+            self._may_run[0].set()
+
+    @staticmethod
+    def _next(events, position):
+        if position + 1 < len(events):
+            events[position + 1].set()
+
+    def wait_setup(self, position):
+        """Wait until the workload may set up its contexts.
+
+        :returns: False if the pipeline is stopped
+        """
+        self._may_setup[position].wait()
+        return not self._stopped
+
+    def wait_run(self, position):
+        """Wait until the workload may generate the load.
+
+        :returns: False if the pipeline is stopped
+        """
+        self._may_run[position].wait()
+        self._next(self._may_setup, position)
+        return not self._stopped
+
+    def load_finished(self, position):
+        """Mark the load of the workload as finished."""
+        if self.defer_cleanup:
+            self._next(self._may_run, position)
+
+    def finished(self, position):
+        """Mark the workload as finished, whatever has happened to it."""
+        self._next(self._may_setup, position)
+        self._next(self._may_run, position)
+
+    def stop(self):
+        """Do not start the next stages of any workload."""
+        self._stopped = True
+        for event in self._may_setup + self._may_run:
+            event.set()
 
 
 class TaskAborted(Exception):
@@ -282,6 +438,15 @@ class TaskEngine:
         self.task = task
         self.env = env
         self.abort_on_sla_failure = abort_on_sla_failure
+        self.abort_channel = abort.AbortChannel(task["uuid"])
+        self._workload_index_lock = threading.Lock()
+        # the subtasks which were started before the task was interrupted
+        # and the positions of their finished workloads
+        self._started_subtasks = {}
+        self._finished_workloads = {}
+        self.metrics = None
+        if CONF.live_metrics_address:
+            self.metrics = metrics.TaskMetrics(task["uuid"])
 
     def _validate_workload(self, workload, vcontext=None, vtype=None):
         """Validate a workload.
@@ -389,9 +554,40 @@ class TaskEngine:
                 reason="\n ".join(results),
             )
 
+    def _validate_subtask_contexts(
+        self, subtask, position, vcontext=None, vtype=None
+    ):
+        """Validate the contexts which are shared by workloads of a subtask.
+
+        :param subtask: a subtask configuration
+        :param position: the position of the subtask in the task
+        :param vcontext: a validation context
+        :param vtype: a type of validation (platform, syntax or semantic)
+        """
+        contexts = subtask.get("contexts", {})
+        results = []
+        for context_name, context_conf in contexts.items():
+            results.extend(
+                context.Context.validate(
+                    name=context_name,
+                    context=vcontext,
+                    config=None,
+                    plugin_cfg=context_conf,
+                    vtype=vtype,
+                )
+            )
+        if results:
+            raise exceptions.InvalidTaskConfig(
+                name=subtask["title"],
+                pos=position,
+                config=json.dumps({"contexts": contexts}),
+                reason="\n ".join(results),
+            )
+
     @logging.log_task_wrapper(LOG.info, "Task validation of syntax.")
     def _validate_config_syntax(self, config):
-        for subtask in config.subtasks:
+        for position, subtask in enumerate(config.subtasks):
+            self._validate_subtask_contexts(subtask, position, vtype="syntax")
             for workload in subtask["workloads"]:
                 self._validate_workload(workload, vtype="syntax")
 
@@ -405,7 +601,10 @@ class TaskEngine:
             for p in self.env.data["platforms"].values()
         )
         ctx = {"task": self.task, "platforms": platforms}
-        for subtask in config.subtasks:
+        for position, subtask in enumerate(config.subtasks):
+            self._validate_subtask_contexts(
+                subtask, position, vcontext=ctx, vtype="platform"
+            )
             for workload in subtask["workloads"]:
                 self._validate_workload(
                     workload, vcontext=ctx, vtype="platform"
@@ -444,7 +643,10 @@ class TaskEngine:
         }
 
         with context.ContextManager(ctx_obj):
-            for subtask in config.subtasks:
+            for position, subtask in enumerate(config.subtasks):
+                self._validate_subtask_contexts(
+                    subtask, position, vcontext=ctx_obj, vtype="semantic"
+                )
                 for workload in subtask["workloads"]:
                     self._validate_workload(
                         workload, vcontext=ctx_obj, vtype="semantic"
@@ -483,13 +685,29 @@ class TaskEngine:
                 )
             raise
 
-    def _prepare_context(self, ctx, scenario_name, owner_id):
+    def _prepare_context(
+        self, ctx, scenario_name, owner_id, subtask_context=None
+    ):
+        """Prepare the context object of a workload or of a subtask.
+
+        :param ctx: the configuration of the contexts
+        :param scenario_name: the name of the scenario of the workload, None
+            for a subtask
+        :param owner_id: the UUID of the workload or of the subtask
+        :param subtask_context: the context object of the subtask, which
+            contexts are set up already. The workload gets a copy-on-write
+            view of it with its own contexts on top, while the default
+            contexts of the scenario which the subtask has are skipped.
+        """
+        shared = subtask_context["config"] if subtask_context else {}
         context_config = {}
         # restore full names of plugins
-        scenario_plugin = scenario.Scenario.get(scenario_name)
-        for k, v in scenario_plugin.get_default_context().items():
-            c = context.Context.get(k, allow_hidden=True)
-            context_config[c.get_fullname()] = v
+        if scenario_name is not None:
+            scenario_plugin = scenario.Scenario.get(scenario_name)
+            for k, v in scenario_plugin.get_default_context().items():
+                c = context.Context.get(k, allow_hidden=True)
+                if c.get_fullname() not in shared:
+                    context_config[c.get_fullname()] = v
         for k, v in ctx.items():
             context_config[context.Context.get(k).get_fullname()] = v
 
@@ -506,61 +724,94 @@ class TaskEngine:
             "config": context_config,
             "env": env_data,
         }
+        if subtask_context:
+            shared_obj = utils.CopyOnWriteDict(
+                dict(
+                    (k, v)
+                    for k, v in subtask_context.items()
+                    if k not in context_obj
+                )
+            )
+            shared_obj.update(context_obj)
+            context_obj = shared_obj
         return context_obj
 
     @logging.log_task_wrapper(LOG.info, "Running task.")
     def run(self):
         """Run the benchmark according to the test configuration.
 
-        Test configuration is specified on engine initialization.
+        Test configuration is specified on engine initialization. If the task
+        was run before and got interrupted, it is resumed: the finished
+        workloads are not run again and the results of the rest ones are
+        added to the task.
 
         :returns: List of dicts, each dict containing the results of all the
                   corresponding benchmark test launches
         """
-        self.task.update_status(consts.TaskStatus.RUNNING)
-        self.task_workloads_count = 0
-        self.task_workload_index = 0
-        for subtask in self.config.subtasks:
-            self.task_workloads_count += len(subtask["workloads"])
+        # the abort channel refuses to start if another task engine runs
+        # the task, so it is started before the task is touched; the status
+        # of the resumed task is the one it was interrupted with, so it is
+        # not polled until the task is marked as running
+        self.abort_channel.start(poll=False)
         try:
-            for index, subtask in enumerate(self.config.subtasks, 1):
-                self._run_subtask(subtask, index)
-        except TaskAborted:
-            LOG.info("Received aborting signal.")
-            self.task.update_status(consts.TaskStatus.ABORTED)
-        else:
-            if (
-                objects.Task.get_status(self.task["uuid"])
-                != consts.TaskStatus.ABORTED
-            ):
-                self.task.update_status(consts.TaskStatus.FINISHED)
+            self.task.update_status(consts.TaskStatus.RUNNING)
+            self.abort_channel.poll()
+            self._started_subtasks = dict(
+                enumerate(self.task.get_subtasks(), 1)
+            )
+            self.task_workloads_count = 0
+            self.task_workload_index = 0
+            for subtask in self.config.subtasks:
+                self.task_workloads_count += len(subtask["workloads"])
+            if self.metrics:
+                metrics_server = metrics.MetricsServer(
+                    CONF.live_metrics_address, self.metrics
+                )
+            else:
+                metrics_server = contextlib.nullcontext()
+            try:
+                with metrics_server:
+                    for index, subtask in enumerate(self.config.subtasks, 1):
+                        self._run_subtask(subtask, index)
+            except TaskAborted:
+                LOG.info("Received aborting signal.")
+                self.task.update_status(consts.TaskStatus.ABORTED)
+            else:
+                if (
+                    objects.Task.get_status(self.task["uuid"])
+                    != consts.TaskStatus.ABORTED
+                ):
+                    self.task.update_status(consts.TaskStatus.FINISHED)
+        finally:
+            self.abort_channel.stop()
 
     def _run_subtask(self, subtask, subtask_position):
-        subtask_obj = self.task.add_subtask(
-            title=subtask["title"],
-            description=subtask["description"],
-            contexts=subtask["contexts"],
-        )
+        subtask_obj = self._started_subtasks.get(subtask_position)
+        if subtask_obj is None:
+            subtask_obj = self.task.add_subtask(
+                title=subtask["title"],
+                description=subtask["description"],
+                contexts=subtask["contexts"],
+                run_in_parallel=subtask.get("run_in_parallel", False),
+            )
+        elif subtask_obj["status"] == consts.SubtaskStatus.FINISHED:
+            LOG.info(
+                "Skipping subtask %d, it has been finished already."
+                % subtask_position
+            )
+            with self._workload_index_lock:
+                self.task_workload_index += len(subtask["workloads"])
+            return
+        else:
+            self._resume_subtask(subtask_obj)
 
         try:
-            # TODO(astudenov): add subtask context here
-            workloads_count = len(subtask["workloads"])
-            for index, workload in enumerate(subtask["workloads"], 1):
-                self._run_workload(subtask_obj, workload)
-                self.task_workload_index += 1
-                LOG.info(
-                    "Finished workload %(index)d/%(count)d"
-                    " of subtask %(subtask)d "
-                    " (completed %(t_index)d of %(t_count)d "
-                    "in general)."
-                    % {
-                        "index": index,
-                        "count": workloads_count,
-                        "subtask": subtask_position,
-                        "t_index": self.task_workload_index,
-                        "t_count": self.task_workloads_count,
-                    }
+            if subtask["contexts"]:
+                self._run_workloads_in_subtask_context(
+                    subtask_obj, subtask, subtask_position
                 )
+            else:
+                self._run_workloads(subtask_obj, subtask, subtask_position)
         except TaskAborted:
             subtask_obj.update_status(consts.SubtaskStatus.ABORTED)
             raise
@@ -575,9 +826,169 @@ class TaskEngine:
         else:
             subtask_obj.update_status(consts.SubtaskStatus.FINISHED)
 
-    def _run_workload(self, subtask_obj, workload):
-        if ResultConsumer.is_task_in_aborting_status(self.task["uuid"]):
+    def _resume_subtask(self, subtask_obj):
+        """Prepare the interrupted subtask to be run again.
+
+        The finished workloads are skipped, while the interrupted one is run
+        from its start, so its partial results are deleted. The results are
+        saved for the interrupted workload too if the engine survived, but
+        then they fail the criterion of the abort or of the unexpected error.
+        """
+        finished = set()
+        for workload in subtask_obj.get_workloads():
+            criteria = {
+                result["criterion"]
+                for result in (workload["sla_results"] or {}).get("sla", [])
+            }
+            if workload["sla_results"] and not (
+                criteria & INTERRUPTED_SLA_CRITERIA
+            ):
+                finished.add(workload["position"])
+            else:
+                # the durations and SLA of the subtask and the task are
+                # recomputed without it
+                objects.Workload.delete_by_uuid(workload["uuid"])
+        self._finished_workloads[subtask_obj["uuid"]] = finished
+        subtask_obj.update_status(consts.SubtaskStatus.RUNNING)
+
+    def _run_workloads_in_subtask_context(
+        self, subtask_obj, subtask, subtask_position
+    ):
+        """Set up the contexts of the subtask once and run its workloads."""
+        context_obj = self._prepare_context(
+            subtask["contexts"], None, subtask_obj["uuid"]
+        )
+        ctx_manager = context.ContextManager(context_obj)
+        try:
+            with ctx_manager:
+                self._run_workloads(
+                    subtask_obj,
+                    subtask,
+                    subtask_position,
+                    subtask_context=context_obj,
+                )
+        finally:
+            subtask_obj.set_contexts_results(ctx_manager.contexts_results())
+
+    def _run_workloads(
+        self, subtask_obj, subtask, subtask_position, subtask_context=None
+    ):
+        if subtask.get("run_in_parallel"):
+            self._run_workloads_in_parallel(
+                subtask_obj, subtask, subtask_position, subtask_context
+            )
+        elif CONF.pipeline_context_setup:
+            self._run_workloads_in_pipeline(
+                subtask_obj, subtask, subtask_position, subtask_context
+            )
+        else:
+            for workload in subtask["workloads"]:
+                self._run_workload(
+                    subtask_obj, workload, subtask_context=subtask_context
+                )
+                self._log_finished_workload(
+                    workload, subtask, subtask_position
+                )
+
+    def _run_workloads_in_parallel(
+        self, subtask_obj, subtask, subtask_position, subtask_context=None
+    ):
+        """Run all workloads of the subtask at the same time.
+
+        Every workload still has its own runner, context and results
+        consumer. At most `max_parallel` workloads of the subtask run at
+        once, the rest wait for a free slot and are not started at all if
+        the task is aborted meanwhile.
+        """
+        workloads = subtask["workloads"]
+        max_parallel = subtask.get("max_parallel") or len(workloads)
+
+        def _run(workload):
+            self._run_workload(
+                subtask_obj, workload, subtask_context=subtask_context
+            )
+            self._log_finished_workload(workload, subtask, subtask_position)
+
+        with futures.ThreadPoolExecutor(
+            max_workers=max_parallel, thread_name_prefix="workload"
+        ) as executor:
+            fs = [executor.submit(_run, w) for w in workloads]
+        # re-raise the first failure in the order of workloads
+        for f in fs:
+            f.result()
+
+    def _run_workloads_in_pipeline(
+        self, subtask_obj, subtask, subtask_position, subtask_context=None
+    ):
+        """Run the workloads of the subtask one by one in a pipeline.
+
+        See WorkloadPipeline for the order of the stages of the workloads.
+        """
+        workloads = subtask["workloads"]
+        pipeline = WorkloadPipeline(
+            len(workloads), defer_cleanup=CONF.defer_context_cleanup
+        )
+
+        def _run(workload):
+            if not pipeline.wait_setup(workload["position"]):
+                # one of the previous workloads has failed
+                return
+            try:
+                self._run_workload(
+                    subtask_obj,
+                    workload,
+                    pipeline=pipeline,
+                    subtask_context=subtask_context,
+                )
+            except Exception:
+                pipeline.stop()
+                raise
+            finally:
+                pipeline.finished(workload["position"])
+            self._log_finished_workload(workload, subtask, subtask_position)
+
+        # one workload sets up its contexts, one generates the load and one
+        # cleans up its contexts
+        with futures.ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="workload"
+        ) as executor:
+            fs = [executor.submit(_run, w) for w in workloads]
+        for f in fs:
+            f.result()
+
+    def _log_finished_workload(self, workload, subtask, subtask_position):
+        with self._workload_index_lock:
+            self.task_workload_index += 1
+            LOG.info(
+                "Finished workload %(index)d/%(count)d"
+                " of subtask %(subtask)d "
+                " (completed %(t_index)d of %(t_count)d "
+                "in general)."
+                % {
+                    "index": workload["position"] + 1,
+                    "count": len(subtask["workloads"]),
+                    "subtask": subtask_position,
+                    "t_index": self.task_workload_index,
+                    "t_count": self.task_workloads_count,
+                }
+            )
+
+    def _run_workload(
+        self, subtask_obj, workload, pipeline=None, subtask_context=None
+    ):
+        if self.abort_channel.is_aborting():
             raise TaskAborted()
+        finished = self._finished_workloads.get(subtask_obj["uuid"], ())
+        if workload["position"] in finished:
+            LOG.info(
+                "Skipping workload at position %s, it has been finished "
+                "already." % workload["position"]
+            )
+            if pipeline:
+                # do not let the next workload generate the load while the
+                # previous one is still doing it
+                pipeline.wait_run(workload["position"])
+            return
         workload_obj = subtask_obj.add_workload(
             name=workload["name"],
             description=workload["description"],
@@ -604,9 +1015,14 @@ class TaskEngine:
 
         runner_cls = runner.ScenarioRunner.get(workload["runner_type"])
         runner_obj = runner_cls(self.task, workload["runner"])
+        runner_obj.workload_sla = workload["sla"]
         context_obj = self._prepare_context(
-            workload["contexts"], workload["name"], workload_obj["uuid"]
+            workload["contexts"],
+            workload["name"],
+            workload_obj["uuid"],
+            subtask_context=subtask_context,
         )
+        aborted = False
         try:
             ctx_manager = context.ContextManager(context_obj)
             with ResultConsumer(
@@ -617,11 +1033,39 @@ class TaskEngine:
                 runner=runner_obj,
                 abort_on_sla_failure=self.abort_on_sla_failure,
                 ctx_manager=ctx_manager,
-            ):
+                abort_channel=self.abort_channel,
+                metrics=(
+                    self.metrics.add_workload(workload)
+                    if self.metrics
+                    else None
+                ),
+            ) as consumer:
                 with ctx_manager:
-                    runner_obj.run(
-                        workload["name"], context_obj, workload["args"]
-                    )
+                    if pipeline:
+                        # the contexts were set up in advance, but the load
+                        # is not started if the task is aborted meanwhile
+                        waiting_since = time.time()
+                        aborted = (
+                            not pipeline.wait_run(workload["position"])
+                            or self.abort_channel.is_aborting()
+                        )
+                        # the load of the previous workload does not count
+                        # in the full duration of this one
+                        consumer.start += time.time() - waiting_since
+                    if aborted:
+                        consumer.sla_checker.set_aborted_manually()
+                    else:
+                        try:
+                            runner_obj.run(
+                                workload["name"],
+                                context_obj,
+                                workload["args"],
+                            )
+                        finally:
+                            if pipeline:
+                                pipeline.load_finished(workload["position"])
         except Exception:
             LOG.exception("Unexpected exception during the workload execution")
             # TODO(astudenov): save error to DB
+        if aborted:
+            raise TaskAborted()
@@ -0,0 +1,405 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Live metrics of the workloads of the running task.
+
+If `live_metrics_address` is set, the task engine serves the statistics of
+the workloads over HTTP while it runs the task, so the load can be watched
+on dashboards instead of waiting for the report:
+
+* ``/metrics`` in the text format of Prometheus;
+* ``/metrics.json`` in JSON.
+
+The statistics are collected by ResultConsumer from the iterations as they
+come from the runner, before they are saved to the database. Throughput,
+error rate and latency percentiles are computed over the iterations which
+have finished within the last `live_metrics_window` seconds.
+"""
+
+from __future__ import annotations
+
+import collections
+import http.server
+import json
+import threading
+import time
+import types
+import typing as t
+
+from rally.common import cfg
+from rally.common import logging
+from rally.task import atomic
+from rally.task.processing import utils
+
+
+LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+
+# the latest durations kept to compute the percentiles of a workload or
+# of an atomic action
+MAX_WINDOW_SAMPLES = 10000
+
+PERCENTILES = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+
+
+class _Window:
+    """Durations of the iterations finished within the rolling window."""
+
+    def __init__(self) -> None:
+        self._samples: collections.deque[tuple[float, float]] = (
+            collections.deque(maxlen=MAX_WINDOW_SAMPLES)
+        )
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, now: float, duration: float) -> None:
+        self._samples.append((now, duration))
+        self.count += 1
+        self.total += duration
+
+    def percentiles(self, since: float) -> dict[str, float | None]:
+        while self._samples and self._samples[0][0] < since:
+            self._samples.popleft()
+        durations = sorted(d for _t, d in self._samples)
+        return dict(
+            (name, utils.percentile(durations, percent, ignore_sorting=True))
+            for name, percent in PERCENTILES
+        )
+
+
+class WorkloadMetrics:
+    """Live statistics of one workload."""
+
+    def __init__(
+        self, task_uuid: str, workload: dict[str, t.Any], window: float
+    ) -> None:
+        """Create the statistics.
+
+        :param task_uuid: the UUID of the task
+        :param workload: the config of the workload with its uuid
+        :param window: the length of the rolling window in seconds
+        """
+        self.labels = {
+            "task": task_uuid,
+            "workload": workload["uuid"],
+            "scenario": workload["name"],
+            "position": str(workload["position"]),
+        }
+        self.window = window
+        self.running = True
+        self.started = 0
+        self.finished = 0
+        self.failed = 0
+        self._started_at = time.monotonic()
+        # the number of finished and failed iterations per second
+        self._seconds: collections.deque[list[int]] = collections.deque()
+        self._durations = _Window()
+        self._atomics: dict[str, _Window] = {}
+        self._lock = threading.Lock()
+
+    def iteration_started(self) -> None:
+        with self._lock:
+            self.started += 1
+
+    def add_iteration(self, result: dict[str, t.Any]) -> None:
+        """Take the result of the finished iteration into account."""
+        now = time.monotonic()
+        second = int(now)
+        atomics = atomic.merge_atomic_actions(result["atomic_actions"])
+        with self._lock:
+            self.finished += 1
+            failed = bool(result["error"])
+            self.failed += failed
+            if not self._seconds or self._seconds[-1][0] != second:
+                self._prune(now - self.window)
+                self._seconds.append([second, 0, 0])
+            self._seconds[-1][1] += 1
+            self._seconds[-1][2] += failed
+            self._durations.add(now, result["duration"])
+            for name, action in atomics.items():
+                if name not in self._atomics:
+                    self._atomics[name] = _Window()
+                self._atomics[name].add(now, action["duration"])
+
+    def _prune(self, since: float) -> None:
+        while self._seconds and self._seconds[0][0] < int(since):
+            self._seconds.popleft()
+
+    def finish(self) -> None:
+        """Mark the workload as not generating the load anymore."""
+        with self._lock:
+            self.running = False
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """Return the current statistics."""
+        now = time.monotonic()
+        since = now - self.window
+        with self._lock:
+            self._prune(since)
+            finished = sum(s[1] for s in self._seconds)
+            failed = sum(s[2] for s in self._seconds)
+            # do not let the first iterations look like a huge throughput
+            period = min(self.window, max(now - self._started_at, 1.0))
+            return {
+                "task_uuid": self.labels["task"],
+                "uuid": self.labels["workload"],
+                "name": self.labels["scenario"],
+                "position": int(self.labels["position"]),
+                "running": self.running,
+                "iterations": self.finished,
+                "failed_iterations": self.failed,
+                "in_flight": (
+                    max(self.started - self.finished, 0) if self.running else 0
+                ),
+                "throughput": finished / period,
+                "error_rate": failed / finished if finished else 0.0,
+                "duration": dict(
+                    self._durations.percentiles(since),
+                    count=self._durations.count,
+                    sum=self._durations.total,
+                ),
+                "atomic_actions": dict(
+                    (
+                        name,
+                        dict(
+                            window.percentiles(since),
+                            count=window.count,
+                            sum=window.total,
+                        ),
+                    )
+                    for name, window in self._atomics.items()
+                ),
+            }
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    return ",".join(
+        '%s="%s"'
+        % (
+            name,
+            value.replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for name, value in labels.items()
+    )
+
+
+class TaskMetrics:
+    """Live statistics of the workloads of the task."""
+
+    def __init__(self, task_uuid: str) -> None:
+        self.task_uuid = task_uuid
+        self._workloads: list[WorkloadMetrics] = []
+        self._lock = threading.Lock()
+
+    def add_workload(self, workload: dict[str, t.Any]) -> WorkloadMetrics:
+        """Start collecting the statistics of the workload.
+
+        :param workload: the config of the workload with its uuid
+        """
+        workload_metrics = WorkloadMetrics(
+            self.task_uuid, workload, CONF.live_metrics_window
+        )
+        with self._lock:
+            self._workloads.append(workload_metrics)
+        return workload_metrics
+
+    def to_dict(self) -> dict[str, t.Any]:
+        with self._lock:
+            workloads = list(self._workloads)
+        return {
+            "task_uuid": self.task_uuid,
+            "workloads": [w.to_dict() for w in workloads],
+        }
+
+    def to_prometheus(self) -> str:
+        """Return the statistics in the text format of Prometheus."""
+        with self._lock:
+            workloads = [(w.labels, w.to_dict()) for w in self._workloads]
+        lines = []
+        Samples = t.Iterable[tuple[str, dict[str, str], t.Any]]
+
+        def add(name: str, mtype: str, help_: str, samples: Samples) -> None:
+            lines.append("# HELP rally_%s %s" % (name, help_))
+            lines.append("# TYPE rally_%s %s" % (name, mtype))
+            for suffix, labels, value in samples:
+                if value is None:
+                    value = "NaN"
+                lines.append(
+                    "rally_%s%s{%s} %s"
+                    % (name, suffix, _format_labels(labels), value)
+                )
+
+        def summary(
+            labels: dict[str, str], stats: dict[str, t.Any]
+        ) -> Samples:
+            for name, percent in PERCENTILES:
+                yield "", dict(labels, quantile=str(percent)), stats[name]
+            yield "_sum", labels, stats["sum"]
+            yield "_count", labels, stats["count"]
+
+        add(
+            "workload_running",
+            "gauge",
+            "Whether the workload generates the load.",
+            [("", labels, int(w["running"])) for labels, w in workloads],
+        )
+        add(
+            "workload_iterations_total",
+            "counter",
+            "Finished iterations of the workload.",
+            [("", labels, w["iterations"]) for labels, w in workloads],
+        )
+        add(
+            "workload_failed_iterations_total",
+            "counter",
+            "Failed iterations of the workload.",
+            [("", labels, w["failed_iterations"]) for labels, w in workloads],
+        )
+        add(
+            "workload_iterations_in_flight",
+            "gauge",
+            "Started, but not finished iterations of the workload.",
+            [("", labels, w["in_flight"]) for labels, w in workloads],
+        )
+        add(
+            "workload_throughput",
+            "gauge",
+            "Iterations finished per second within the window.",
+            [("", labels, w["throughput"]) for labels, w in workloads],
+        )
+        add(
+            "workload_error_rate",
+            "gauge",
+            "Ratio of the failed iterations within the window.",
+            [("", labels, w["error_rate"]) for labels, w in workloads],
+        )
+        add(
+            "workload_duration_seconds",
+            "summary",
+            "Duration of the iterations within the window.",
+            [
+                sample
+                for labels, w in workloads
+                for sample in summary(labels, w["duration"])
+            ],
+        )
+        add(
+            "atomic_action_duration_seconds",
+            "summary",
+            "Duration of the atomic actions within the window.",
+            [
+                sample
+                for labels, w in workloads
+                for action, stats in w["atomic_actions"].items()
+                for sample in summary(dict(labels, action=action), stats)
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    server: _HTTPServer
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            body = self.server.metrics.to_prometheus()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body = json.dumps(self.server.metrics.to_dict())
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: t.Any) -> None:
+        LOG.debug("Live metrics: %s" % (format % args))
+
+
+class _HTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], metrics: TaskMetrics):
+        self.metrics = metrics
+        super().__init__(address, _Handler)
+
+
+class MetricsServer:
+    """HTTP endpoint serving the live metrics of the task."""
+
+    def __init__(self, address: str, metrics: TaskMetrics) -> None:
+        """Create the endpoint.
+
+        :param address: <host>:<port> to listen on
+        :param metrics: the statistics to serve
+        """
+        self.address = address
+        self.metrics = metrics
+        self._server: _HTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> MetricsServer:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        exc_traceback: types.TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    @property
+    def port(self) -> int | None:
+        """The port the endpoint listens on, if it is started."""
+        return self._server.server_address[1] if self._server else None
+
+    def start(self) -> None:
+        """Start serving the metrics."""
+        host, _sep, port = self.address.rpartition(":")
+        try:
+            if not port.isdigit():
+                raise ValueError("the address should be <host>:<port>")
+            self._server = _HTTPServer((host, int(port)), self.metrics)
+        except (OSError, ValueError) as e:
+            LOG.warning(
+                "Task %s | Failed to serve the live metrics on %s: %s"
+                % (self.metrics.task_uuid, self.address, e)
+            )
+            return
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        LOG.info(
+            "Task %s | Live metrics are served on http://%s:%s/metrics"
+            % (self.metrics.task_uuid, host or "0.0.0.0", self.port)
+        )
+
+    def stop(self) -> None:
+        """Stop serving the metrics."""
+        if self._server is None or self._thread is None:
+            return
+        self._server.shutdown()
+        self._thread.join()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
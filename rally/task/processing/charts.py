@@ -15,6 +15,7 @@
 import abc
 import bisect
 import collections
+import functools
 import math
 
 from rally.common import streaming_algorithms as streaming
@@ -223,6 +224,46 @@ class LoadProfileChart(Chart):
         return [(self._name, list(zip(self._time_axis, self._running)))]
 
 
+class RPSProfileChart(Chart):
+    """Chart for requested and achieved iterations per second.
+
+    Only the iterations which have the scheduled start time, i.e. the ones
+    started by an open-loop runner, are taken into account. The requested
+    rate is the number of iterations scheduled within a second of the load,
+    the achieved one is the number of iterations actually started within it.
+    """
+
+    widget = "Lines"
+
+    def __init__(self, workload):
+        super().__init__(workload)
+        if self._workload["data"]:
+            first = self._workload["data"][0]
+            self._tstamp_start = first.get("scheduled_at", first["timestamp"])
+        else:
+            self._tstamp_start = self._workload["start_time"]
+        self._requested = collections.Counter()
+        self._achieved = collections.Counter()
+
+    def _second(self, timestamp):
+        return max(0, int(timestamp - self._tstamp_start))
+
+    def add_iteration(self, iteration):
+        if "scheduled_at" not in iteration:
+            return
+        self._requested[self._second(iteration["scheduled_at"])] += 1
+        self._achieved[self._second(iteration["timestamp"])] += 1
+
+    def render(self):
+        if not self._requested:
+            return []
+        seconds = range(max(max(self._requested), max(self._achieved)) + 1)
+        return [
+            ("requested", [(s, self._requested[s]) for s in seconds]),
+            ("achieved", [(s, self._achieved[s]) for s in seconds]),
+        ]
+
+
 class HistogramChart(Chart):
     """Base class for chart with histograms.
 
@@ -479,6 +520,9 @@ class MainStatsTable(Table):
 
     def add_iteration(self, iteration):
         """Add data of a single iteration."""
+        if "phase" in iteration:
+            # the warm-up and the cool-down of the load do not count
+            return
         data = atomic.merge_atomic_actions(iteration["atomic_actions"])
         # NOTE(andreykurilin): the easiest way to identify the last
         #   atomic is to find the last added key to the OrderedDict. The
@@ -516,6 +560,28 @@ class MainStatsTable(Table):
                 },
             ),
         }
+        if "scheduled_at" in iteration:
+            # the time from the moment the iteration should have been
+            # started till its end, including the time it waited for a start
+            data["total"]["children"]["latency"] = {
+                "duration": (
+                    iteration["timestamp"]
+                    + total_duration
+                    - iteration["scheduled_at"]
+                ),
+                "count": 1,
+                "failed": bool(iteration["error"]),
+                "children": {},
+            }
+        if "stage" in iteration:
+            # the durations of the iterations of every stage of the load
+            stage = "stage %s" % (iteration["stage"] + 1)
+            data["total"]["children"][stage] = {
+                "duration": total_duration,
+                "count": 1,
+                "failed": bool(iteration["error"]),
+                "children": {},
+            }
 
         self._add_data(data)
 
@@ -624,13 +690,12 @@ class MainStatsTable(Table):
         rendered_data = super().render()
         rows_len = len(rendered_data["rows"])
         if rows_len > 1:
-            styles = {
-                rows_len - 3: "rich",
-                rows_len - 2: "oblique",
-                rows_len - 1: "oblique",
-            }
+            total_idx = rows_len - 1 - len(self._data["total"]["children"])
+            styles = {total_idx: "rich"}
+            for i in range(total_idx + 1, rows_len):
+                styles[i] = "oblique"
             for i, row in enumerate(rendered_data["rows"]):
-                if i == rows_len - 3:
+                if i == total_idx:
                     break
                 if row[0].startswith(" -"):
                     styles[i] = "oblique"
@@ -638,6 +703,142 @@ class MainStatsTable(Table):
         return rendered_data
 
 
+class ConcurrencyTable(Table):
+    """Table with statistics of iterations by their concurrency.
+
+    Only the iterations which have the concurrency they were started with,
+    i.e. the ones started by adaptive_concurrency runner, are taken into
+    account. The throughput at a concurrency is estimated by Little's law
+    as the number of iterations in flight divided by their average duration.
+    The row of the highest throughput is emphasized.
+    """
+
+    columns = [
+        "Concurrency",
+        "Iterations",
+        "Throughput (iter/sec)",
+        "Avg (sec)",
+        "95%ile (sec)",
+        "Success",
+    ]
+
+    def add_iteration(self, iteration):
+        if "concurrency" not in iteration:
+            return
+        concurrency = iteration["concurrency"]
+        if concurrency not in self._data:
+            self._data[concurrency] = [
+                (streaming.IncrementComputation(), None),
+                (
+                    streaming.MeanComputation(),
+                    functools.partial(self._get_throughput, concurrency),
+                ),
+                (streaming.MeanComputation(), None),
+                (streaming.PointsSaver(), self._get_95ile),
+                (streaming.MeanComputation(), self._get_success),
+            ]
+        count, throughput, avg, points, success = (
+            ins for ins, _fn in self._data[concurrency]
+        )
+        duration = iteration["duration"] + iteration["idle_duration"]
+        count.add()
+        for sa in (throughput, avg, points):
+            sa.add(duration)
+        success.add(0 if iteration["error"] else 1)
+
+    def _get_95ile(self, ins, has_result):
+        points = sorted(ins.result())
+        return self._round(utils.percentile(points, 0.95), has_result)
+
+    @staticmethod
+    def _get_success(ins, has_result):
+        return "%.1f%%" % (ins.result() * 100) if has_result else "n/a"
+
+    @staticmethod
+    def _get_throughput(concurrency, ins, has_result):
+        avg = ins.result()
+        if not has_result or not avg:
+            return "n/a"
+        return round(concurrency / avg, 3)
+
+    def get_rows(self):
+        return [
+            self._process_row(concurrency, self._data[concurrency])
+            for concurrency in sorted(self._data)
+        ]
+
+    def render(self):
+        rendered_data = super().render()
+        rates = [
+            (row[2], i)
+            for i, row in enumerate(rendered_data["rows"])
+            if row[2] != "n/a"
+        ]
+        rendered_data["styles"] = {max(rates)[1]: "rich"} if rates else {}
+        return rendered_data
+
+
+class StageTable(Table):
+    """Table with statistics of iterations by the stages of the load.
+
+    Only the iterations which have the stage they were started in, i.e. the
+    ones started by stepped_concurrency runner, are taken into account. The
+    throughput of a stage is the number of its iterations divided by the
+    time from the start of the first of them till the end of the last one.
+    """
+
+    columns = [
+        "Stage",
+        "Iterations",
+        "Throughput (iter/sec)",
+        "Median (sec)",
+        "95%ile (sec)",
+        "Success",
+    ]
+
+    def add_iteration(self, iteration):
+        if "stage" not in iteration:
+            return
+        stage = iteration["stage"]
+        if stage not in self._data:
+            self._data[stage] = {
+                "count": streaming.IncrementComputation(),
+                "started_at": streaming.MinComputation(),
+                "finished_at": streaming.MaxComputation(),
+                "points": streaming.PointsSaver(),
+                "success": streaming.MeanComputation(),
+            }
+        data = self._data[stage]
+        duration = iteration["duration"] + iteration["idle_duration"]
+        data["count"].add()
+        data["started_at"].add(iteration["timestamp"])
+        data["finished_at"].add(iteration["timestamp"] + duration)
+        data["points"].add(duration)
+        data["success"].add(0 if iteration["error"] else 1)
+
+    def _process_stage(self, stage, data):
+        count = data["count"].result()
+        wall_time = data["finished_at"].result() - data["started_at"].result()
+        points = sorted(data["points"].result())
+        return [
+            stage + 1,
+            count,
+            round(count / wall_time, 3) if wall_time else "n/a",
+            self._round(utils.percentile(points, 0.5), True),
+            self._round(utils.percentile(points, 0.95), True),
+            "%.1f%%" % (data["success"].result() * 100),
+        ]
+
+    def get_rows(self):
+        return [
+            self._process_stage(stage, self._data[stage])
+            for stage in sorted(self._data)
+        ]
+
+    def render(self):
+        return {"cols": self.columns, "rows": self.get_rows(), "styles": {}}
+
+
 class OutputChart(Chart):
     """Base class for charts related to scenario output."""
 
@@ -99,7 +99,10 @@ def _process_workload(workload, workload_cfg, pos):
     main_area = charts.MainStackedAreaChart(workload)
     main_hist = charts.MainHistogramChart(workload)
     main_stat = charts.MainStatsTable(workload)
+    concurrency_stat = charts.ConcurrencyTable(workload)
+    stage_stat = charts.StageTable(workload)
     load_profile = charts.LoadProfileChart(workload)
+    rps_profile = charts.RPSProfileChart(workload)
     atomic_pie = charts.AtomicAvgChart(workload)
     atomic_area = charts.AtomicStackedAreaChart(workload)
     atomic_hist = charts.AtomicHistogramChart(workload)
@@ -154,7 +157,10 @@ def _process_workload(workload, workload_cfg, pos):
             main_area,
             main_hist,
             main_stat,
+            concurrency_stat,
+            stage_stat,
             load_profile,
+            rps_profile,
             atomic_pie,
             atomic_area,
             atomic_hist,
@@ -182,12 +188,15 @@ def _process_workload(workload, workload_cfg, pos):
             "histogram": main_hist.render(),
         },
         "load_profile": load_profile.render(),
+        "rps_profile": rps_profile.render(),
         "atomic": {
             "histogram": atomic_hist.render(),
             "iter": atomic_area.render(),
             "pie": atomic_pie.render(),
         },
         "table": main_stat.render(),
+        "concurrency_table": concurrency_stat.render(),
+        "stage_table": stage_stat.render(),
         "additive_output": additive_output,
         "complete_output": complete_output,
         "has_output": any(additive_output) or any(complete_output),
@@ -16,18 +16,28 @@
 from __future__ import annotations
 
 import abc
+import asyncio
 import collections
+import contextlib
 import copy
 import multiprocessing
+import multiprocessing.connection
+import queue as queue_m
+import threading
 import time
 import typing as t
 
+import typing_extensions as te
+
+from rally import exceptions
+from rally.common import cfg
 from rally.common import logging
 from rally.common import utils as rutils
 from rally.common import validation
 from rally.common.plugin import plugin
 from rally.task import atomic
 from rally.task import scenario
+from rally.task import transport
 from rally.task import types
 from rally.task import utils
 
@@ -48,9 +58,77 @@ class ScenarioRunnerResult(t.TypedDict):
     error: list[str]
     output: scenario._Output
     atomic_actions: list[dict[str, t.Any]] | list[atomic.AtomicAction]
+    # the time at which an open-loop runner intended to start the iteration
+    scheduled_at: te.NotRequired[float]
+    # the concurrency an adaptive runner started the iteration with
+    concurrency: te.NotRequired[int]
+    # the number of the stage of stepped_concurrency runner
+    stage: te.NotRequired[int]
+    # "warmup" or "cooldown" if the iteration is excluded from the SLA and
+    # from the statistics of durations, see LoadPhases
+    phase: te.NotRequired[str]
 
 
 LOG = logging.getLogger(__name__)
+CONF = cfg.CONF
+CONF_OPTS = [
+    cfg.IntOpt(
+        "runner_result_batch_size",
+        default=100,
+        min=1,
+        help="Maximum number of iteration results which a worker process of "
+        "a scenario runner sends to the runner at once.",
+    ),
+    cfg.FloatOpt(
+        "runner_result_batch_delay",
+        default=0.01,
+        min=0,
+        help="Maximum time in seconds for which a worker process of a "
+        "scenario runner may hold an iteration result before sending it "
+        "to the runner.",
+    ),
+    cfg.StrOpt(
+        "runner_result_transport",
+        default="queue",
+        choices=["queue", "shared_memory"],
+        help="How worker processes of a scenario runner pass iteration "
+        "results to the runner. 'shared_memory' writes the timings of the "
+        "iterations without errors, output and atomic actions to a ring "
+        "buffer in shared memory, which is the cheapest way to report "
+        "a huge number of lightweight iterations.",
+    ),
+    cfg.IntOpt(
+        "runner_result_ring_size",
+        default=65536,
+        min=1,
+        help="The number of iteration results which fit into the ring "
+        "buffer of a worker process when 'shared_memory' transport is "
+        "used.",
+    ),
+    cfg.IntOpt(
+        "runner_iteration_block_size",
+        default=32,
+        min=1,
+        help="Maximum number of iteration numbers which a worker process of "
+        "a scenario runner takes from the shared counter at once.",
+    ),
+    cfg.BoolOpt(
+        "scenario_context_deepcopy",
+        default=False,
+        help="Give every scenario iteration a deep copy of the context and "
+        "of the scenario arguments instead of a copy-on-write view of them, "
+        "which copies only the objects the iteration actually accesses.",
+    ),
+    cfg.StrOpt(
+        "runner_agent_authkey",
+        secret=True,
+        help="The secret which agents of distributed runner and the task "
+        "engine use to authenticate each other. It must be the same on all "
+        "hosts, agents do not start without it.",
+    ),
+]
+CONF.register_opts(CONF_OPTS)
+
 configure = plugin.configure
 
 
@@ -67,21 +145,119 @@ def format_result_on_timeout(
     }
 
 
+def _isolate(obj: dict[str, t.Any]) -> dict[str, t.Any]:
+    """Return a copy of the dict which one iteration can change freely."""
+    if CONF.scenario_context_deepcopy:
+        return copy.deepcopy(obj)
+    return rutils.CopyOnWriteDict(obj)
+
+
 def _get_scenario_context(
     iteration: int, context_obj: dict[str, t.Any]
 ) -> dict[str, t.Any]:
-    context_obj = copy.deepcopy(context_obj)
+    context_obj = _isolate(context_obj)
     context_obj["iteration"] = iteration + 1  # Numeration starts from `1'
     return context_obj
 
 
+def _resolve_deferred_args(
+    scenario_inst: scenario.Scenario, scenario_kwargs: dict[str, t.Any]
+) -> None:
+    # resolve any per-iteration argument now that this iteration's
+    # scenario (its narrowed user, project and clients) exists
+    for kw_name, kw_value in list(scenario_kwargs.items()):
+        if isinstance(kw_value, types.DeferredResource):
+            scenario_kwargs[kw_name] = kw_value.resolve(scenario_inst)
+
+
+class _ScenarioPool:
+    """Instances of the reusable scenarios which wait for an iteration.
+
+    See Scenario.setup_worker(). The instances are kept per scenario class
+    and per workload (the owner of the context), so a workload never gets
+    the instance which was set up for another one.
+    """
+
+    def __init__(self) -> None:
+        self._idle: dict[
+            tuple[type[scenario.Scenario], str | None],
+            list[scenario.Scenario],
+        ] = collections.defaultdict(list)
+        self._lock = threading.Lock()
+
+    def acquire(
+        self, cls: type[scenario.Scenario], context_obj: dict[str, t.Any]
+    ) -> scenario.Scenario:
+        """Return the instance of the scenario for the iteration."""
+        if not cls.is_reusable():
+            return cls(context_obj)
+        with self._lock:
+            idle = self._idle[(cls, context_obj.get("owner_id"))]
+            scenario_inst = idle.pop() if idle else None
+        if scenario_inst is None:
+            scenario_inst = cls(context_obj)
+            scenario_inst.setup_worker()
+        else:
+            scenario_inst.reset(context_obj)
+        return scenario_inst
+
+    def release(
+        self, scenario_inst: scenario.Scenario, context_obj: dict[str, t.Any]
+    ) -> None:
+        """Keep the instance of the scenario for the next iterations."""
+        if not scenario_inst.is_reusable():
+            return
+        key = (type(scenario_inst), context_obj.get("owner_id"))
+        with self._lock:
+            self._idle[key].append(scenario_inst)
+
+    def clear(self, owner_id: str | None) -> None:
+        """Drop the instances which belong to the finished workload."""
+        with self._lock:
+            for key in [k for k in self._idle if k[1] == owner_id]:
+                del self._idle[key]
+
+
+_scenario_pool = _ScenarioPool()
+
+
+def _format_iteration_result(
+    timer: rutils.Timer,
+    scenario_inst: scenario.Scenario | None,
+    error: list[str],
+) -> ScenarioRunnerResult:
+    idle_duration = scenario_inst.idle_duration() if scenario_inst else 0.0
+    return {
+        "duration": timer.duration() - idle_duration,
+        "timestamp": timer.timestamp(),
+        "idle_duration": idle_duration,
+        "error": error,
+        "output": (
+            scenario_inst._output
+            if scenario_inst
+            else scenario._Output(additive=[], complete=[])
+        ),
+        "atomic_actions": (
+            scenario_inst.atomic_actions() if scenario_inst else []
+        ),
+    }
+
+
 def _run_scenario_once(
     cls: type[scenario.Scenario],
     method_name: t.Literal["run"],
     context_obj: dict[str, t.Any],
     scenario_kwargs: dict[str, t.Any],
     event_queue: multiprocessing.Queue[dict[str, t.Any]] | DequeAsQueue,
+    timeout_guard: t.ContextManager[t.Any] | None = None,
 ) -> ScenarioRunnerResult:
+    """Run a single iteration of the scenario.
+
+    :param timeout_guard: optional context manager which wraps the scenario
+        call. A pooled thread passes a ThreadIteration here, so a timeout
+        that arrives while the guard is being closed is still recorded as
+        an error of this iteration.
+    """
     iteration = context_obj["iteration"]
     event_queue.put(
         {
@@ -91,7 +267,7 @@ def _run_scenario_once(
     )
 
     # provide arguments isolation between iterations
-    scenario_kwargs = copy.deepcopy(scenario_kwargs)
+    scenario_kwargs = _isolate(scenario_kwargs)
 
     task_uuid = context_obj["task"]["uuid"]
     LOG.info(f"Task {task_uuid} | ITER: {iteration} START")
@@ -103,13 +279,10 @@ def _run_scenario_once(
             # building the scenario (e.g. creating its clients) is done inside
             # the timer so that a failure here is recorded as a failed
             # iteration instead of being lost together with the worker thread
-            scenario_inst = cls(context_obj)
-            # resolve any per-iteration argument now that this iteration's
-            # scenario (its narrowed user, project and clients) exists
-            for kw_name, kw_value in list(scenario_kwargs.items()):
-                if isinstance(kw_value, types.DeferredResource):
-                    scenario_kwargs[kw_name] = kw_value.resolve(scenario_inst)
-            getattr(scenario_inst, method_name)(**scenario_kwargs)
+            with timeout_guard or contextlib.nullcontext():
+                scenario_inst = _scenario_pool.acquire(cls, context_obj)
+                _resolve_deferred_args(scenario_inst, scenario_kwargs)
+                getattr(scenario_inst, method_name)(**scenario_kwargs)
     except Exception as e:
         error = utils.format_exc(e)
         if logging.is_debug():
@@ -118,36 +291,101 @@ def _run_scenario_once(
         status = f"Error {error[0]}: {error[1]}" if error else "OK"
         LOG.info(f"Task {task_uuid} | ITER: {iteration} END: {status}")
 
-        idle_duration = scenario_inst.idle_duration() if scenario_inst else 0.0
-        return {
-            "duration": timer.duration() - idle_duration,
-            "timestamp": timer.timestamp(),
-            "idle_duration": idle_duration,
-            "error": error,
-            "output": (
-                scenario_inst._output
-                if scenario_inst
-                else scenario._Output(additive=[], complete=[])
-            ),
-            "atomic_actions": (
-                scenario_inst.atomic_actions() if scenario_inst else []
-            ),
+        result = _format_iteration_result(timer, scenario_inst, error)
+        if scenario_inst is not None and not error:
+            _scenario_pool.release(scenario_inst, context_obj)
+        return result
+
+
+async def _run_scenario_once_async(
+    cls: type[scenario.Scenario],
+    method_name: t.Literal["run"],
+    context_obj: dict[str, t.Any],
+    scenario_kwargs: dict[str, t.Any],
+    event_queue: multiprocessing.Queue[dict[str, t.Any]] | DequeAsQueue,
+    timeout: float | None = None,
+) -> ScenarioRunnerResult:
+    """Await a single iteration of a coroutine scenario.
+
+    The asyncio counterpart of _run_scenario_once(). Since there is no thread
+    to terminate, the timeout is applied by cancelling the coroutine and the
+    iteration is reported with the same ThreadTimeoutException error as an
+    iteration interrupted by TimeoutService.
+
+    :param timeout: seconds to wait for the iteration, None means no timeout
+    """
+    iteration = context_obj["iteration"]
+    event_queue.put(
+        {
+            "type": "iteration",
+            "value": iteration,
         }
+    )
+
+    # provide arguments isolation between iterations
+    scenario_kwargs = _isolate(scenario_kwargs)
+
+    task_uuid = context_obj["task"]["uuid"]
+    LOG.info(f"Task {task_uuid} | ITER: {iteration} START")
+
+    scenario_inst = None
+    error = []
+    try:
+        with rutils.Timer() as timer:
+            scenario_inst = _scenario_pool.acquire(cls, context_obj)
+            _resolve_deferred_args(scenario_inst, scenario_kwargs)
+            try:
+                await asyncio.wait_for(
+                    getattr(scenario_inst, method_name)(**scenario_kwargs),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                raise exceptions.ThreadTimeoutException() from None
+    except Exception as e:
+        error = utils.format_exc(e)
+        if logging.is_debug():
+            LOG.exception(f"Iteration {iteration} raised Exception")
+    finally:
+        status = f"Error {error[0]}: {error[1]}" if error else "OK"
+        LOG.info(f"Task {task_uuid} | ITER: {iteration} END: {status}")
+
+        result = _format_iteration_result(timer, scenario_inst, error)
+        if scenario_inst is not None and not error:
+            _scenario_pool.release(scenario_inst, context_obj)
+        return result
 
 
 def _worker_thread(
-    queue: multiprocessing.Queue[ScenarioRunnerResult],
+    queue: (
+        multiprocessing.Queue[ScenarioRunnerResult]
+        | transport.BatchedResultQueue
+    ),
     cls: type[scenario.Scenario],
     method_name: t.Literal["run"],
     context_obj: dict[str, t.Any],
     scenario_kwargs: dict[str, t.Any],
     event_queue: multiprocessing.Queue[dict[str, t.Any]],
+    scheduled_at: float | None = None,
+    timeout_service: rutils.TimeoutService | None = None,
+    timeout: float | None = None,
+    phase: str | None = None,
 ) -> None:
-    queue.put(
-        _run_scenario_once(
-            cls, method_name, context_obj, scenario_kwargs, event_queue
-        )
+    timeout_guard = None
+    if timeout_service is not None and timeout:
+        timeout_guard = timeout_service.watch(timeout)
+    result = _run_scenario_once(
+        cls,
+        method_name,
+        context_obj,
+        scenario_kwargs,
+        event_queue,
+        timeout_guard=timeout_guard,
     )
+    if scheduled_at is not None:
+        result["scheduled_at"] = scheduled_at
+    if phase is not None:
+        result["phase"] = phase
+    queue.put(result)
 
 
 def _log_worker_info(**info: t.Any) -> None:
@@ -159,6 +397,157 @@ def _log_worker_info(**info: t.Any) -> None:
     LOG.debug(f"Starting a worker.\n\t{info_message}")
 
 
+def _wait_for_start(
+    pool: collections.deque[threading.Thread],
+    max_concurrent: float,
+    scheduled_at: float,
+    aborted: multiprocessing.synchronize.Event,
+) -> bool:
+    """Wait for the scheduled time and for a free concurrent slot.
+
+    Runners which start the iterations at the scheduled times call this
+    before starting each of them.
+
+    :param pool: threads of the iterations which may be still running
+    :param max_concurrent: maximum number of threads running at once
+    :param scheduled_at: the time to start the next iteration at
+    :param aborted: multiprocessing.Event that aborts load generation
+    :returns: False if the load generation was aborted meanwhile
+    """
+    while not aborted.is_set():
+        for thread in [thr for thr in pool if not thr.is_alive()]:
+            pool.remove(thread)
+        if len(pool) >= max_concurrent:
+            pool[0].join(0.001)
+            continue
+        delay = scheduled_at - time.time()
+        if delay <= 0:
+            return True
+        aborted.wait(delay)
+    return False
+
+
+class LoadPhases:
+    """The warm-up and the cool-down parts of the load of a runner.
+
+    The iterations of these parts are run and saved as usual, but they are
+    marked with the `phase` field of the result and are not taken into
+    account by the SLA and by the statistics of durations. The runner which
+    supports them adds `warmup` and `cooldown` options built by schema() to
+    its config.
+    """
+
+    _UNITS = {
+        "iterations": {
+            "type": "integer",
+            "minimum": 1,
+            "description": "The number of iterations.",
+        },
+        "duration": {
+            "type": "number",
+            "minimum": 0,
+            "description": "The number of seconds.",
+        },
+    }
+
+    def __init__(
+        self,
+        config: dict[str, t.Any],
+        times: int | None = None,
+        duration: float | None = None,
+    ) -> None:
+        """Create the phases of the load.
+
+        :param config: the config of the runner
+        :param times: the total number of iterations of the load, if it is
+            known
+        :param duration: the duration of the load, if it is known
+        """
+        self.warmup = config.get("warmup") or {}
+        self.cooldown = config.get("cooldown") or {}
+        self.times = times
+        self.duration = duration
+
+    @classmethod
+    def schema(
+        cls,
+        description: str,
+        units: tuple[str, ...] = ("iterations", "duration"),
+    ) -> dict[str, t.Any]:
+        """Return the schema of the `warmup` or the `cooldown` option.
+
+        :param description: the description of the option
+        :param units: the units the part of the load may be measured in
+        """
+        return {
+            "type": "object",
+            "description": description,
+            "properties": {unit: cls._UNITS[unit] for unit in units},
+            "minProperties": 1,
+            "maxProperties": 1,
+            "additionalProperties": False,
+        }
+
+    @property
+    def timed(self) -> bool:
+        """Whether the phases depend on the time elapsed since the start."""
+        return "duration" in self.warmup or "duration" in self.cooldown
+
+    @staticmethod
+    def check(config: dict[str, t.Any]) -> str | None:
+        """Check that the phases leave some iterations to be measured.
+
+        The load is measured either in seconds, if the config has the
+        `duration` option, or in iterations.
+
+        :param config: the config of the runner
+        :returns: the error message or None if the config is correct
+        """
+        if "duration" in config:
+            skipped_duration = sum(
+                config.get(phase, {}).get("duration", 0)
+                for phase in ("warmup", "cooldown")
+            )
+            if skipped_duration and skipped_duration >= config["duration"]:
+                return (
+                    "The warm-up and the cool-down durations (%s) should be "
+                    "less than the duration of the load (%s)."
+                    % (skipped_duration, config["duration"])
+                )
+            return None
+        skipped = sum(
+            config.get(phase, {}).get("iterations", 0)
+            for phase in ("warmup", "cooldown")
+        )
+        if skipped and skipped >= config.get("times", 1):
+            return (
+                "The warm-up and the cool-down iterations (%s) should be "
+                "less than the total number of iterations (%s)."
+                % (skipped, config.get("times", 1))
+            )
+        return None
+
+    def get(self, iteration: int, elapsed: float) -> str | None:
+        """Return the phase of the iteration.
+
+        :param iteration: the number of the iteration, starting from 0
+        :param elapsed: seconds since the start of the load till the start
+            of the iteration
+        :returns: "warmup", "cooldown" or None for the rest of the load
+        """
+        if iteration < self.warmup.get("iterations", 0):
+            return "warmup"
+        if elapsed < self.warmup.get("duration", 0):
+            return "warmup"
+        if self.times is not None and "iterations" in self.cooldown:
+            if iteration >= self.times - self.cooldown["iterations"]:
+                return "cooldown"
+        if self.duration is not None and "duration" in self.cooldown:
+            if elapsed >= self.duration - self.cooldown["duration"]:
+                return "cooldown"
+        return None
+
+
 @validation.add_default("jsonschema")
 @plugin.base()
 class ScenarioRunner(
@@ -196,14 +585,16 @@ class ScenarioRunner(
         """
         self.task = task
         self.config = config
-        self.result_queue: collections.deque[list[ScenarioRunnerResult]] = (
-            collections.deque()
-        )
-        self.event_queue: collections.deque[dict[str, t.Any]] = (
-            collections.deque()
-        )
+        self.result_queue: rutils.WaitableDeque = rutils.WaitableDeque()
+        self.event_queue: rutils.WaitableDeque = rutils.WaitableDeque()
         self.aborted = multiprocessing.Event()
         self.run_duration = 0.0
+        # the statistics of the load which the runner collects itself, they
+        # are saved to the workload as statistics["runner"]
+        self.statistics: dict[str, t.Any] = {}
+        # the SLA criteria of the workload, set by the task engine for the
+        # runners which adapt the load to them
+        self.workload_sla: dict[str, t.Any] = {}
         self.batch_size = batch_size
         self.result_batch: list[ScenarioRunnerResult] = []
 
@@ -232,9 +623,15 @@ class ScenarioRunner(
         # NOTE(boris-42): processing @types decorators
         args = types.preprocess(name, context, args)
 
-        with rutils.Timer() as timer:
-            # TODO(boris-42): remove method_name argument, now it's always run
-            self._run_scenario(scenario_plugin, "run", context, args)
+        try:
+            with rutils.Timer() as timer:
+                # TODO(boris-42): remove method_name argument, now it's
+                # always run
+                self._run_scenario(scenario_plugin, "run", context, args)
+        finally:
+            # the runners which run the iterations in the task engine process
+            # leave the reusable instances of the scenario there
+            _scenario_pool.clear(context.get("owner_id"))
 
         self.run_duration = timer.duration()
 
@@ -274,36 +671,101 @@ class ScenarioRunner(
 
         return process_pool
 
+    @staticmethod
+    def _create_result_queue(
+        workers: int = 1,
+    ) -> transport.BatchedResultQueue:
+        """Create a queue for the results of the worker processes.
+
+        Worker processes must flush() the queue before they exit.
+
+        :param workers: the number of worker processes
+        """
+        if CONF.runner_result_transport == "shared_memory":
+            return transport.SharedMemoryResultQueue(
+                workers,
+                ring_size=CONF.runner_result_ring_size,
+                max_size=CONF.runner_result_batch_size,
+                max_delay=CONF.runner_result_batch_delay,
+            )
+        return transport.BatchedResultQueue(
+            max_size=CONF.runner_result_batch_size,
+            max_delay=CONF.runner_result_batch_delay,
+        )
+
+    @staticmethod
+    def _create_iteration_counter(
+        limit: int | None = None, workers: int = 1
+    ) -> rutils.BlockRAMInt:
+        """Create a counter which gives out iteration numbers to workers.
+
+        :param limit: the number of iterations, if it is known
+        :param workers: the number of worker processes
+        """
+        return rutils.BlockRAMInt(
+            block_size=CONF.runner_iteration_block_size,
+            limit=limit,
+            workers=workers,
+        )
+
     def _join_processes(
         self,
         process_pool: collections.deque[multiprocessing.Process],
-        result_queue: multiprocessing.Queue[ScenarioRunnerResult],
+        result_queue: (
+            multiprocessing.Queue[ScenarioRunnerResult]
+            | transport.BatchedResultQueue
+        ),
         event_queue: multiprocessing.Queue[dict[str, t.Any]],
     ) -> None:
         """Join the processes in the pool and send their results to the queue.
 
+        Instead of polling the queues, the method blocks until there is
+        something to read from one of them or one of the processes exits,
+        and then drains everything that is already available.
+
         :param process_pool: pool of processes to join
-        :param result_queue: multiprocessing.Queue that receives the results
+        :param result_queue: multiprocessing.Queue or BatchedResultQueue
+            that receives the results
         :param event_queue: multiprocessing.Queue that receives the events
         """
+        readers = [
+            result_queue._reader,  # type: ignore[union-attr]
+            event_queue._reader,  # type: ignore[attr-defined]
+        ]
         while process_pool:
-            while process_pool and not process_pool[0].is_alive():
-                process_pool.popleft().join()
+            multiprocessing.connection.wait(
+                readers + [p.sentinel for p in process_pool]
+            )
 
-            if result_queue.empty() and event_queue.empty():
-                # sleep a bit to avoid 100% usage of CPU by this method
-                time.sleep(0.01)
+            for process in [p for p in process_pool if not p.is_alive()]:
+                process.join()
+                process_pool.remove(process)
 
-            while not event_queue.empty():
-                self.send_event(**event_queue.get())
+            self._drain_queue(event_queue, lambda e: self.send_event(**e))
+            self._drain_queue(result_queue, self._send_result)
 
-            while not result_queue.empty():
-                self._send_result(result_queue.get())
+        # a process flushes its queues before it exits, so whatever was sent
+        # by the last processes is already available here
+        self._drain_queue(event_queue, lambda e: self.send_event(**e))
+        self._drain_queue(result_queue, self._send_result)
 
         self._flush_results()
         result_queue.close()
         event_queue.close()
 
+    @staticmethod
+    def _drain_queue(
+        queue: multiprocessing.Queue[t.Any] | transport.BatchedResultQueue,
+        handler: t.Callable[[t.Any], None],
+    ) -> None:
+        """Pass all items that are available in the queue to the handler."""
+        while True:
+            try:
+                item = queue.get_nowait()
+            except queue_m.Empty:
+                return
+            handler(item)
+
     def _flush_results(self) -> None:
         if self.result_batch:
             sorted_batch = sorted(
@@ -151,6 +151,43 @@ class Scenario(
         self._idle_duration = 0.0
         self._output: _Output = dict(additive=[], complete=[])
 
+    @classmethod
+    def is_reusable(cls) -> bool:
+        """Whether an instance of the scenario serves many iterations."""
+        return cls.setup_worker is not Scenario.setup_worker
+
+    def setup_worker(self) -> None:
+        """Prepare the instance to be reused by the iterations of a worker.
+
+        By default every iteration gets its own instance of the scenario.
+        The instances of a scenario which overrides this method are reused
+        instead: a worker keeps the instances which are not busy and hands
+        them to the next iterations, so there are no more of them than the
+        iterations which run at once. The method is called once, right after
+        an instance is created, and reset() is called before every next
+        iteration. It is the place for the expensive state which should
+        survive between the iterations, like HTTP sessions, connection pools
+        or token caches.
+
+        An instance is discarded after a failed iteration, so the next one
+        starts with a freshly created instance.
+        """
+
+    def reset(self, context: dict[str, t.Any]) -> None:
+        """Prepare the reused instance for the next iteration.
+
+        It drops the data which belong to the previous iteration: the
+        atomic actions, the output and the idle duration. A scenario which
+        keeps more per-iteration state should extend this method.
+
+        :param context: the context of the next iteration
+        """
+        self.context = context
+        self.task = self.context.get("task", {})
+        self._idle_duration = 0.0
+        self._output = dict(additive=[], complete=[])
+        self.reset_atomic_actions()
+
     def get_owner_id(self) -> str | None:
         if "owner_id" in self.context:
             return self.context["owner_id"]
@@ -80,8 +80,7 @@ class TaskConfig:
             sconf.setdefault("tags", [])
             sconf.setdefault("description", "")
 
-            # it is not supported feature yet, but the code expects this
-            # variable
+            # the contexts which are set up once for all workloads
             sconf.setdefault("contexts", {})
 
             workloads = []
@@ -139,8 +138,8 @@ class TaskConfig:
         task["subtasks"] = []
         for subtask in self.subtasks:
             subtask = copy.deepcopy(subtask)
-            # we do not allow to setup this property yet
-            del subtask["contexts"]
+            if not subtask["contexts"]:
+                del subtask["contexts"]
             for w in subtask["workloads"]:
                 # it is inner field, hope we will remove it someday
                 del w["position"]
@@ -312,6 +311,8 @@ class TaskConfig:
                 "items": {"type": "string", "maxLength": 255},
             },
             "run_in_parallel": {"type": "boolean"},
+            "max_parallel": {"type": "integer", "minimum": 1},
+            "contexts": {"type": "object"},
             "workloads": {
                 "type": "array",
                 "minItems": 1,
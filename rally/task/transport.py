@@ -0,0 +1,401 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Channels which deliver iteration results from workers to the runner."""
+
+from __future__ import annotations
+
+import array
+import collections
+import multiprocessing
+import multiprocessing.connection
+import multiprocessing.shared_memory
+import os
+import pickle
+import struct
+import threading
+import time
+import typing as t
+
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from rally.task import runner
+
+
+# fields which every iteration result has and which are always numbers, so
+# they can be packed into an array of doubles instead of being pickled
+_FIXED_FIELDS = ("timestamp", "duration", "idle_duration")
+
+# the most common shape of the rest of the result. It is not pickled at all,
+# `None` is sent instead.
+_EMPTY_VARIABLE_PART = {
+    "error": [],
+    "output": {"additive": [], "complete": []},
+    "atomic_actions": [],
+}
+
+
+def _variable_part(
+    result: runner.ScenarioRunnerResult,
+) -> dict[str, t.Any] | None:
+    """Return the fields of the result which can not be packed.
+
+    None is returned if they all are empty.
+    """
+    rest = {k: v for k, v in result.items() if k not in _FIXED_FIELDS}
+    return None if rest == _EMPTY_VARIABLE_PART else rest
+
+
+def _make_result(fixed: t.Sequence[float]) -> runner.ScenarioRunnerResult:
+    """Make the result which has nothing but the fixed fields."""
+    return {
+        "timestamp": fixed[0],
+        "duration": fixed[1],
+        "idle_duration": fixed[2],
+        "error": [],
+        "output": {"additive": [], "complete": []},
+        "atomic_actions": [],
+    }
+
+
+def encode_batch(
+    results: list[runner.ScenarioRunnerResult],
+) -> tuple[bytes, bytes]:
+    """Encode the batch of iteration results.
+
+    :param results: iteration results
+    :returns: a tuple of the packed fixed fields of all results and a single
+        pickle with the variable parts of all results
+    """
+    fixed = array.array("d")
+    variable: list[dict[str, t.Any] | None] = []
+    for result in results:
+        fixed.extend(
+            (
+                float(result["timestamp"]),
+                float(result["duration"]),
+                float(result["idle_duration"]),
+            )
+        )
+        variable.append(_variable_part(result))
+    return (
+        fixed.tobytes(),
+        pickle.dumps(variable, protocol=pickle.HIGHEST_PROTOCOL),
+    )
+
+
+def decode_batch(
+    batch: tuple[bytes, bytes],
+) -> list[runner.ScenarioRunnerResult]:
+    """Decode the batch made by encode_batch() back into results."""
+    fixed = array.array("d")
+    fixed.frombytes(batch[0])
+    variable = pickle.loads(batch[1])
+
+    results = []
+    step = len(_FIXED_FIELDS)
+    for i, rest in enumerate(variable):
+        result = _make_result(fixed[i * step:(i + 1) * step])
+        if rest is not None:
+            result.update(rest)
+        results.append(result)
+    return results
+
+
+class BatchedResultQueue:
+    """multiprocessing.Queue which sends iteration results in batches.
+
+    Pickling every result separately and pushing it through the queue costs
+    more than running a lightweight scenario iteration. The worker side of
+    this queue collects results into a batch instead and sends the whole
+    batch once it has `max_size` results or once its oldest result waits for
+    `max_delay` seconds, whichever comes first. The fixed fields of the
+    results are packed into an array and the rest is pickled once per batch.
+
+    Both ends look like a queue of single results: workers call put() and
+    flush() before they exit, the runner reads the results one by one with
+    get_nowait().
+    """
+
+    def __init__(self, max_size: int = 100, max_delay: float = 0.01) -> None:
+        """Create the queue.
+
+        :param max_size: the number of results in a full batch
+        :param max_delay: maximum time in seconds for which a result may wait
+            in a batch before the batch is sent
+        """
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._queue: multiprocessing.Queue[tuple[bytes, bytes] | None] = (
+            multiprocessing.Queue()
+        )
+        self._decoded: collections.deque[runner.ScenarioRunnerResult] = (
+            collections.deque()
+        )
+        self._pid: int | None = None
+        # several threads of a worker may put their first results at once
+        self._sender_lock = threading.Lock()
+
+    # attributes which belong to the worker process that put the results
+    _SENDER_ATTRS: tuple[str, ...] = (
+        "_batch",
+        "_batch_started_at",
+        "_cond",
+        "_flusher",
+        "_stopped",
+    )
+
+    def __getstate__(self) -> dict[str, t.Any]:
+        state = {
+            k: v
+            for k, v in self.__dict__.items()
+            if k not in self._SENDER_ATTRS
+        }
+        state["_decoded"] = collections.deque()
+        state["_pid"] = None
+        del state["_sender_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, t.Any]) -> None:
+        self.__dict__.update(state)
+        self._sender_lock = threading.Lock()
+
+    def _init_sender(self) -> None:
+        self._batch: list[runner.ScenarioRunnerResult] = []
+        self._batch_started_at = 0.0
+        self._cond = threading.Condition()
+        self._flusher: threading.Thread | None = None
+        self._stopped = False
+
+    def _send_batch(self) -> None:
+        # the caller holds self._cond
+        if self._batch:
+            self._queue.put(encode_batch(self._batch))
+            self._batch = []
+
+    def _flush_by_time(self) -> None:
+        with self._cond:
+            while not self._stopped:
+                if not self._batch:
+                    self._cond.wait()
+                    continue
+                left = self._batch_started_at + self.max_delay
+                left -= time.monotonic()
+                if left > 0:
+                    self._cond.wait(left)
+                    continue
+                self._send_batch()
+
+    def put(self, result: runner.ScenarioRunnerResult) -> None:
+        """Add the iteration result to the current batch."""
+        if self._pid != os.getpid():
+            with self._sender_lock:
+                if self._pid != os.getpid():
+                    self._init_sender()
+                    # the sender is ready to be used by other threads
+                    self._pid = os.getpid()
+        with self._cond:
+            if self._flusher is None:
+                self._stopped = False
+                self._flusher = threading.Thread(
+                    target=self._flush_by_time, daemon=True
+                )
+                self._flusher.start()
+            if not self._batch:
+                self._batch_started_at = time.monotonic()
+                self._cond.notify()
+            self._batch.append(result)
+            if len(self._batch) >= self.max_size:
+                self._send_batch()
+
+    def flush(self) -> None:
+        """Send the pending results.
+
+        The worker must call this method after its last put(), otherwise
+        the results of the last batch are lost.
+        """
+        if self._pid != os.getpid():
+            return
+        with self._cond:
+            self._send_batch()
+            self._stopped = True
+            self._cond.notify()
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.join()
+
+    def get_nowait(self) -> runner.ScenarioRunnerResult:
+        """Return the next received result.
+
+        :raises queue.Empty: if there is no received result
+        """
+        while not self._decoded:
+            self._receive(self._queue.get_nowait())
+        return self._decoded.popleft()
+
+    def _receive(self, message: t.Any) -> None:
+        self._decoded.extend(decode_batch(message))
+
+    @property
+    def _reader(self) -> multiprocessing.connection.Connection:
+        # the end of the pipe which becomes ready to read when a batch arrives
+        return self._queue._reader  # type: ignore[attr-defined]
+
+    def close(self) -> None:
+        self._queue.close()
+
+
+class SharedMemoryResultQueue(BatchedResultQueue):
+    """BatchedResultQueue which passes lightweight results via shared memory.
+
+    Every worker process gets its own ring buffer in shared memory. The
+    timestamp, duration and idle_duration of a result which has no error,
+    output and atomic actions are written there as a fixed-size record and
+    the runner reads them without any pickling. The queue carries nothing but
+    a short notice per batch that new records are available.
+
+    The results with an error, output or atomic actions, as well as the
+    results which do not fit into a full ring, take the slow path of
+    BatchedResultQueue.
+    """
+
+    # a ring starts with the number of records which were ever written to it
+    # (updated by the worker) and the number of records which were ever read
+    # from it (updated by the runner)
+    _POSITION = struct.Struct("Q")
+    _READ_OFFSET = _POSITION.size
+    _RECORDS_OFFSET = 2 * _POSITION.size
+    _SENDER_ATTRS = BatchedResultQueue._SENDER_ATTRS + ("_ring",)
+
+    def __init__(
+        self,
+        workers: int,
+        ring_size: int = 65536,
+        max_size: int = 100,
+        max_delay: float = 0.01,
+    ) -> None:
+        """Create the queue.
+
+        :param workers: the number of worker processes which put results
+            into the queue, one ring buffer is created for each of them
+        :param ring_size: the number of records in a ring buffer
+        :param max_size: the number of results in a full batch
+        :param max_delay: maximum time in seconds for which a result may wait
+            in a batch before the batch is sent
+        """
+        super().__init__(max_size=max_size, max_delay=max_delay)
+        self.ring_size = ring_size
+        self._rings = [
+            multiprocessing.shared_memory.SharedMemory(
+                create=True,
+                size=self._RECORDS_OFFSET
+                + ring_size * len(_FIXED_FIELDS) * 8,
+            )
+            for _ in range(workers)
+        ]
+        self._claimed_rings = multiprocessing.Value("i", 0)
+
+    def _init_sender(self) -> None:
+        super()._init_sender()
+        with self._claimed_rings.get_lock():
+            number = self._claimed_rings.value
+            self._claimed_rings.value += 1
+        self._ring = (
+            self._rings[number] if number < len(self._rings) else None
+        )
+
+    def _write_to_ring(
+        self, results: list[runner.ScenarioRunnerResult]
+    ) -> int:
+        """Write as many results to the ring as it has room for.
+
+        :returns: the number of written results
+        """
+        if self._ring is None:
+            return 0
+        buf = t.cast(memoryview, self._ring.buf)
+        (written,) = self._POSITION.unpack_from(buf, 0)
+        (read,) = self._POSITION.unpack_from(buf, self._READ_OFFSET)
+        count = min(len(results), self.ring_size - (written - read))
+        if count <= 0:
+            return 0
+
+        records = array.array("d")
+        for result in results[:count]:
+            records.extend(
+                (
+                    float(result["timestamp"]),
+                    float(result["duration"]),
+                    float(result["idle_duration"]),
+                )
+            )
+        step = len(_FIXED_FIELDS)
+        start = written % self.ring_size
+        head = min(count, self.ring_size - start)
+        with buf[self._RECORDS_OFFSET:] as raw, raw.cast("d") as view:
+            view[start * step:(start + head) * step] = records[:head * step]
+            if head < count:
+                view[:(count - head) * step] = records[head * step:]
+        # the records must be in place before the runner can see them
+        self._POSITION.pack_into(buf, 0, written + count)
+        return count
+
+    def _read_rings(self) -> None:
+        step = len(_FIXED_FIELDS)
+        for ring in self._rings:
+            buf = t.cast(memoryview, ring.buf)
+            (written,) = self._POSITION.unpack_from(buf, 0)
+            (read,) = self._POSITION.unpack_from(buf, self._READ_OFFSET)
+            if written == read:
+                continue
+            start = read % self.ring_size
+            count = written - read
+            head = min(count, self.ring_size - start)
+            with buf[self._RECORDS_OFFSET:] as raw, raw.cast("d") as view:
+                records = array.array("d", view[start * step:
+                                                (start + head) * step])
+                if head < count:
+                    records.extend(view[:(count - head) * step])
+            self._POSITION.pack_into(buf, self._READ_OFFSET, written)
+            self._decoded.extend(
+                _make_result(records[i:i + step])
+                for i in range(0, len(records), step)
+            )
+
+    def _send_batch(self) -> None:
+        # the caller holds self._cond
+        if not self._batch:
+            return
+        lightweight = []
+        slow = []
+        for result in self._batch:
+            if _variable_part(result) is None:
+                lightweight.append(result)
+            else:
+                slow.append(result)
+        written = self._write_to_ring(lightweight)
+        if written:
+            self._queue.put(None)
+        self._batch = slow + lightweight[written:]
+        super()._send_batch()
+
+    def _receive(self, message: t.Any) -> None:
+        if message is None:
+            self._read_rings()
+        else:
+            super()._receive(message)
+
+    def close(self) -> None:
+        super().close()
+        for ring in self._rings:
+            ring.close()
+            ring.unlink()
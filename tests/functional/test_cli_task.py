@@ -16,6 +16,8 @@
 import json
 import os
 import re
+import signal
+import subprocess
 import threading
 import time
 import unittest
@@ -981,6 +983,53 @@ class TaskTestCase(unittest.TestCase):
         self.assertEqual(1, len(results))
         self.assertIn("aborted", rally("task status"))
 
+    def test_resume(self):
+        cfg = {
+            "Dummy.dummy": [
+                {
+                    "runner": {
+                        "type": "serial",
+                        "times": 2,
+                    }
+                },
+                {
+                    "args": {
+                        "sleep": 2
+                    },
+                    "runner": {
+                        "type": "serial",
+                        "times": 5,
+                    }
+                }
+            ]
+        }
+        rally = utils.Rally()
+        env_id = utils.get_global("RALLY_ENV", rally.env)
+        config = utils.TaskConfig(cfg)
+        process = subprocess.Popen(
+            rally.args + ["task", "start", "--task", config.filename,
+                          "--env", env_id],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            env=rally.env)
+        uuid = None
+        while not uuid:
+            time.sleep(0.5)
+            uuid = utils.get_global("RALLY_TASK", rally.env)
+        while "running" not in rally("task status"):
+            time.sleep(0.5)
+        # let the first workload finish and kill the task in the middle
+        # of the second one
+        time.sleep(5)
+        process.send_signal(signal.SIGKILL)
+        process.wait()
+        self.assertIn("running", rally("task status"))
+
+        rally("task resume %s" % uuid)
+
+        self.assertIn("finished", rally("task status"))
+        results = rally("task results", getjson=True)
+        self.assertEqual([2, 5], [len(r["result"]) for r in results])
+
     def test_use(self):
         rally = utils.Rally()
         env_id = utils.get_global("RALLY_ENV", rally.env)
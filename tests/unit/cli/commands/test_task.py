@@ -381,6 +381,31 @@ class TaskCommandsTestCase(test.CLITestCase):
 
         self.assertEqual(1, result.exit_code, result.output)
 
+    @mock.patch("rally.api._Task.resume")
+    @mock.patch("rally.api._Task.get")
+    def test_resume(self, mock_get, mock_resume):
+        mock_get.return_value = {"uuid": "task-uuid", "status": "finished",
+                                 "pass_sla": False, "subtasks": []}
+
+        result = self.invoke(["task", "resume", "task-uuid",
+                              "--abort-on-sla-failure"])
+
+        self.assertEqual(2, result.exit_code, result.output)
+        self.assertIn("resumed", result.output)
+        mock_resume.assert_called_once_with(
+            task_uuid="task-uuid", abort_on_sla_failure=True)
+
+    @mock.patch("rally.api._Task.resume")
+    def test_resume_on_unfinished_deployment(self, mock_resume):
+        mock_resume.side_effect = exceptions.DeploymentNotFinishedStatus(
+            name="xxx", uuid="env-uuid",
+            status=consts.DeployStatus.DEPLOY_INIT)
+
+        result = self.invoke(["task", "resume", "task-uuid"])
+
+        self.assertEqual(1, result.exit_code, result.output)
+        self.assertIn("unfinished deployment", result.output)
+
     @mock.patch("rally.api._Task.abort")
     def test_abort(self, mock_abort):
         result = self.invoke(["task", "abort", "the-uuid", "--soft"])
@@ -390,6 +415,23 @@ class TaskCommandsTestCase(test.CLITestCase):
         mock_abort.assert_called_once_with(
             task_uuid="the-uuid", soft=True, wait=True)
 
+    @mock.patch("rally.cli.commands.task.agent.Agent")
+    def test_agent(self, mock_agent):
+        mock_agent.return_value.serve.side_effect = KeyboardInterrupt
+
+        result = self.invoke(["task", "agent", "--listen", "unix:/tmp/a"])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn("Agent is listening on unix:/tmp/a", result.output)
+        mock_agent.assert_called_once_with("unix:/tmp/a")
+        mock_agent.return_value.close.assert_called_once_with()
+
+    def test_agent_without_authkey(self):
+        result = self.invoke(["task", "agent", "--listen", "unix:/tmp/a"])
+
+        self.assertEqual(1, result.exit_code, result.output)
+        self.assertIn("runner_agent_authkey", result.output)
+
     @mock.patch("rally.api._Task.abort")
     def test_abort_hard(self, mock_abort):
         result = self.invoke(["task", "abort", "the-uuid"])
@@ -103,6 +103,19 @@ class TasksTestCase(test.DBTestCase):
                           db.task_update,
                           "fake_uuid", {})
 
+    def test_task_set_input(self):
+        task = self._create_task({})
+        self.assertEqual("", db.task_get_input(task["uuid"]))
+        db.task_set_input(task["uuid"], "{}")
+        self.assertEqual("{}", db.task_get_input(task["uuid"]))
+        self.assertNotIn("input_task", self._get_task(task["uuid"]))
+
+    def test_task_set_input_not_found(self):
+        self.assertRaises(exceptions.DBRecordNotFound,
+                          db.task_set_input, "fake_uuid", "{}")
+        self.assertRaises(exceptions.DBRecordNotFound,
+                          db.task_get_input, "fake_uuid")
+
     def test_task_update_status(self):
         self.assertRaises(exceptions.RallyException,
                           db.task_update_status,
@@ -398,6 +411,14 @@ class SubtaskTestCase(test.DBTestCase):
         self.assertEqual("bar", subtask["title"])
         self.assertEqual(consts.SubtaskStatus.FINISHED, subtask["status"])
 
+    def test_subtask_list(self):
+        self.assertEqual([], db.subtask_list(self.task["uuid"]))
+        for title in ("foo", "bar", "baz"):
+            db.subtask_create(self.task["uuid"], title=title)
+        self.assertEqual(
+            ["foo", "bar", "baz"],
+            [s["title"] for s in db.subtask_list(self.task["uuid"])])
+
 
 class WorkloadTestCase(test.DBTestCase):
     def setUp(self):
@@ -552,6 +573,28 @@ class WorkloadTestCase(test.DBTestCase):
         self.assertEqual(start_time, workload["start_time"])
         self.assertEqual(self.task_uuid, workload["task_uuid"])
         self.assertEqual(self.subtask_uuid, workload["subtask_uuid"])
+        self.assertNotIn("runner", workload["statistics"])
+
+    def test_workload_set_results_runner_statistics(self):
+        workload = db.workload_create(self.task_uuid, self.subtask_uuid,
+                                      name="foo", description="descr",
+                                      position=0, args={},
+                                      contexts={}, sla={},
+                                      hooks=[], runner={},
+                                      runner_type="foo")
+
+        db.workload_set_results(workload_uuid=workload["uuid"],
+                                subtask_uuid=self.subtask_uuid,
+                                task_uuid=self.task_uuid,
+                                load_duration=1, full_duration=2,
+                                start_time=3, sla_results=[],
+                                contexts_results=[],
+                                runner_statistics={"knee": {"sla_limit": 4}})
+
+        workload = db.workload_get(workload["uuid"])
+        self.assertEqual({"knee": {"sla_limit": 4}},
+                         workload["statistics"]["runner"])
+        self.assertIn("durations", workload["statistics"])
 
 
 class WorkloadDataTestCase(test.DBTestCase):
@@ -588,6 +631,53 @@ class WorkloadDataTestCase(test.DBTestCase):
         self.assertEqual(self.task_uuid, workload_data["task_uuid"])
         self.assertEqual(self.workload_uuid, workload_data["workload_uuid"])
 
+    def test_workload_list(self):
+        workload = db.workload_create(
+            self.task_uuid, self.subtask_uuid, name="foo", description="",
+            position=1, args={}, contexts={}, sla={}, runner={},
+            runner_type="r", hooks={})
+        self.assertEqual(
+            [self.workload_uuid, workload["uuid"]],
+            [w["uuid"] for w in db.workload_list(self.subtask_uuid)])
+
+    def test_workload_delete(self):
+        db.workload_data_create(self.task_uuid, self.workload_uuid, 0,
+                                {"raw": [{"duration": 1, "timestamp": 1}]})
+        db.workload_delete(self.workload_uuid)
+        self.assertEqual([], db.workload_list(self.subtask_uuid))
+        self.assertEqual(
+            [], db.task_get(self.task_uuid, detailed=True)["subtasks"][0][
+                "workloads"])
+        self.assertRaises(exceptions.DBRecordNotFound,
+                          db.workload_delete, self.workload_uuid)
+
+    def test_workload_delete_recomputes_results(self):
+        workload = db.workload_create(
+            self.task_uuid, self.subtask_uuid, name="foo", description="",
+            position=1, args={}, contexts={}, sla={}, runner={},
+            runner_type="r", hooks={})
+        for workload_uuid, load_duration, success in (
+                (self.workload_uuid, 2.0, True),
+                (workload["uuid"], 3.0, False)):
+            db.workload_set_results(
+                workload_uuid=workload_uuid, subtask_uuid=self.subtask_uuid,
+                task_uuid=self.task_uuid, load_duration=load_duration,
+                full_duration=load_duration, start_time=1.0,
+                sla_results=[{"criterion": "foo", "success": success,
+                              "detail": ""}],
+                contexts_results=[])
+        task = db.task_get(self.task_uuid, detailed=True)
+        self.assertFalse(task["pass_sla"])
+        self.assertFalse(task["subtasks"][0]["pass_sla"])
+
+        db.workload_delete(workload["uuid"])
+
+        task = db.task_get(self.task_uuid, detailed=True)
+        self.assertTrue(task["pass_sla"])
+        self.assertEqual(2.0, task["task_duration"])
+        self.assertTrue(task["subtasks"][0]["pass_sla"])
+        self.assertEqual(2.0, task["subtasks"][0]["duration"])
+
     @mock.patch("time.time")
     def test_workload_data_create_empty(self, mock_time):
         mock_time.return_value = 10
@@ -212,12 +212,44 @@ class TaskTestCase(test.TestCase):
                                    "trace": "foo_trace"}},
         )
 
+    @mock.patch("rally.common.objects.task.db.task_set_input")
+    def test_set_input_task(self, mock_task_set_input):
+        task = objects.Task(task=self.task)
+        task.set_input_task({"version": 2, "subtasks": []})
+        mock_task_set_input.assert_called_once_with(
+            self.task["uuid"], '{"version": 2, "subtasks": []}')
+
+        mock_task_set_input.reset_mock()
+        objects.Task(temporary=True).set_input_task({})
+        self.assertFalse(mock_task_set_input.called)
+
+    @mock.patch("rally.common.objects.task.db.task_get_input")
+    def test_get_input_task(self, mock_task_get_input):
+        task = objects.Task(task=self.task)
+        mock_task_get_input.return_value = '{"version": 2}'
+        self.assertEqual({"version": 2}, task.get_input_task())
+        mock_task_get_input.assert_called_once_with(self.task["uuid"])
+
+        mock_task_get_input.return_value = ""
+        self.assertIsNone(task.get_input_task())
+
+    @mock.patch("rally.common.objects.task.db.subtask_create")
+    @mock.patch("rally.common.objects.task.db.subtask_list")
+    def test_get_subtasks(self, mock_subtask_list, mock_subtask_create):
+        mock_subtask_list.return_value = [{"uuid": "a"}, {"uuid": "b"}]
+        task = objects.Task(task=self.task)
+        subtasks = task.get_subtasks()
+        mock_subtask_list.assert_called_once_with(self.task["uuid"])
+        self.assertEqual(["a", "b"], [s["uuid"] for s in subtasks])
+        self.assertFalse(mock_subtask_create.called)
+
     @mock.patch("rally.common.objects.task.Subtask")
     def test_add_subtask(self, mock_subtask):
         task = objects.Task(task=self.task)
         subtask = task.add_subtask(title="foo")
         mock_subtask.assert_called_once_with(
-            self.task["uuid"], title="foo", contexts=None, description=None)
+            self.task["uuid"], title="foo", contexts=None, description=None,
+            run_in_parallel=False)
         self.assertIs(subtask, mock_subtask.return_value)
 
     @ddt.data(
@@ -404,9 +436,19 @@ class SubtaskTestCase(test.TestCase):
         mock_subtask_create.return_value = self.subtask
         subtask = objects.Subtask("bar", title="foo")
         mock_subtask_create.assert_called_once_with(
-            "bar", title="foo", contexts=None, description=None)
+            "bar", title="foo", contexts=None, description=None,
+            run_in_parallel=False)
         self.assertEqual(subtask["uuid"], self.subtask["uuid"])
 
+    @mock.patch("rally.common.objects.task.db.workload_list")
+    @mock.patch("rally.common.objects.task.db.subtask_create")
+    def test_get_workloads(self, mock_subtask_create, mock_workload_list):
+        subtask = objects.Subtask(subtask=self.subtask)
+        self.assertFalse(mock_subtask_create.called)
+        self.assertEqual(mock_workload_list.return_value,
+                         subtask.get_workloads())
+        mock_workload_list.assert_called_once_with(self.subtask["uuid"])
+
     @mock.patch("rally.common.objects.task.db.subtask_update")
     @mock.patch("rally.common.objects.task.db.subtask_create")
     def test_update_status(self, mock_subtask_create, mock_subtask_update):
@@ -416,6 +458,17 @@ class SubtaskTestCase(test.TestCase):
         mock_subtask_update.assert_called_once_with(
             self.subtask["uuid"], {"status": consts.SubtaskStatus.FINISHED})
 
+    @mock.patch("rally.common.objects.task.db.subtask_update")
+    @mock.patch("rally.common.objects.task.db.subtask_create")
+    def test_set_contexts_results(self, mock_subtask_create,
+                                  mock_subtask_update):
+        mock_subtask_create.return_value = self.subtask
+        subtask = objects.Subtask("bar", title="foo")
+        subtask.set_contexts_results([{"plugin_name": "users@openstack"}])
+        mock_subtask_update.assert_called_once_with(
+            self.subtask["uuid"],
+            {"contexts_results": [{"plugin_name": "users@openstack"}]})
+
     @mock.patch("rally.common.objects.task.Workload")
     @mock.patch("rally.common.objects.task.db.subtask_create")
     def test_add_workload(self, mock_subtask_create, mock_workload):
@@ -479,6 +532,11 @@ class WorkloadTestCase(test.TestCase):
             runner_type="constant", contexts=contexts, sla=sla, args=args)
         self.assertEqual(workload["uuid"], self.workload["uuid"])
 
+    @mock.patch("rally.common.objects.task.db.workload_delete")
+    def test_delete_by_uuid(self, mock_workload_delete):
+        objects.Workload.delete_by_uuid(self.workload["uuid"])
+        mock_workload_delete.assert_called_once_with(self.workload["uuid"])
+
     @mock.patch("rally.common.objects.task.db.workload_data_create")
     @mock.patch("rally.common.objects.task.db.workload_create")
     def test_add_workload_data(self, mock_workload_create,
@@ -532,7 +590,7 @@ class WorkloadTestCase(test.TestCase):
             load_duration=load_duration, full_duration=full_duration,
             start_time=start_time, sla_results=sla_results,
             contexts_results=contexts_results,
-            hooks_results=None)
+            hooks_results=None, runner_statistics=None)
 
     def test_to_task(self):
         workload = {
@@ -13,6 +13,10 @@
 #    under the License.
 
 import collections
+import copy
+import ctypes
+import multiprocessing
+import pickle
 import queue as Queue
 import string
 import sys
@@ -163,6 +167,97 @@ class RAMIntTestCase(test.TestCase):
         ri.reset()
         self.assertEqual(0, int(ri))
 
+    def test__lease(self):
+        ri = utils.RAMInt(5)
+        self.assertEqual(range(5, 8), ri._lease(lambda value: 3))
+        self.assertEqual(8, int(ri))
+
+    def test__lease_overflow(self):
+        ri = utils.RAMInt(ctypes.c_uint(-1).value - 1)
+        self.assertRaises(StopIteration, ri._lease, lambda value: 2)
+        self.assertEqual(ctypes.c_uint(-1).value - 1, int(ri))
+
+
+def block_ram_int_worker(ri, result_queue):
+    numbers = []
+    for number in ri:
+        if number >= ri.limit:
+            break
+        numbers.append(number)
+    result_queue.put(numbers)
+
+
+class BlockRAMIntTestCase(test.TestCase):
+
+    def test__next__(self):
+        ri = utils.BlockRAMInt(block_size=4)
+
+        self.assertEqual(list(range(6)), [next(ri) for _ in range(6)])
+        # the second block is leased already
+        self.assertEqual(8, int(ri))
+
+    def test_block_size_near_limit(self):
+        ri = utils.BlockRAMInt(block_size=8, limit=40, workers=2)
+
+        self.assertEqual(8, ri._block_size(0))
+        self.assertEqual(5, ri._block_size(20))
+        self.assertEqual(1, ri._block_size(39))
+        self.assertEqual(1, ri._block_size(45))
+
+        numbers = [next(ri) for _ in range(42)]
+        self.assertEqual(list(range(42)), numbers)
+        self.assertEqual(42, int(ri))
+
+    def test_threads(self):
+        ri = utils.BlockRAMInt(block_size=7)
+        numbers = []
+
+        def take():
+            for _ in range(100):
+                numbers.append(next(ri))
+
+        threads = [threading.Thread(target=take) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(list(range(500)), sorted(numbers))
+
+    def test_processes_hand_out_numbers_below_limit_once(self):
+        ri = utils.BlockRAMInt(block_size=16, limit=1000, workers=3)
+        result_queue = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=block_ram_int_worker,
+                                    args=(ri, result_queue))
+            for _ in range(3)]
+        for process in processes:
+            process.start()
+        numbers = []
+        for _ in processes:
+            numbers.extend(result_queue.get(timeout=10))
+        for process in processes:
+            process.join()
+
+        self.assertEqual(list(range(1000)), sorted(numbers))
+
+    def test_reset(self):
+        ri = utils.BlockRAMInt(block_size=4)
+        next(ri)
+        ri.reset()
+
+        self.assertEqual(0, next(ri))
+
+    def test_getstate(self):
+        ri = utils.BlockRAMInt(block_size=4)
+        next(ri)
+
+        state = ri.__getstate__()
+
+        self.assertIsNone(state["_pid"])
+        self.assertNotIn("_lock", state)
+        self.assertNotIn("_block", state)
+
 
 @ddt.ddt
 class RandomNameTestCase(test.TestCase):
@@ -389,6 +484,85 @@ class TimeoutThreadTestCase(test.TestCase):
                         "Thread killed too late (%s seconds)" % time_elapsed)
 
 
+class ThreadIterationTestCase(test.TestCase):
+
+    @mock.patch("rally.common.utils.terminate_thread")
+    def test_terminate(self, mock_terminate_thread):
+        iteration = utils.ThreadIteration()
+        self.assertEqual(threading.get_ident(), iteration.ident)
+        self.assertTrue(iteration.is_alive())
+
+        iteration.terminate()
+        mock_terminate_thread.assert_called_once_with(iteration.ident)
+
+    @mock.patch("rally.common.utils.terminate_thread")
+    def test_terminate_finished(self, mock_terminate_thread):
+        with utils.ThreadIteration() as iteration:
+            pass
+
+        self.assertFalse(iteration.is_alive())
+        iteration.terminate()
+        self.assertFalse(mock_terminate_thread.called)
+
+
+class TimeoutServiceTestCase(test.TestCase):
+
+    @pytest.mark.filterwarnings("ignore")
+    def test_watch(self):
+        results = {}
+
+        def iteration(name, timeout, sleep):
+            started_at = time.time()
+            try:
+                with timeout_service.watch(timeout):
+                    utils.interruptable_sleep(sleep, 0.01)
+            except exceptions.ThreadTimeoutException:
+                results[name] = ("timeout", time.time() - started_at)
+            else:
+                results[name] = ("ok", time.time() - started_at)
+
+        with utils.TimeoutService() as timeout_service:
+            # the later deadline is scheduled first, but it does not delay
+            # the earlier one
+            threads = [
+                threading.Thread(target=iteration, args=("long", 30, 1)),
+                threading.Thread(target=iteration, args=("short", 0.2, 30))]
+            for thread in threads:
+                thread.start()
+                time.sleep(0.05)
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual("ok", results["long"][0])
+        self.assertEqual("timeout", results["short"][0])
+        self.assertLess(results["short"][1], 0.9)
+
+    @mock.patch("rally.common.utils.terminate_thread")
+    def test_watch_finished_in_time(self, mock_terminate_thread):
+        with utils.TimeoutService() as timeout_service:
+            for i in range(200):
+                with timeout_service.watch(0.1):
+                    pass
+            # the cancelled deadlines do not pile up
+            self.assertLessEqual(len(timeout_service._heap), 65)
+            time.sleep(0.2)
+
+        self.assertEqual([], timeout_service._heap)
+        self.assertFalse(mock_terminate_thread.called)
+
+    @mock.patch("rally.common.utils.terminate_thread")
+    def test_stop(self, mock_terminate_thread):
+        timeout_service = utils.TimeoutService()
+        timeout_service.start()
+        iteration = timeout_service.watch(0.1)
+
+        timeout_service.stop()
+        time.sleep(0.2)
+
+        self.assertTrue(iteration.is_alive())
+        self.assertFalse(mock_terminate_thread.called)
+
+
 class LockedDictTestCase(test.TestCase):
 
     def test_init_unlock_and_update(self):
@@ -453,6 +627,206 @@ class LockedDictTestCase(test.TestCase):
         self.assertEqual({"memo": "foo_memo"}, kw)
 
 
+class CopyOnWriteTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        class Credential:
+            def __init__(self, name):
+                self.name = name
+
+        self.credential = Credential("foo")
+        self.original = {
+            "users": [{"id": "u1", "credential": self.credential},
+                      {"id": "u2", "credential": self.credential}],
+            "config": utils.LockedDict(foo={"bar": [1, 2]}),
+            "pair": ({"a": 1}, "b"),
+            "name": "spam",
+        }
+        self.snapshot = {
+            "users": [{"id": "u1", "credential": self.credential},
+                      {"id": "u2", "credential": self.credential}],
+            "config": {"foo": {"bar": (1, 2)}},
+            "pair": ({"a": 1}, "b"),
+            "name": "spam",
+        }
+
+    def test_copy_on_write(self):
+        self.assertEqual("foo", utils.copy_on_write("foo"))
+        self.assertIsInstance(utils.copy_on_write({}), utils.CopyOnWriteDict)
+        self.assertIsInstance(utils.copy_on_write(utils.LockedDict()),
+                              utils.CopyOnWriteDict)
+        self.assertIsInstance(utils.copy_on_write([]), utils.CopyOnWriteList)
+        self.assertIsInstance(utils.copy_on_write(({},))[0],
+                              utils.CopyOnWriteDict)
+        ordered = collections.OrderedDict(a=[1])
+        copied = utils.copy_on_write(ordered)
+        self.assertIsInstance(copied, collections.OrderedDict)
+        self.assertIsNot(ordered["a"], copied["a"])
+
+    def test_dict_isolation(self):
+        d = utils.CopyOnWriteDict(self.original)
+
+        self.assertEqual(self.original, d)
+        d["users"][0]["id"] = "u3"
+        d["users"].append({"id": "u4"})
+        d["users"][1]["credential"].name = "bar"
+        d["config"]["foo"]["bar"] = None
+        d["config"]["spam"] = 42
+        d["pair"][0]["a"] = 2
+        d.setdefault("new", []).append(1)
+        d.pop("name")
+
+        self.assertEqual(self.snapshot, self.original)
+        self.assertEqual("foo", self.credential.name)
+        self.assertEqual(["u3", "u2", "u4"], [u["id"] for u in d["users"]])
+        self.assertEqual({"bar": None}, d["config"]["foo"])
+        self.assertEqual([1], d["new"])
+        self.assertNotIn("name", d)
+
+    def test_dict_copies_on_access_only(self):
+        d = utils.CopyOnWriteDict(self.original)
+
+        self.assertIs(self.original["users"], dict.__getitem__(d, "users"))
+        users = d["users"]
+        self.assertIsNot(self.original["users"], users)
+        self.assertIs(users, d["users"])
+        self.assertIs(self.original["config"], dict.__getitem__(d, "config"))
+        self.assertIs(self.original["users"][1],
+                      list.__getitem__(users, 1))
+
+    def test_dict_access_methods(self):
+        d = utils.CopyOnWriteDict(self.original)
+
+        d.get("users").pop()
+        self.assertIsNone(d.get("foo"))
+        for value in d.values():
+            if isinstance(value, dict):
+                value["x"] = 1
+        for key, value in d.items():
+            if isinstance(value, list):
+                value.clear()
+        key, value = d.popitem()
+        self.assertEqual("name", key)
+        # a shallow copy shares the values with the view
+        d.copy()["users"].append(1)
+
+        self.assertEqual(self.snapshot, self.original)
+        self.assertEqual({"users": [1],
+                          "config": {"foo": {"bar": (1, 2)}, "x": 1},
+                          "pair": ({"a": 1}, "b")}, d)
+
+    def test_dict_copies(self):
+        def call(**kwargs):
+            return kwargs
+
+        def update(d):
+            copied = {}
+            copied.update(d)
+            return copied
+
+        for make_copy in (dict, lambda d: {**d}, lambda d: call(**d),
+                          update, lambda d: {} | d, copy.copy,
+                          lambda d: d.copy()):
+            copied = make_copy(utils.CopyOnWriteDict(self.original))
+
+            copied["users"].append({"id": "u3"})
+            copied["config"]["spam"] = 42
+            copied["pair"][0]["a"] = 2
+
+            self.assertEqual(self.snapshot, self.original)
+
+    def test_dict_nested(self):
+        inner = utils.CopyOnWriteDict(self.original)
+        # a value is owned by the inner view before the outer one is made
+        inner["config"]["x"] = 1
+        outer = utils.CopyOnWriteDict(inner)
+
+        outer["users"].append({"id": "u3"})
+        outer["users"][0]["id"] = "u0"
+        outer["config"]["foo"]["bar"] = None
+        outer["pair"][0]["a"] = 2
+
+        self.assertEqual(self.snapshot, self.original)
+        self.assertEqual(dict(self.snapshot, config={"foo": {"bar": (1, 2)},
+                                                     "x": 1}),
+                         inner)
+
+    def test_list_access_methods(self):
+        original = [{"a": 1}, {"b": 2}, {"c": 3}]
+        items = utils.CopyOnWriteList(original)
+
+        items[0]["a"] = 2
+        items[1:][0]["b"] = 3
+        for item in reversed(items):
+            item["x"] = 0
+        items.pop()["c"] = 4
+
+        self.assertEqual([{"a": 1}, {"b": 2}, {"c": 3}], original)
+        self.assertEqual([{"a": 2, "x": 0}, {"b": 3, "x": 0}], items)
+
+    def test_deepcopy_and_pickle(self):
+        d = utils.CopyOnWriteDict(self.original)
+        d["users"].append({"id": "u3"})
+
+        copied = copy.deepcopy(d)
+        self.assertIs(dict, type(copied))
+        self.assertIs(list, type(copied["users"]))
+        self.assertEqual(3, len(copied["users"]))
+        self.assertIsNot(self.credential, copied["users"][0]["credential"])
+
+        loaded = pickle.loads(pickle.dumps(utils.CopyOnWriteDict(
+            {"a": [{"b": 1}]})))
+        self.assertIs(dict, type(loaded))
+        self.assertEqual({"a": [{"b": 1}]}, loaded)
+
+
+class WaitableDequeTestCase(test.TestCase):
+
+    def test_wait(self):
+        deque = utils.WaitableDeque([1])
+        self.assertTrue(deque.wait(timeout=0))
+        deque.popleft()
+        self.assertFalse(deque.wait(timeout=0))
+
+    def test_wait_is_woken_by_append(self):
+        deque = utils.WaitableDeque()
+        timer = threading.Timer(0.05, deque.append, args=(1,))
+        timer.start()
+        self.addCleanup(timer.join)
+
+        self.assertTrue(deque.wait(timeout=5))
+        self.assertEqual([1], list(deque))
+
+    def test_wait_is_woken_by_extend(self):
+        deque = utils.WaitableDeque()
+        timer = threading.Timer(0.05, deque.extend, args=([1, 2],))
+        timer.start()
+        self.addCleanup(timer.join)
+
+        self.assertTrue(deque.wait(timeout=5))
+        self.assertEqual([1, 2], list(deque))
+
+    def test_wait_is_stopped(self):
+        deque = utils.WaitableDeque()
+        stop_event = threading.Event()
+
+        def stop():
+            stop_event.set()
+            deque.wake()
+
+        timer = threading.Timer(0.05, stop)
+        timer.start()
+        self.addCleanup(timer.join)
+
+        started_at = time.monotonic()
+        self.assertFalse(deque.wait(stop_event, timeout=5))
+        self.assertLess(time.monotonic() - started_at, 5)
+        # the event which is already set does not let it wait
+        self.assertFalse(deque.wait(stop_event))
+
+
 class DequeAsQueueTestCase(test.TestCase):
 
     def setUp(self):
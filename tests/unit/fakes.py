@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import asyncio
 import itertools
 import multiprocessing
 from unittest import mock
@@ -50,6 +51,22 @@ class FakeScenario(scenario.Scenario):
                                       "chart_plugin": "BarPlugin"})
 
 
+@scenario.configure(name="classbased.fooscenario_async")
+class FakeAsyncScenario(scenario.Scenario):
+    """Fake class-based coroutine scenario."""
+
+    async def run(
+        self,
+        *args,
+        sleep: float = 0,
+        raise_exc: bool = False,
+        **kwargs
+    ) -> None:
+        await asyncio.sleep(sleep)
+        if raise_exc:
+            raise Exception("Something went wrong")
+
+
 class FakeTimer(rally_utils.Timer):
 
     def duration(self):
@@ -122,6 +139,8 @@ class FakeTask(dict):
         self.update_status = mock.Mock()
         self.set_failed = mock.Mock()
         self.set_validation_failed = mock.Mock()
+        self.set_input_task = mock.Mock()
+        self.get_subtasks = mock.Mock(return_value=[])
         task = task or {}
         for k, v in itertools.chain(task.items(), kwargs.items()):
             self[k] = v
@@ -0,0 +1,209 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+import threading
+from unittest import mock
+
+import ddt
+
+from rally.plugins.task.runners import adaptive
+from rally.task import runner
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.task.runners."
+
+
+def _result(concurrency, duration=1.0, error=None):
+    return {"duration": duration, "idle_duration": 0, "timestamp": 1.0,
+            "error": error or [], "output": {"additive": [], "complete": []},
+            "atomic_actions": [], "concurrency": concurrency}
+
+
+@ddt.ddt
+class AdaptiveConcurrencyScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = mock.MagicMock()
+        self.config = {"duration": 10, "min_concurrency": 2,
+                       "max_concurrency": 5, "step": 2, "backoff": 0.5,
+                       "sla": {"failure_rate": {"max": 0}}}
+
+    @ddt.data(
+        {"config": {"duration": 10, "max_concurrency": 4}},
+        {"config": {"duration": 10, "min_concurrency": 2,
+                    "max_concurrency": 8, "step": 2, "backoff": 0.7,
+                    "window": 2.5, "timeout": 1, "max_cpu_count": 2,
+                    "sla": {"failure_rate": {"max": 1},
+                            "max_avg_duration": 2}}},
+        {"config": {"duration": 10}, "valid": False},
+        {"config": {"duration": 10, "max_concurrency": 4, "foo": 1},
+         "valid": False},
+        {"config": {"duration": 10, "max_concurrency": 4, "backoff": 1},
+         "valid": False},
+        {"config": {"duration": 10, "min_concurrency": 5,
+                    "max_concurrency": 4}, "valid": False},
+        {"config": {"duration": 10, "max_concurrency": 4,
+                    "sla": {"foo": 1}}, "valid": False},
+        {"config": {"duration": 10, "max_concurrency": 4,
+                    "sla": {"failure_rate": {"max": 200}}}, "valid": False})
+    @ddt.unpack
+    def test_validate(self, config, valid=True):
+        results = runner.ScenarioRunner.validate(
+            "adaptive_concurrency", None, None, config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertGreater(len(results), 0)
+
+    @ddt.data(
+        # the SLA passes, the concurrency is increased by step
+        {"concurrency": 2, "results": [_result(2), _result(2)],
+         "expected": 4, "window": (2, 1.0, True)},
+        # ... up to max_concurrency
+        {"concurrency": 4, "results": [_result(4)], "expected": 5,
+         "window": (4, 0.5, True)},
+        # the SLA fails, the concurrency is decreased by backoff
+        {"concurrency": 5, "results": [_result(5), _result(5, error=["e"])],
+         "expected": 2, "window": (5, 1.0, False)},
+        # ... down to min_concurrency
+        {"concurrency": 3, "results": [_result(3, error=["e"])],
+         "expected": 2, "window": (3, 0.5, False)},
+        # results of the previous concurrency do not count
+        {"concurrency": 4, "results": [_result(2, error=["e"])],
+         "expected": 4, "window": None},
+        {"concurrency": 4, "results": [], "expected": 4, "window": None})
+    @ddt.unpack
+    def test__adjust(self, concurrency, results, expected, window):
+        runner_obj = adaptive.AdaptiveConcurrencyScenarioRunner(
+            self.task, self.config)
+
+        self.assertEqual(expected,
+                         runner_obj._adjust(concurrency, results, 2))
+        self.assertEqual([window] if window else [], runner_obj.windows)
+
+    def test__adjust_by_workload_sla(self):
+        config = dict(self.config)
+        del config["sla"]
+        runner_obj = adaptive.AdaptiveConcurrencyScenarioRunner(
+            self.task, config)
+        runner_obj.workload_sla = {"failure_rate": {"max": 0}}
+        results = [_result(4), _result(4, error=["e"])]
+
+        self.assertEqual(2, runner_obj._adjust(4, results, 2))
+
+        # the SLA of the runner config takes precedence
+        runner_obj = adaptive.AdaptiveConcurrencyScenarioRunner(
+            self.task, dict(config, sla={"failure_rate": {"max": 50}}))
+        runner_obj.workload_sla = {"failure_rate": {"max": 0}}
+
+        self.assertEqual(5, runner_obj._adjust(4, results, 2))
+
+    @ddt.data(
+        {"windows": [], "expected": (None, None)},
+        {"windows": [(1, 10, True), (2, 19, True), (3, 25, True),
+                     (4, 24, True)],
+         "expected": (3, 4)},
+        {"windows": [(1, 10, True), (2, 19, True), (3, 22, False),
+                     (1, 10, True), (2, 20, True), (3, 21, False)],
+         "expected": (2, 2)},
+        {"windows": [(4, 10, False), (2, 19, True)],
+         "expected": (2, None)})
+    @ddt.unpack
+    def test_get_knee(self, windows, expected):
+        runner_obj = adaptive.AdaptiveConcurrencyScenarioRunner(
+            self.task, self.config)
+        runner_obj.windows = windows
+
+        self.assertEqual(
+            {"peak_throughput": expected[0], "sla_limit": expected[1]},
+            runner_obj.get_knee())
+
+    def test__control(self):
+        runner_obj = adaptive.AdaptiveConcurrencyScenarioRunner(
+            self.task, dict(self.config, window=3))
+        runner_obj._send_result(_result(2))
+        limit = adaptive._ConcurrencyLimit(2, adaptive.time.time(), 10)
+        finished = mock.Mock()
+        finished.wait.side_effect = [False, False, True]
+
+        runner_obj._control(limit, finished)
+
+        self.assertEqual(4, limit.value)
+        self.assertEqual([(2, 1 / 3, True)], runner_obj.windows)
+        self.assertEqual([mock.call(3)] * 3, finished.wait.call_args_list)
+
+    def test_concurrency_limit_wait(self):
+        limit = adaptive._ConcurrencyLimit(1, adaptive.time.time(), 10)
+        aborted = multiprocessing.Event()
+
+        self.assertEqual({"concurrency": 1}, limit.wait(0, aborted))
+
+        timer = threading.Timer(0.05, limit.set, args=(2,))
+        timer.start()
+        self.addCleanup(timer.join)
+        # the slot sleeps until the limit is raised
+        self.assertEqual({"concurrency": 2}, limit.wait(1, aborted))
+
+        timer = threading.Timer(0.05, aborted.set)
+        timer.start()
+        self.addCleanup(timer.join)
+        wake = threading.Timer(0.1, limit.wake)
+        wake.start()
+        self.addCleanup(wake.join)
+        self.assertIsNone(limit.wait(2, aborted))
+
+    def test_concurrency_limit_wait_duration_is_over(self):
+        limit = adaptive._ConcurrencyLimit(1, adaptive.time.time(), 0.05)
+
+        self.assertIsNone(limit.wait(1, multiprocessing.Event()))
+        self.assertIsNone(limit.wait(0, multiprocessing.Event()))
+
+    def test__run_scenario(self):
+        config = {"duration": 0.5, "max_concurrency": 3, "window": 0.1,
+                  "max_cpu_count": 2}
+        runner_obj = adaptive.AdaptiveConcurrencyScenarioRunner(
+            self.task, config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "run",
+                                 {"task": {"uuid": 1}}, {})
+
+        results = [r for batch in runner_obj.result_queue for r in batch]
+        self.assertGreater(len(results), 0)
+        self.assertIn(1, {r["concurrency"] for r in results})
+        self.assertTrue({r["concurrency"] for r in results} <= {1, 2, 3})
+        self.assertEqual({"knee": runner_obj.get_knee()},
+                         runner_obj.statistics)
+
+    def test__run_scenario_aborted(self):
+        runner_obj = adaptive.AdaptiveConcurrencyScenarioRunner(
+            self.task, {"duration": 10, "max_concurrency": 2})
+
+        runner_obj.abort()
+        runner_obj._run_scenario(fakes.FakeScenario, "run",
+                                 {"task": {"uuid": 1}}, {})
+
+        self.assertEqual(0, len(runner_obj.result_queue))
+        self.assertEqual([], runner_obj.windows)
+
+    def test_abort_wakes_slots_up(self):
+        runner_obj = adaptive.AdaptiveConcurrencyScenarioRunner(
+            self.task, {"duration": 10, "max_concurrency": 2})
+        runner_obj._limit = mock.Mock()
+
+        runner_obj.abort()
+
+        self.assertTrue(runner_obj.aborted.is_set())
+        runner_obj._limit.wake.assert_called_once_with()
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import multiprocessing
+import threading
 from unittest import mock
 
 import ddt
@@ -47,6 +49,18 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                 "concurrency": 5,
                 "timeout": 2,
                 "max_cpu_count": 2}, False),
+              ({"times": 4,
+                "warmup": {"iterations": 1},
+                "cooldown": {"iterations": 2}}, True),
+              ({"times": 4,
+                "warmup": {"duration": 1.5}}, True),
+              ({"times": 4,
+                "warmup": {"iterations": 2},
+                "cooldown": {"iterations": 2}}, False),
+              ({"times": 4,
+                "cooldown": {"duration": 1}}, False),
+              ({"times": 4,
+                "warmup": {"iterations": 1, "duration": 1}}, False),
               ({"foo": "bar"}, False))
     @ddt.unpack
     def test_validate(self, config, valid):
@@ -57,16 +71,10 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
         else:
             self.assertGreater(len(results), 0)
 
-    @mock.patch(RUNNERS + "constant.time")
     @mock.patch(RUNNERS + "constant.threading.Thread")
-    @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
     @mock.patch(RUNNERS + "constant.runner")
-    def test__worker_process(self, mock_runner, mock_queue, mock_thread,
-                             mock_time):
-
-        mock_thread_instance = mock.MagicMock(
-            is_alive=mock.MagicMock(return_value=False))
-        mock_thread.return_value = mock_thread_instance
+    def test__worker_process(self, mock_runner, mock_thread):
+        mock_queue = mock.MagicMock()
 
         mock_event = mock.MagicMock(
             is_set=mock.MagicMock(return_value=False))
@@ -83,24 +91,77 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
 
         constant._worker_process(mock_queue, fake_ram_int, 1, 2, times, None,
                                  context, "Dummy", "dummy", (),
-                                 mock_event_queue, mock_event, info)
-
-        self.assertEqual(times + 1, mock_thread.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.start.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.join.call_count)
-        # NOTE(rvasilets): `times` + 1 here because `times` the number of
-        # scenario repetition and one more need on "initialization" stage
-        # of the thread stuff.
-        self.assertEqual(times, mock_runner._get_scenario_context.call_count)
+                                 mock_event_queue, mock_event,
+                                 runner.LoadPhases({}), info)
+
+        # one thread to collect timed out iterations and the pool of
+        # `concurrency` threads which run the iterations
+        self.assertEqual(3, mock_thread.call_count)
+        self.assertEqual(3, mock_thread.return_value.start.call_count)
+        self.assertEqual(3, mock_thread.return_value.join.call_count)
+
+        # the threads are mocked, so run the loop of each pooled thread here
+        for call in mock_thread.call_args_list[1:]:
+            call[1]["target"]()
 
+        self.assertEqual(times, mock_runner._get_scenario_context.call_count)
+        self.assertEqual(times, mock_queue.put.call_count)
         for i in range(times):
-            scenario_context = mock_runner._get_scenario_context(i, context)
-            call = mock.call(
-                args=(mock_queue, "Dummy", "dummy", scenario_context, (),
-                      mock_event_queue),
-                target=mock_runner._worker_thread,
-            )
-            self.assertIn(call, mock_thread.mock_calls)
+            mock_runner._get_scenario_context.assert_any_call(i, context)
+        mock_runner._run_scenario_once.assert_called_with(
+            "Dummy", "dummy",
+            mock_runner._get_scenario_context.return_value, (),
+            mock_event_queue, timeout_guard=mock.ANY)
+
+    def test__worker_process_reuses_threads(self):
+        mock_queue = mock.MagicMock()
+        idents = set()
+
+        class Scenario(fakes.FakeScenario):
+            def run(self, **kwargs):
+                idents.add(threading.get_ident())
+
+        constant._worker_process(
+            mock_queue, iter(range(100)), 0, 3, 30, None,
+            self.context, Scenario, "run", {}, mock.MagicMock(),
+            mock.MagicMock(is_set=mock.MagicMock(return_value=False)),
+            runner.LoadPhases({}),
+            {"processes_to_start": 1, "processes_counter": 0})
+
+        self.assertEqual(30, mock_queue.put.call_count)
+        self.assertLessEqual(len(idents), 3)
+
+    def test__worker_process_marks_phases(self):
+        mock_queue = mock.MagicMock()
+        phases = runner.LoadPhases(
+            {"warmup": {"iterations": 2}, "cooldown": {"iterations": 1}},
+            times=6)
+
+        constant._worker_process(
+            mock_queue, iter(range(100)), 0, 1, 6, None,
+            self.context, fakes.FakeScenario, "run", {}, mock.MagicMock(),
+            mock.MagicMock(is_set=mock.MagicMock(return_value=False)),
+            phases, {"processes_to_start": 1, "processes_counter": 0})
+
+        results = [c[0][0] for c in mock_queue.put.call_args_list]
+        self.assertEqual(
+            ["warmup", "warmup", None, None, None, "cooldown"],
+            [r.get("phase") for r in results])
+
+    @ddt.data(0, 2)
+    def test__worker_process_for_duration(self, concurrency):
+        mock_queue = mock.MagicMock()
+
+        constant._worker_process(
+            mock_queue, iter(range(100)), 0, concurrency or 1, None, 0,
+            self.context, fakes.FakeScenario, "run", {}, mock.MagicMock(),
+            mock.MagicMock(is_set=mock.MagicMock(return_value=False)),
+            runner.LoadPhases({}),
+            {"processes_to_start": 1, "processes_counter": 0})
+
+        # when duration is 0, scenario executes exactly 1 time per unit of
+        # parallelism
+        self.assertEqual(concurrency or 1, mock_queue.put.call_count)
 
     @mock.patch(RUNNERS_BASE + "_run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
@@ -115,7 +176,7 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
 
         self.assertEqual(1, mock_queue.put.call_count)
 
-        expected_calls = [mock.call(*args)]
+        expected_calls = [mock.call(*args, timeout_guard=None)]
         self.assertEqual(expected_calls, mock__run_scenario_once.mock_calls)
 
     def test__run_scenario(self):
@@ -128,6 +189,19 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
             for result in result_batch:
                 self.assertIsNotNone(result)
 
+    def test__run_scenario_shared_memory_transport(self):
+        runner.CONF.set_override("runner_result_transport", "shared_memory")
+        self.addCleanup(runner.CONF.clear_override,
+                        "runner_result_transport")
+        runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
+
+        runner_obj._run_scenario(
+            fakes.FakeScenario, "run", self.context, self.args)
+        self.assertEqual(self.config["times"], len(runner_obj.result_queue))
+        for result_batch in runner_obj.result_queue:
+            for result in result_batch:
+                self.assertEqual([], result["error"])
+
     def test__run_scenario_exception(self):
         runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
 
@@ -156,8 +230,11 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
     @mock.patch(
         RUNNERS + "constant.ConstantScenarioRunner._create_process_pool")
     @mock.patch(RUNNERS + "constant.ConstantScenarioRunner._join_processes")
+    @mock.patch(
+        RUNNERS + "constant.ConstantScenarioRunner._create_result_queue")
     def test_that_cpu_count_is_adjusted_properly(
             self,
+            mock__create_result_queue,
             mock__join_processes,
             mock__create_process_pool,
             mock__log_debug_info,
@@ -218,6 +295,7 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
             mock_cpu_count.reset_mock()
             mock__create_process_pool.reset_mock()
             mock__join_processes.reset_mock()
+            mock__create_result_queue.reset_mock()
             mock_queue.reset_mock()
 
             mock_cpu_count.return_value = sample["real_cpu"]
@@ -242,9 +320,12 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
             args, kwargs = mock__create_process_pool.call_args
             self.assertIn(sample["expected"]["processes_to_start"], args)
             self.assertIn(constant._worker_process, args)
+            mock__create_result_queue.assert_called_once_with(
+                sample["expected"]["processes_to_start"])
             mock__join_processes.assert_called_once_with(
                 mock__create_process_pool.return_value,
-                mock_queue.return_value, mock_queue.return_value)
+                mock__create_result_queue.return_value,
+                mock_queue.return_value)
 
     def test_abort(self):
         runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
@@ -253,6 +334,35 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
         self.assertTrue(runner_obj.aborted.is_set())
 
 
+class SlotWorkerProcessTestCase(test.TestCase):
+
+    @mock.patch(RUNNERS + "constant.runner._log_worker_info")
+    def test_slot_worker_process(self, mock__log_worker_info):
+        queue = mock.Mock()
+        schedule = mock.Mock()
+        # every slot runs two iterations, the second one at another level
+        waits = {1: [{"level": 1}, {"level": 2}, None],
+                 3: [{"level": 1}, {"level": 2}, None]}
+        schedule.wait.side_effect = lambda slot, aborted: waits[slot].pop(0)
+        aborted = multiprocessing.Event()
+        info = {"processes_counter": 1, "processes_to_start": 2}
+
+        constant.slot_worker_process(
+            queue, iter(range(100)), schedule, 5, None,
+            {"task": {"uuid": 1}}, fakes.FakeScenario, "run", {},
+            mock.Mock(), aborted, info)
+
+        self.assertEqual([1, 3],
+                         mock__log_worker_info.call_args[1]["slots"])
+        self.assertEqual(
+            [mock.call(1, aborted)] * 3 + [mock.call(3, aborted)] * 3,
+            sorted(schedule.wait.call_args_list, key=lambda c: c[0][0]))
+        results = [c[0][0] for c in queue.put.call_args_list]
+        self.assertEqual([1, 1, 2, 2],
+                         sorted(r["level"] for r in results))
+        queue.flush.assert_called_once_with()
+
+
 @ddt.ddt
 class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
 
@@ -268,6 +378,15 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
     @ddt.data(({"duration": 0,
                 "concurrency": 2,
                 "timeout": 2}, True),
+              ({"duration": 10,
+                "warmup": {"iterations": 5},
+                "cooldown": {"duration": 2}}, True),
+              ({"duration": 10,
+                "cooldown": {"iterations": 2}}, False),
+              # no iterations are left to be measured
+              ({"duration": 10,
+                "warmup": {"duration": 8},
+                "cooldown": {"duration": 2}}, False),
               ({"foo": "bar"}, False))
     @ddt.unpack
     def test_validate(self, config, valid):
@@ -326,6 +445,20 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
                 self.assertIsNotNone(result)
         self.assertIn("error", runner_obj.result_queue[0][0])
 
+    @mock.patch(RUNNERS + "constant.runner.ScenarioRunner."
+                "_create_iteration_counter")
+    def test_run_scenario_does_not_lease_iterations(
+            self, mock__create_iteration_counter):
+        runner_obj = constant.ConstantForDurationScenarioRunner(
+            mock.MagicMock(), self.config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "run",
+                                 self.context, self.args)
+
+        self.assertFalse(mock__create_iteration_counter.called)
+        self.assertEqual(self.config["concurrency"],
+                         len(runner_obj.result_queue))
+
     def test__run_scenario_constantly_aborted(self):
         runner_obj = constant.ConstantForDurationScenarioRunner(self.task,
                                                                 self.config)
@@ -0,0 +1,120 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import ddt
+
+from rally import exceptions
+from rally.plugins.task.runners import constant_async
+from rally.task import runner
+from tests.unit import fakes
+from tests.unit import test
+
+
+@ddt.ddt
+class ConstantAsyncScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.config = {"times": 4, "concurrency": 2,
+                       "timeout": 2, "type": "constant_async",
+                       "max_cpu_count": 2}
+        self.context = fakes.FakeContext({"task": {"uuid": "uuid"}}).context
+        self.args = {"a": 1}
+        self.task = mock.MagicMock()
+
+    @ddt.data(({"times": 4,
+                "concurrency": 2,
+                "timeout": 2,
+                "max_cpu_count": 2}, True),
+              ({"times": 4,
+                "concurrency": 5}, False),
+              ({"foo": "bar"}, False))
+    @ddt.unpack
+    def test_validate(self, config, valid):
+        results = runner.ScenarioRunner.validate(
+            "constant_async", None, None, config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertGreater(len(results), 0)
+
+    def test__worker_process(self):
+        queue = mock.MagicMock()
+        event_queue = mock.MagicMock()
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=False))
+        times = 5
+
+        constant_async._worker_process(
+            queue, iter(range(10)), None, 3, times, self.context,
+            fakes.FakeAsyncScenario, "run", {}, event_queue, aborted,
+            {"processes_to_start": 1, "processes_counter": 0})
+
+        self.assertEqual(times, queue.put.call_count)
+        self.assertEqual(times, event_queue.put.call_count)
+        iterations = sorted(c[0][0]["value"]
+                            for c in event_queue.put.call_args_list)
+        self.assertEqual(list(range(1, times + 1)), iterations)
+
+    def test__worker_process_aborted(self):
+        queue = mock.MagicMock()
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=True))
+
+        constant_async._worker_process(
+            queue, iter(range(10)), None, 3, 5, self.context,
+            fakes.FakeAsyncScenario, "run", {}, mock.MagicMock(), aborted,
+            {"processes_to_start": 1, "processes_counter": 0})
+
+        self.assertFalse(queue.put.called)
+
+    def test__run_scenario(self):
+        runner_obj = constant_async.ConstantAsyncScenarioRunner(
+            self.task, self.config)
+
+        runner_obj._run_scenario(
+            fakes.FakeAsyncScenario, "run", self.context, self.args)
+        self.assertEqual(self.config["times"], len(runner_obj.result_queue))
+        for result_batch in runner_obj.result_queue:
+            for result in result_batch:
+                self.assertEqual([], result["error"])
+
+    def test__run_scenario_exception(self):
+        runner_obj = constant_async.ConstantAsyncScenarioRunner(
+            self.task, self.config)
+
+        runner_obj._run_scenario(
+            fakes.FakeAsyncScenario, "run", self.context,
+            dict(raise_exc=True, **self.args))
+        self.assertEqual(self.config["times"], len(runner_obj.result_queue))
+        for result_batch in runner_obj.result_queue:
+            for result in result_batch:
+                self.assertEqual("Exception", result["error"][0])
+
+    def test__run_scenario_aborted(self):
+        runner_obj = constant_async.ConstantAsyncScenarioRunner(
+            self.task, self.config)
+
+        runner_obj.abort()
+        runner_obj._run_scenario(
+            fakes.FakeAsyncScenario, "run", self.context, self.args)
+        self.assertEqual(0, len(runner_obj.result_queue))
+
+    def test__run_scenario_not_a_coroutine(self):
+        runner_obj = constant_async.ConstantAsyncScenarioRunner(
+            self.task, self.config)
+
+        self.assertRaises(
+            exceptions.InvalidArgumentsException,
+            runner_obj._run_scenario,
+            fakes.FakeScenario, "run", self.context, self.args)
+        self.assertEqual(0, len(runner_obj.result_queue))
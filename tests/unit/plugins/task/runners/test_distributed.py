@@ -0,0 +1,149 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import threading
+from unittest import mock
+
+import ddt
+
+from rally import exceptions
+from rally.common import objects
+from rally.plugins.task.runners import distributed
+from rally.task import agent
+from rally.task import runner
+from tests.unit import fakes
+from tests.unit import test
+
+
+@ddt.ddt
+class DistributedScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = objects.Task(task={"uuid": "task-uuid"}, temporary=True)
+        agent.CONF.set_override("runner_agent_authkey", "secret")
+        self.addCleanup(agent.CONF.clear_override, "runner_agent_authkey")
+
+    def _start_agents(self, count):
+        addresses = []
+        for i in range(count):
+            address = "unix:%s" % os.path.join(os.environ["HOME"],
+                                               "agent-%s" % i)
+            agent_obj = agent.Agent(address)
+            thread = threading.Thread(target=agent_obj.serve)
+            thread.start()
+            self.addCleanup(thread.join)
+            self.addCleanup(agent_obj.close)
+            addresses.append(address)
+        return addresses
+
+    @ddt.data(
+        {"config": {"times": 10, "concurrency": 3}, "agents": 2,
+         "expected": [{"times": 5, "concurrency": 2},
+                      {"times": 5, "concurrency": 1}]},
+        {"config": {"times": 2, "concurrency": 1, "timeout": 1}, "agents": 3,
+         "expected": [{"times": 1, "concurrency": 1, "timeout": 1},
+                      None, None]},
+        {"config": {"rps": 10, "times": 4}, "agents": 4,
+         "expected": [{"rps": 2.5, "times": 1}] * 4},
+        {"config": {"rps": {"start": 2, "end": 10, "step": 4},
+                    "times": 20},
+         "agents": 2,
+         "expected": [{"rps": {"start": 1, "end": 5, "step": 2},
+                       "times": 10}] * 2},
+        {"config": {"duration": 10, "max_concurrency": 3}, "agents": 2,
+         "expected": [{"duration": 10, "max_concurrency": 2},
+                      {"duration": 10, "max_concurrency": 1}]})
+    @ddt.unpack
+    def test_split_config(self, config, agents, expected):
+        self.assertEqual(expected, distributed.split_config(config, agents))
+
+    @ddt.data(
+        {"config": {"agents": ["10.0.0.2:8000", "unix:/tmp/agent"],
+                    "runner": {"constant": {"times": 10}}}},
+        {"config": {"agents": ["10.0.0.2"],
+                    "runner": {"constant": {"times": 10}}},
+         "valid": False},
+        {"config": {"agents": ["10.0.0.2:8000"],
+                    "runner": {"constant": {"foo": 10}}},
+         "valid": False},
+        {"config": {"agents": ["10.0.0.2:8000"],
+                    "runner": {"distributed": {
+                        "agents": ["10.0.0.3:8000"],
+                        "runner": {"constant": {"times": 10}}}}},
+         "valid": False},
+        {"config": {"agents": [], "runner": {"constant": {}}},
+         "valid": False},
+        {"config": {"agents": ["10.0.0.2:8000"], "runner": {}},
+         "valid": False})
+    @ddt.unpack
+    def test_validate(self, config, valid=True):
+        results = runner.ScenarioRunner.validate(
+            "distributed", None, None, config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertGreater(len(results), 0)
+
+    def test__run_scenario(self):
+        config = {"agents": self._start_agents(2),
+                  "runner": {"constant": {"times": 7, "concurrency": 2}}}
+        runner_obj = distributed.DistributedScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "run",
+                                 {"task": mock.Mock()}, {})
+
+        results = [r for batch in runner_obj.result_queue for r in batch]
+        self.assertEqual(7, len(results))
+        self.assertEqual([], [r["error"] for r in results if r["error"]])
+        # the iterations of both agents are numbered within the workload
+        self.assertEqual(
+            list(range(1, 8)),
+            [e["value"] for e in runner_obj.event_queue
+             if e["type"] == "iteration"])
+
+    def test__run_scenario_aborted(self):
+        config = {"agents": self._start_agents(2),
+                  "runner": {"constant_for_duration": {"duration": 60,
+                                                       "concurrency": 2}}}
+        runner_obj = distributed.DistributedScenarioRunner(self.task, config)
+
+        threading.Timer(0.2, runner_obj.abort).start()
+        runner_obj._run_scenario(fakes.FakeScenario, "run",
+                                 {"task": mock.Mock()}, {})
+
+        self.assertTrue(runner_obj.aborted.is_set())
+
+    def test__run_scenario_agent_failed(self):
+        config = {"agents": self._start_agents(1),
+                  "runner": {"constant": {"times": 1}}}
+        runner_obj = distributed.DistributedScenarioRunner(self.task, config)
+
+        # the scenario is unknown to the agent
+        scenario_cls = mock.Mock()
+        scenario_cls.get_name.return_value = "foo"
+
+        e = self.assertRaises(exceptions.AgentFailure,
+                              runner_obj._run_scenario, scenario_cls, "run",
+                              {"task": mock.Mock()}, {})
+
+        self.assertIn(config["agents"][0], e.format_message())
+
+    def test__run_scenario_agent_is_not_available(self):
+        config = {"agents": ["unix:%s" % os.path.join(os.environ["HOME"],
+                                                      "missing")],
+                  "runner": {"constant": {"times": 1}}}
+        runner_obj = distributed.DistributedScenarioRunner(self.task, config)
+
+        self.assertRaises(OSError, runner_obj._run_scenario,
+                          fakes.FakeScenario, "run", {"task": mock.Mock()}, {})
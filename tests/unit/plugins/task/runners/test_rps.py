@@ -127,6 +127,92 @@ class RPSScenarioRunnerTestCase(test.TestCase):
             },
             "valid": False
         },
+        {
+            "config": {
+                "rps": 2,
+                "times": 55,
+                "open_loop": True
+            }
+        },
+        {
+            "config": {
+                "rps": 2,
+                "times": 55,
+                "open_loop": "yes"
+            },
+            "valid": False
+        },
+        {
+            "config": {
+                "rps": 2,
+                "times": 55,
+                "arrivals": {"distribution": "poisson", "seed": 1}
+            }
+        },
+        {
+            "config": {
+                "rps": 2,
+                "times": 55,
+                "arrivals": {"distribution": "uniform", "jitter": 0.3}
+            }
+        },
+        {
+            "config": {
+                "rps": 2,
+                "times": 55,
+                "arrivals": {"distribution": "uniform"}
+            },
+            "valid": False
+        },
+        {
+            "config": {
+                "rps": 2,
+                "times": 55,
+                "arrivals": {"distribution": "custom",
+                             "intervals": [0.5, 1, 4]}
+            }
+        },
+        {
+            "config": {
+                "rps": 2,
+                "times": 55,
+                "arrivals": {"distribution": "custom", "intervals": [0, 0]}
+            },
+            "valid": False
+        },
+        {
+            "config": {
+                "rps": 2,
+                "times": 55,
+                "arrivals": {"distribution": "pareto"}
+            },
+            "valid": False
+        },
+        {
+            "config": {
+                "rps": 2,
+                "times": 55,
+                "warmup": {"duration": 5},
+                "cooldown": {"iterations": 5}
+            }
+        },
+        {
+            "config": {
+                "rps": 2,
+                "times": 10,
+                "warmup": {"iterations": 5},
+                "cooldown": {"iterations": 5}
+            },
+            "valid": False
+        },
+        {
+            "config": {
+                "rps": 2,
+                "times": 55,
+                "cooldown": {"duration": 5}
+            },
+            "valid": False
+        },
 
     )
     @ddt.unpack
@@ -176,8 +262,8 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         rps._worker_process(mock_queue, fake_ram_int, 1, times,
                             max_concurrent, context, "Dummy", "dummy",
                             (), mock_event_queue, mock_event,
-                            mock_runs_per_second, 10, 1,
-                            info)
+                            mock_runs_per_second, 10, 1, False, None,
+                            runner.LoadPhases({}), info)
 
         self.assertEqual(times, mock_log.debug.call_count)
         self.assertEqual(times + 1, mock_thread.call_count)
@@ -187,8 +273,8 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         # scenario repetition and one more need on "initialization" stage
         # of the thread stuff.
 
-        self.assertEqual(1, mock_time.sleep.call_count)
-        self.assertEqual(2, mock_thread_instance.is_alive.call_count)
+        self.assertEqual(3, mock_time.sleep.call_count)
+        self.assertEqual(4, mock_thread_instance.is_alive.call_count)
         self.assertEqual(times * 4 - 1, mock_time.time.count)
 
         self.assertEqual(times, mock_runner._get_scenario_context.call_count)
@@ -198,6 +284,8 @@ class RPSScenarioRunnerTestCase(test.TestCase):
             call = mock.call(
                 args=(mock_queue, "Dummy", "dummy", scenario_context, (),
                       mock_event_queue),
+                kwargs={"scheduled_at": None, "timeout_service": mock.ANY,
+                        "timeout": 1, "phase": None},
                 target=mock_runner._worker_thread,
             )
             self.assertIn(call, mock_thread.mock_calls)
@@ -213,9 +301,104 @@ class RPSScenarioRunnerTestCase(test.TestCase):
 
         self.assertEqual(1, mock_queue.put.call_count)
 
-        expected_calls = [mock.call(*args)]
+        expected_calls = [mock.call(*args, timeout_guard=None)]
         self.assertEqual(expected_calls, mock__run_scenario_once.mock_calls)
 
+    @mock.patch(RUNNERS + "rps.runner._run_scenario_once")
+    def test__worker_thread_with_scheduled_at(self,
+                                              mock__run_scenario_once):
+        mock__run_scenario_once.return_value = {"timestamp": 2.0}
+        mock_queue = mock.MagicMock()
+        args = ("fake_cls", "fake_method_name", "fake_context_obj", {},
+                mock.MagicMock())
+
+        runner._worker_thread(mock_queue, *args, scheduled_at=1.5)
+
+        mock_queue.put.assert_called_once_with(
+            {"timestamp": 2.0, "scheduled_at": 1.5})
+
+    @ddt.data(
+        {"rps_cfg": 4, "processes": 2,
+         "expected": [100.0, 100.5, 101.0, 101.5]},
+        {"rps_cfg": {"start": 2, "end": 4, "step": 1, "duration": 2},
+         "processes": 1,
+         "expected": [100.0, 100.5, 101.0, 101.5, 102.0, 102.5, 102.944444]}
+    )
+    @ddt.unpack
+    def test__schedule(self, rps_cfg, processes, expected):
+        schedule = rps._Schedule(rps_cfg, 100.0, processes,
+                                 rps._runs_per_second)
+
+        starts = [schedule.next_start]
+        while len(starts) < len(expected):
+            starts.append(schedule.advance(starts[-1]))
+        self.assertEqual(expected, [round(s, 6) for s in starts])
+
+    def _intervals(self, arrivals, worker=0, count=2000):
+        schedule = rps._Schedule(10, 0.0, 1, rps._runs_per_second,
+                                 arrivals=arrivals, worker=worker)
+        return [schedule.advance(0.0) for _ in range(count)]
+
+    @ddt.data(
+        {"distribution": "poisson", "seed": 42},
+        {"distribution": "uniform", "jitter": 0.5, "seed": 42},
+        {"distribution": "custom", "intervals": [0, 1, 5], "seed": 42})
+    def test__schedule_distributions(self, arrivals):
+        intervals = self._intervals(arrivals)
+
+        # the mean interval is the one of the requested rps
+        self.assertAlmostEqual(0.1, sum(intervals) / len(intervals),
+                               delta=0.01)
+        self.assertGreater(len(set(intervals)), 1)
+        # the same seed gives the same schedule, but not for all workers
+        self.assertEqual(intervals, self._intervals(arrivals))
+        self.assertNotEqual(intervals, self._intervals(arrivals, worker=1))
+
+    def test__schedule_uniform_bounds(self):
+        intervals = self._intervals({"distribution": "uniform",
+                                     "jitter": 0.2})
+
+        self.assertTrue(all(0.08 <= i <= 0.12 for i in intervals))
+
+    def test__schedule_custom_samples(self):
+        intervals = self._intervals({"distribution": "custom",
+                                     "intervals": [1, 3]})
+
+        self.assertEqual({0.05, 0.15}, {round(i, 6) for i in intervals})
+
+    @mock.patch(RUNNERS + "rps.time.sleep")
+    def test__run_scenario_open_loop(self, mock_sleep):
+        config = {"times": 6, "rps": 60, "max_concurrency": 2,
+                  "max_cpu_count": 1, "open_loop": True}
+        runner_obj = rps.RPSScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "run",
+                                 {"task": {"uuid": 1}}, {})
+
+        results = [r for batch in runner_obj.result_queue for r in batch]
+        self.assertEqual(config["times"], len(results))
+        scheduled = sorted(r["scheduled_at"] for r in results)
+        for i in range(1, len(scheduled)):
+            self.assertAlmostEqual(1.0 / 60, scheduled[i] - scheduled[i - 1])
+        for result in results:
+            self.assertGreaterEqual(result["timestamp"],
+                                    result["scheduled_at"])
+
+    @mock.patch(RUNNERS + "rps.time.sleep")
+    def test__run_scenario_with_arrivals(self, mock_sleep):
+        config = {"times": 6, "rps": 60, "max_cpu_count": 1,
+                  "arrivals": {"distribution": "poisson", "seed": 3}}
+        runner_obj = rps.RPSScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "run",
+                                 {"task": {"uuid": 1}}, {})
+
+        results = [r for batch in runner_obj.result_queue for r in batch]
+        self.assertEqual(config["times"], len(results))
+        # only the open-loop mode reports the scheduled time
+        for result in results:
+            self.assertNotIn("scheduled_at", result)
+
     @ddt.data(
         {
             "config": {
@@ -304,8 +487,10 @@ class RPSScenarioRunnerTestCase(test.TestCase):
     @mock.patch(RUNNERS + "rps.RPSScenarioRunner._log_debug_info")
     @mock.patch(RUNNERS + "rps.RPSScenarioRunner._create_process_pool")
     @mock.patch(RUNNERS + "rps.RPSScenarioRunner._join_processes")
+    @mock.patch(RUNNERS + "rps.RPSScenarioRunner._create_result_queue")
     def test_that_cpu_count_is_adjusted_properly(
-            self, mock__join_processes, mock__create_process_pool,
+            self, mock__create_result_queue, mock__join_processes,
+            mock__create_process_pool,
             mock__log_debug_info, mock_cpu_count, mock_queue):
 
         samples = [
@@ -375,6 +560,7 @@ class RPSScenarioRunnerTestCase(test.TestCase):
             mock_cpu_count.reset_mock()
             mock__create_process_pool.reset_mock()
             mock__join_processes.reset_mock()
+            mock__create_result_queue.reset_mock()
             mock_queue.reset_mock()
 
             mock_cpu_count.return_value = sample["real_cpu"]
@@ -398,9 +584,12 @@ class RPSScenarioRunnerTestCase(test.TestCase):
             args, kwargs = mock__create_process_pool.call_args
             self.assertIn(sample["expected"]["processes_to_start"], args)
             self.assertIn(rps._worker_process, args)
+            mock__create_result_queue.assert_called_once_with(
+                sample["expected"]["processes_to_start"])
             mock__join_processes.assert_called_once_with(
                 mock__create_process_pool.return_value,
-                mock_queue.return_value, mock_queue.return_value)
+                mock__create_result_queue.return_value,
+                mock_queue.return_value)
 
     def test_abort(self):
         config = {"times": 4, "rps": 10}
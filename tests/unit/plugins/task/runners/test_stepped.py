@@ -0,0 +1,144 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+import threading
+from unittest import mock
+
+import ddt
+
+from rally.plugins.task.runners import stepped
+from rally.task import runner
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.task.runners."
+
+
+@ddt.ddt
+class SteppedConcurrencyScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = mock.MagicMock()
+
+    @ddt.data(
+        {"config": {"stages": [{"concurrency": 10, "duration": 60}]}},
+        {"config": {"stages": [{"concurrency": 10, "duration": 60},
+                               {"concurrency": 50, "duration": 30.5,
+                                "ramp": True}],
+                    "timeout": 5, "max_cpu_count": 2}},
+        {"config": {}, "valid": False},
+        {"config": {"stages": []}, "valid": False},
+        {"config": {"stages": [{"concurrency": 0, "duration": 1}]},
+         "valid": False},
+        {"config": {"stages": [{"concurrency": 1}]}, "valid": False},
+        {"config": {"stages": [{"concurrency": 1, "duration": 1,
+                                "foo": 1}]}, "valid": False})
+    @ddt.unpack
+    def test_validate(self, config, valid=True):
+        results = runner.ScenarioRunner.validate(
+            "stepped_concurrency", None, None, config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertGreater(len(results), 0)
+
+    @ddt.data(
+        (0, (0, 10)), (9.9, (0, 10)), (10, (1, 30)), (14.9, (1, 30)),
+        (15, (3, 30)), (17.5, (3, 20)), (19.9, (3, 11)), (20, (4, 2)),
+        (30, None))
+    @ddt.unpack
+    def test__get_stage(self, elapsed, expected):
+        stages = [{"concurrency": 10, "duration": 10},
+                  {"concurrency": 30, "duration": 5},
+                  {"concurrency": 30, "duration": 0},
+                  # ramps down from the previous stage
+                  {"concurrency": 10, "duration": 5, "ramp": True},
+                  {"concurrency": 2, "duration": 10}]
+        ramp_up = [{"concurrency": 30, "duration": 5, "ramp": True}]
+
+        self.assertEqual(expected, stepped._get_stage(stages, elapsed))
+        # the first stage ramps up from 0
+        self.assertEqual((0, 1), stepped._get_stage(ramp_up, 0))
+        self.assertEqual((0, 15), stepped._get_stage(ramp_up, 2.5))
+
+    @ddt.data(
+        # the next stage lets the slot run
+        (0, 15, 10), (9.5, 15, 0.5),
+        # the ramp gets above the slot in the middle of it
+        (0, 40, 17.5), (16, 40, 1.5),
+        # the slot does not run anymore, until the end of the load
+        (21, 20, 9), (25, 60, 5))
+    @ddt.unpack
+    def test__starts_in(self, elapsed, slot, expected):
+        stages = [{"concurrency": 10, "duration": 10},
+                  {"concurrency": 30, "duration": 5},
+                  {"concurrency": 50, "duration": 5, "ramp": True},
+                  {"concurrency": 2, "duration": 10}]
+
+        self.assertEqual(expected,
+                         stepped._starts_in(stages, elapsed, slot))
+
+    @mock.patch(RUNNERS + "stepped.time.time")
+    def test_stages_wait(self, mock_time):
+        mock_time.side_effect = [0, 1, 12, 25]
+        aborted = mock.Mock()
+        aborted.is_set.return_value = False
+        schedule = stepped._Stages(
+            [{"concurrency": 1, "duration": 10},
+             {"concurrency": 2, "duration": 10}], 0)
+
+        self.assertEqual({"stage": 0, "concurrency": 1},
+                         schedule.wait(0, aborted))
+        # the slot sleeps until the next stage
+        self.assertEqual({"stage": 1, "concurrency": 2},
+                         schedule.wait(1, aborted))
+        aborted.wait.assert_called_once_with(9)
+        self.assertIsNone(schedule.wait(1, aborted))
+
+    def test_stages_wait_aborted(self):
+        aborted = multiprocessing.Event()
+        schedule = stepped._Stages([{"concurrency": 1, "duration": 10}],
+                                   stepped.time.time())
+        timer = threading.Timer(0.05, aborted.set)
+        timer.start()
+        self.addCleanup(timer.join)
+
+        self.assertIsNone(schedule.wait(1, aborted))
+
+    def test__run_scenario(self):
+        config = {"stages": [{"concurrency": 1, "duration": 0.1},
+                             {"concurrency": 3, "duration": 0.1,
+                              "ramp": True}],
+                  "max_cpu_count": 2}
+        runner_obj = stepped.SteppedConcurrencyScenarioRunner(self.task,
+                                                              config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "run",
+                                 {"task": {"uuid": 1}}, {})
+
+        results = [r for batch in runner_obj.result_queue for r in batch]
+        self.assertEqual({0, 1}, {r["stage"] for r in results})
+        self.assertEqual(
+            {1}, {r["concurrency"] for r in results if r["stage"] == 0})
+
+    def test__run_scenario_aborted(self):
+        runner_obj = stepped.SteppedConcurrencyScenarioRunner(
+            self.task, {"stages": [{"concurrency": 2, "duration": 10}]})
+
+        runner_obj.abort()
+        runner_obj._run_scenario(fakes.FakeScenario, "run",
+                                 {"task": {"uuid": 1}}, {})
+
+        self.assertEqual(0, len(runner_obj.result_queue))
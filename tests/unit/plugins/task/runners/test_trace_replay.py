@@ -0,0 +1,140 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import tempfile
+from unittest import mock
+
+import ddt
+
+from rally.plugins.task.runners import trace_replay
+from rally.task import runner
+from tests.unit import fakes
+from tests.unit import test
+
+
+RUNNERS = "rally.plugins.task.runners."
+
+
+@ddt.ddt
+class TraceReplayScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = mock.MagicMock()
+
+    def _make_trace(self, *lines):
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test__read_trace(self):
+        path = self._make_trace("0", "", '{"offset": 0.5, "args": {"a": 1}}',
+                                "1.5", '{"offset": 2}')
+
+        self.assertEqual(
+            [(0, {"offset": 0}), (1, {"offset": 0.5, "args": {"a": 1}}),
+             (2, {"offset": 1.5}), (3, {"offset": 2})],
+            list(trace_replay._read_trace(path)))
+        self.assertEqual(
+            [(1, {"offset": 0.5, "args": {"a": 1}}), (3, {"offset": 2})],
+            list(trace_replay._read_trace(path, worker=1, workers=2)))
+
+    @ddt.data(
+        {"lines": ["0", '{"offset": 1, "args": {"a": 1}}'],
+         "config": {"speed": 2.5, "max_concurrency": 4, "timeout": 1}},
+        {"lines": ["0", "1"], "config": {"foo": "bar"}, "valid": False},
+        {"lines": ["0", "1"], "config": {"speed": 0}, "valid": False},
+        {"lines": ["0", "{"], "valid": False},
+        {"lines": ["0", "-1"], "valid": False},
+        {"lines": ['{"args": {}}'], "valid": False},
+        {"lines": ['{"offset": true}'], "valid": False},
+        {"lines": ['{"offset": 1, "args": [1]}'], "valid": False})
+    @ddt.unpack
+    def test_validate(self, lines, config=None, valid=True):
+        config = dict(config or {}, trace=self._make_trace(*lines))
+
+        results = runner.ScenarioRunner.validate("trace_replay", None, None,
+                                                 config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertGreater(len(results), 0)
+
+    def test_validate_missing_trace(self):
+        results = runner.ScenarioRunner.validate(
+            "trace_replay", None, None, {"trace": "/non/existing/trace"})
+
+        self.assertEqual(1, len(results))
+        self.assertIn("Could not read the trace file", results[0])
+
+    def test__run_scenario(self):
+        trace = self._make_trace(
+            "0", "0.01", '{"offset": 0.02, "args": {"raise_exc": true}}',
+            "0.03", "0.04")
+        config = {"trace": trace, "speed": 2, "max_concurrency": 2,
+                  "max_cpu_count": 2}
+        runner_obj = trace_replay.TraceReplayScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "run",
+                                 {"task": {"uuid": 1}}, {})
+
+        results = sorted(
+            (r for batch in runner_obj.result_queue for r in batch),
+            key=lambda r: r["scheduled_at"])
+        self.assertEqual(5, len(results))
+        started_at = results[0]["scheduled_at"]
+        for i, result in enumerate(results):
+            self.assertAlmostEqual(i * 0.005,
+                                   result["scheduled_at"] - started_at,
+                                   places=5)
+            self.assertGreaterEqual(result["timestamp"],
+                                    result["scheduled_at"])
+        # the arguments of a record affect its iteration only
+        self.assertEqual([False, False, True, False, False],
+                         [bool(r["error"]) for r in results])
+
+    def test__run_scenario_aborted(self):
+        config = {"trace": self._make_trace("0", "1")}
+        runner_obj = trace_replay.TraceReplayScenarioRunner(self.task, config)
+
+        runner_obj.abort()
+        runner_obj._run_scenario(fakes.FakeScenario, "run",
+                                 {"task": {"uuid": 1}}, {})
+
+        self.assertEqual(0, len(runner_obj.result_queue))
+
+    @mock.patch(RUNNERS + "trace_replay.multiprocessing.cpu_count",
+                return_value=4)
+    @mock.patch(RUNNERS + "trace_replay.TraceReplayScenarioRunner"
+                "._create_process_pool")
+    @mock.patch(RUNNERS + "trace_replay.TraceReplayScenarioRunner"
+                "._join_processes")
+    @mock.patch(RUNNERS + "trace_replay.TraceReplayScenarioRunner"
+                "._create_result_queue")
+    def test__run_scenario_spreads_concurrency(
+            self, mock__create_result_queue, mock__join_processes,
+            mock__create_process_pool, mock_cpu_count):
+        config = {"trace": "trace.jsonl", "max_concurrency": 6}
+        runner_obj = trace_replay.TraceReplayScenarioRunner(self.task, config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "run", {}, {})
+
+        mock__create_result_queue.assert_called_once_with(4)
+        processes_to_start, worker, args_gen = (
+            mock__create_process_pool.call_args[0])
+        self.assertEqual(4, processes_to_start)
+        self.assertEqual(trace_replay._worker_process, worker)
+        self.assertEqual([2, 2, 1, 1],
+                         [next(args_gen)[5] for _ in range(4)])
@@ -346,6 +346,33 @@ class LoadProfileChartTestCase(test.TestCase):
         self.assertEqual(expected, chart.render())
 
 
+class RPSProfileChartTestCase(test.TestCase):
+
+    def test_add_iteration_and_render(self):
+        workload = {"total_iteration_count": 5,
+                    "data": [{"timestamp": 10.2, "scheduled_at": 10.0}],
+                    "start_time": 9.0}
+        chart = charts.RPSProfileChart(workload)
+        self.assertIsInstance(chart, charts.Chart)
+        for scheduled_at, timestamp in [(10.0, 10.2), (10.5, 10.6),
+                                        (11.0, 12.3), (11.5, 12.4),
+                                        (12.0, 12.5)]:
+            chart.add_iteration({"scheduled_at": scheduled_at,
+                                 "timestamp": timestamp})
+
+        self.assertEqual(
+            [("requested", [(0, 2), (1, 2), (2, 1)]),
+             ("achieved", [(0, 2), (1, 0), (2, 3)])],
+            chart.render())
+
+    def test_render_without_scheduled_iterations(self):
+        chart = charts.RPSProfileChart({"total_iteration_count": 1,
+                                        "data": [], "start_time": 9.0})
+        chart.add_iteration({"timestamp": 10.0})
+
+        self.assertEqual([], chart.render())
+
+
 @ddt.ddt
 class HistogramChartTestCase(test.TestCase):
 
@@ -761,6 +788,42 @@ class MainStatsTableTestCase(test.TestCase):
                 [" -> idle_duration", 20.0, 20.0, 20.0, 20.0, 20.0, 20.0,
                  "0.0%", 1]],
             "expected_styles": {2: "rich", 3: "oblique", 4: "oblique"}
+        },
+        {
+            "info": {"total_iteration_count": 2},
+            "data": [
+                dict(generate_iteration(2.0, False, ("foo", 1.0)),
+                     timestamp=10.0, scheduled_at=9.0),
+                dict(generate_iteration(4.0, False, ("foo", 1.0)),
+                     timestamp=12.0, scheduled_at=12.0)
+            ],
+            "expected_rows": [
+                ["foo", 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, "100.0%", 2],
+                ["total", 2.0, 3.0, 3.8, 3.9, 4.0, 3.0, "100.0%", 2],
+                [" -> duration", 2.0, 3.0, 3.8, 3.9, 4.0, 3.0, "100.0%", 2],
+                [" -> idle_duration",
+                 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, "100.0%", 2],
+                [" -> latency", 3.0, 3.5, 3.9, 3.95, 4.0, 3.5, "100.0%", 2]],
+            "expected_styles": {1: "rich", 2: "oblique", 3: "oblique",
+                                4: "oblique"}
+        },
+        {
+            "info": {"total_iteration_count": 3},
+            "data": [
+                dict(generate_iteration(2.0, False, ("foo", 1.0)), stage=0),
+                dict(generate_iteration(4.0, False, ("foo", 1.0)), stage=1),
+                dict(generate_iteration(6.0, True, ("foo", 1.0)), stage=1)
+            ],
+            "expected_rows": [
+                ["foo", 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, "66.7%", 3],
+                ["total", 2.0, 4.0, 5.6, 5.8, 6.0, 4.0, "66.7%", 3],
+                [" -> duration", 2.0, 4.0, 5.6, 5.8, 6.0, 4.0, "66.7%", 3],
+                [" -> idle_duration",
+                 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, "66.7%", 3],
+                [" -> stage 1", 2.0, 2.0, 2.0, 2.0, 2.0, 2.0, "100.0%", 1],
+                [" -> stage 2", 4.0, 5.0, 5.8, 5.9, 6.0, 5.0, "50.0%", 2]],
+            "expected_styles": {1: "rich", 2: "oblique", 3: "oblique",
+                                4: "oblique", 5: "oblique"}
         }
     )
     @ddt.unpack
@@ -850,6 +913,81 @@ class MainStatsTableTestCase(test.TestCase):
                       }
         }, table.to_dict())
 
+    def test_add_iteration_of_warmup_and_cooldown(self):
+        table = charts.MainStatsTable({"total_iteration_count": 3})
+        expected = charts.MainStatsTable({"total_iteration_count": 3})
+        iteration = generate_iteration(5.0, False, ("foo", 1.0))
+        table.add_iteration(dict(iteration, phase="warmup"))
+        table.add_iteration(iteration)
+        table.add_iteration(dict(iteration, duration=50.0, phase="cooldown"))
+        expected.add_iteration(iteration)
+
+        self.assertEqual(expected.render(), table.render())
+
+
+class ConcurrencyTableTestCase(test.TestCase):
+
+    def test_add_iteration_and_render(self):
+        table = charts.ConcurrencyTable({"total_iteration_count": 5})
+        self.assertIsInstance(table, charts.Table)
+        for concurrency, duration, error in [(4, 1.5, []), (2, 0.5, []),
+                                             (4, 3.5, ["E", "msg", "tb"]),
+                                             (2, 0.5, []), (None, 9, [])]:
+            iteration = {"duration": duration, "idle_duration": 0.5,
+                         "error": error}
+            if concurrency:
+                iteration["concurrency"] = concurrency
+            table.add_iteration(iteration)
+
+        self.assertEqual(
+            {"cols": ["Concurrency", "Iterations", "Throughput (iter/sec)",
+                      "Avg (sec)", "95%ile (sec)", "Success"],
+             "rows": [[2, 2, 2.0, 1.0, 1.0, "100.0%"],
+                      [4, 2, 1.333, 3.0, 3.9, "50.0%"]],
+             "styles": {0: "rich"}},
+            table.render())
+
+    def test_render_without_concurrency(self):
+        table = charts.ConcurrencyTable({"total_iteration_count": 1})
+        table.add_iteration({"duration": 1, "idle_duration": 0,
+                             "error": []})
+
+        self.assertEqual({"cols": table.columns, "rows": [], "styles": {}},
+                         table.render())
+
+
+class StageTableTestCase(test.TestCase):
+
+    def test_add_iteration_and_render(self):
+        table = charts.StageTable({"total_iteration_count": 6})
+        self.assertIsInstance(table, charts.Table)
+        for stage, timestamp, duration, error in [
+                (1, 10.0, 2.0, []), (0, 0.0, 1.5, []),
+                (1, 11.0, 3.5, ["E", "msg", "tb"]), (0, 1.0, 1.5, []),
+                (1, 12.0, 1.5, []), (None, 20.0, 9, [])]:
+            iteration = {"timestamp": timestamp, "duration": duration,
+                         "idle_duration": 0.5, "error": error}
+            if stage is not None:
+                iteration["stage"] = stage
+            table.add_iteration(iteration)
+
+        # the stages of the same concurrency are not merged
+        self.assertEqual(
+            {"cols": ["Stage", "Iterations", "Throughput (iter/sec)",
+                      "Median (sec)", "95%ile (sec)", "Success"],
+             "rows": [[1, 2, 0.667, 2.0, 2.0, "100.0%"],
+                      [2, 3, 0.6, 2.5, 3.85, "66.7%"]],
+             "styles": {}},
+            table.render())
+
+    def test_render_without_stages(self):
+        table = charts.StageTable({"total_iteration_count": 1})
+        table.add_iteration({"timestamp": 1.0, "duration": 1,
+                             "idle_duration": 0, "error": []})
+
+        self.assertEqual({"cols": table.columns, "rows": [], "styles": {}},
+                         table.render())
+
 
 class OutputChartTestCase(test.TestCase):
 
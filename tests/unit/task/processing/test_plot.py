@@ -33,11 +33,14 @@ class PlotTestCase(test.TestCase):
     def test__process_workload(self, mock_charts):
         for mock_ins, ret in [
                 (mock_charts.MainStatsTable, "main_stats"),
+                (mock_charts.ConcurrencyTable, "concurrency_stats"),
+                (mock_charts.StageTable, "stage_stats"),
                 (mock_charts.MainStackedAreaChart, "main_stacked"),
                 (mock_charts.AtomicStackedAreaChart, "atomic_stacked"),
                 (mock_charts.OutputStackedAreaDeprecatedChart,
                  "output_stacked"),
                 (mock_charts.LoadProfileChart, "load_profile"),
+                (mock_charts.RPSProfileChart, "rps_profile"),
                 (mock_charts.MainHistogramChart, "main_histogram"),
                 (mock_charts.AtomicHistogramChart, "atomic_histogram"),
                 (mock_charts.AtomicAvgChart, "atomic_avg")]:
@@ -79,11 +82,14 @@ class PlotTestCase(test.TestCase):
                             "pie": [("success", 10), ("errors", 0)]},
              "iterations_count": 10, "errors": [],
              "load_profile": "load_profile",
+             "rps_profile": "rps_profile",
              "additive_output": [],
              "complete_output": [[], [], [], [], [], [], [], [], [], []],
              "has_output": False,
              "output_errors": [],
-             "sla": {}, "sla_success": True, "table": "main_stats"},
+             "sla": {}, "sla_success": True, "table": "main_stats",
+             "concurrency_table": "concurrency_stats",
+             "stage_table": "stage_stats"},
             result)
 
     @ddt.data(
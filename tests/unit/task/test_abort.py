@@ -0,0 +1,145 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import threading
+from unittest import mock
+
+import ddt
+
+from rally import consts
+from rally import exceptions
+from rally.task import abort
+from tests.unit import test
+
+
+TASK_UUID = "5b7a5dbb-9e16-4bb5-b8c2-8e1c47a8d0d2"
+
+
+@ddt.ddt
+class AbortChannelTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch("rally.task.abort.objects.Task.get_status",
+                             return_value=consts.TaskStatus.RUNNING)
+        self.mock_get_status = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_notify_without_engine(self):
+        self.assertFalse(abort.notify(TASK_UUID))
+
+    @ddt.data(True, False)
+    def test_notify(self, soft):
+        stop_event = threading.Event()
+        with abort.AbortChannel(TASK_UUID) as channel:
+            self.assertTrue(channel.listening)
+            self.assertTrue(os.path.exists(abort.get_path(TASK_UUID)))
+
+            self.assertTrue(abort.notify(TASK_UUID, soft=soft))
+
+            if soft:
+                self.assertTrue(channel.soft.wait(5))
+                # the soft abort does not stop the running workload
+                stop_event.set()
+            self.assertEqual(not soft, channel.wait(stop_event))
+            self.assertTrue(channel.is_aborting())
+            self.assertEqual(not soft, channel.is_aborting(soft=False))
+
+        self.assertFalse(channel.listening)
+        self.assertFalse(os.path.exists(abort.get_path(TASK_UUID)))
+        # the status is checked once the channel starts listening
+        self.mock_get_status.assert_called_once_with(TASK_UUID)
+
+    def test_poll_while_listening(self):
+        abort.CONF.set_override("task_abort_poll_interval", 0.1)
+        self.addCleanup(abort.CONF.clear_override, "task_abort_poll_interval")
+        self.mock_get_status.side_effect = [
+            consts.TaskStatus.RUNNING, consts.TaskStatus.RUNNING,
+            consts.TaskStatus.ABORTING]
+
+        with abort.AbortChannel(TASK_UUID) as channel:
+            self.assertTrue(channel.wait(threading.Event()))
+
+    def test_start_aborted_task(self):
+        self.mock_get_status.return_value = consts.TaskStatus.SOFT_ABORTING
+
+        with abort.AbortChannel(TASK_UUID) as channel:
+            self.assertTrue(channel.is_aborting())
+            self.assertFalse(channel.is_aborting(soft=False))
+
+    def test_start_without_poll(self):
+        self.mock_get_status.return_value = consts.TaskStatus.ABORTED
+        channel = abort.AbortChannel(TASK_UUID)
+
+        channel.start(poll=False)
+        self.addCleanup(channel.stop)
+
+        self.assertFalse(self.mock_get_status.called)
+        self.assertFalse(channel.is_aborting())
+        # the requests are still received
+        self.assertTrue(abort.notify(TASK_UUID, soft=True))
+        self.assertTrue(channel.soft.wait(5))
+
+    def test_is_listening(self):
+        self.assertFalse(abort.is_listening(TASK_UUID))
+        with abort.AbortChannel(TASK_UUID):
+            self.assertTrue(abort.is_listening(TASK_UUID))
+        # the socket is left by the engine which crashed
+        with open(abort.get_path(TASK_UUID), "w"):
+            pass
+        self.assertFalse(abort.is_listening(TASK_UUID))
+
+    def test_start_removes_stale_socket(self):
+        os.makedirs(os.path.dirname(abort.get_path(TASK_UUID)))
+        with open(abort.get_path(TASK_UUID), "w"):
+            pass
+
+        with abort.AbortChannel(TASK_UUID) as channel:
+            self.assertTrue(channel.listening)
+
+    def test_start_refuses_live_socket(self):
+        with abort.AbortChannel(TASK_UUID):
+            channel = abort.AbortChannel(TASK_UUID)
+            self.assertRaises(exceptions.RallyException, channel.start)
+            self.assertFalse(channel.listening)
+
+            # the socket of the running engine is kept
+            self.assertTrue(abort.is_listening(TASK_UUID))
+            self.assertTrue(abort.notify(TASK_UUID))
+
+    @mock.patch("rally.task.abort.LOG")
+    @mock.patch("rally.task.abort.get_path")
+    def test_start_fails(self, mock_get_path, mock_log):
+        # the path is too long for a UNIX socket
+        mock_get_path.return_value = os.path.join(os.environ["HOME"],
+                                                  "a" * 200)
+
+        with abort.AbortChannel(TASK_UUID) as channel:
+            self.assertFalse(channel.listening)
+            self.assertTrue(mock_log.warning.called)
+
+            # the status of the task is checked every time instead
+            self.assertFalse(channel.is_aborting())
+            self.mock_get_status.return_value = consts.TaskStatus.ABORTING
+            self.assertTrue(channel.is_aborting(soft=False))
+            self.assertTrue(channel.wait(threading.Event()))
+
+    def test_abort(self):
+        channel = abort.AbortChannel(TASK_UUID)
+
+        channel.abort(soft=True)
+        self.assertTrue(channel.soft.is_set())
+        self.assertFalse(channel.hard.is_set())
+
+        channel.abort()
+        self.assertTrue(channel.hard.is_set())
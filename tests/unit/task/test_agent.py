@@ -0,0 +1,113 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import threading
+
+import ddt
+
+from rally import exceptions
+from rally.task import agent
+from tests.unit import fakes  # noqa: F401 (registers the scenario)
+from tests.unit import test
+
+
+@ddt.ddt
+class AgentTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        agent.CONF.set_override("runner_agent_authkey", "secret")
+        self.addCleanup(agent.CONF.clear_override, "runner_agent_authkey")
+        self.address = "unix:%s" % os.path.join(os.environ["HOME"], "agent")
+
+    def _start_agent(self):
+        agent_obj = agent.Agent(self.address)
+        thread = threading.Thread(target=agent_obj.serve)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(agent_obj.close)
+        return agent_obj
+
+    @ddt.data(
+        ("unix:/tmp/agent", ("/tmp/agent", "AF_UNIX")),
+        ("10.0.0.2:8000", (("10.0.0.2", 8000), "AF_INET")),
+        ("[::1]:8000", (("[::1]", 8000), "AF_INET")))
+    @ddt.unpack
+    def test_parse_address(self, address, expected):
+        self.assertEqual(expected, agent.parse_address(address))
+
+    @ddt.data("10.0.0.2", ":8000", "10.0.0.2:port")
+    def test_parse_address_invalid(self, address):
+        self.assertRaises(ValueError, agent.parse_address, address)
+
+    def test_authkey_is_required(self):
+        agent.CONF.clear_override("runner_agent_authkey")
+
+        self.assertRaises(exceptions.RallyException,
+                          agent.Agent, self.address)
+        self.assertRaises(exceptions.RallyException,
+                          agent.connect, self.address)
+
+    def test_run_workload(self):
+        self._start_agent()
+
+        with agent.connect(self.address) as conn:
+            conn.send({"task": "task-uuid", "runner": "constant",
+                       "config": {"times": 5, "concurrency": 2},
+                       "scenario": "classbased.fooscenario",
+                       "context": {}, "args": {}})
+            results = []
+            while True:
+                message = conn.recv()
+                results.extend(message.get("results", []))
+                if message.get("finished"):
+                    break
+
+        self.assertEqual([], message["error"])
+        self.assertEqual(5, len(results))
+        self.assertEqual([], [r["error"] for r in results if r["error"]])
+
+    def test_run_workload_aborted(self):
+        self._start_agent()
+
+        with agent.connect(self.address) as conn:
+            conn.send({"task": "task-uuid", "runner": "constant_for_duration",
+                       "config": {"duration": 60, "concurrency": 2},
+                       "scenario": "classbased.fooscenario",
+                       "context": {}, "args": {}})
+            conn.send({"abort": True})
+            while True:
+                message = conn.recv()
+                if message.get("finished"):
+                    break
+
+        self.assertEqual([], message["error"])
+
+    def test_run_workload_unknown_runner(self):
+        self._start_agent()
+
+        with agent.connect(self.address) as conn:
+            conn.send({"task": "task-uuid", "runner": "foo", "config": {},
+                       "scenario": "classbased.fooscenario",
+                       "context": {}, "args": {}})
+            message = conn.recv()
+
+        self.assertTrue(message["finished"])
+        self.assertEqual("PluginNotFound", message["error"][0])
+
+    def test_wrong_authkey(self):
+        self._start_agent()
+        agent.CONF.set_override("runner_agent_authkey", "wrong")
+
+        self.assertRaises(agent.multiprocessing.AuthenticationError,
+                          agent.connect, self.address)
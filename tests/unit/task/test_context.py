@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 from unittest import mock
 
 import ddt
@@ -177,7 +178,104 @@ class BaseContextTestCase(test.TestCase):
         self.assertTrue(foo_context >= baz_context)
 
 
+@ddt.ddt
 class ContextManagerTestCase(test.TestCase):
+
+    def _register_contexts(self, *contexts):
+        """Register contexts which log their calls.
+
+        The contexts with "wait" in their config wait for each other in
+        pairs, so they pass only if they are run at the same time.
+
+        :param contexts: tuples of the name, the order and the independence
+            of the contexts
+        """
+        calls = []
+        barrier = threading.Barrier(2, timeout=5)
+        for name, order, independent in contexts:
+
+            @context.configure(name, platform="bar", order=order,
+                               independent=independent)
+            class FakeContext(context.Context):
+
+                def setup(self):
+                    calls.append(("setup", self.get_name()))
+                    if self.config.get("wait"):
+                        barrier.wait()
+                    if self.config.get("fail"):
+                        raise KeyError(self.get_name())
+
+                def cleanup(self):
+                    calls.append(("cleanup", self.get_name()))
+                    if self.config.get("wait"):
+                        barrier.wait()
+
+            self.addCleanup(FakeContext.unregister)
+        return calls
+
+    @ddt.data(
+        {"contexts": [("a", 1, True), ("b", 1, True), ("c", 2, True)],
+         "expected": [["a", "b"], ["c"]]},
+        {"contexts": [("a", 1, True), ("b", 1, False), ("c", 1, True)],
+         "expected": [["a"], ["b"], ["c"]]},
+        {"contexts": [("a", 1, False), ("b", 1, False), ("c", 2, False)],
+         "expected": [["a"], ["b"], ["c"]]},
+        {"contexts": [("a", 1, False), ("b", 1, False), ("c", 2, False)],
+         "same_order": True, "expected": [["a", "b"], ["c"]]})
+    @ddt.unpack
+    def test__get_groups(self, contexts, expected, same_order=False):
+        context.CONF.set_override("independent_same_order_contexts",
+                                  same_order)
+        self.addCleanup(context.CONF.clear_override,
+                        "independent_same_order_contexts")
+        self._register_contexts(*contexts)
+        manager = context.ContextManager(
+            {"config": dict(("%s@bar" % c[0], {}) for c in contexts)})
+
+        groups = manager._get_groups(manager._get_sorted_context_lst())
+
+        self.assertEqual(expected,
+                         [[ctx.get_name() for ctx in g] for g in groups])
+
+    def test_setup_and_cleanup_independent(self):
+        calls = self._register_contexts(("a", 1, True), ("b", 1, True))
+        ctx_object = {"config": {"a@bar": {"wait": True},
+                                 "b@bar": {"wait": True}},
+                      "task": {"uuid": "uuid"}}
+
+        # the contexts wait for each other, so they run at the same time
+        with context.ContextManager(ctx_object) as manager:
+            self.assertEqual({("setup", "a"), ("setup", "b")}, set(calls))
+
+        self.assertEqual(4, len(calls))
+        results = manager.contexts_results()
+        self.assertEqual(["a@bar", "b@bar"],
+                         [r["plugin_name"] for r in results])
+        for r in results:
+            self.assertIsNone(r["setup"]["error"])
+            self.assertIsNotNone(r["cleanup"]["finished_at"])
+
+    @mock.patch("rally.task.context.task_utils.format_exc")
+    def test_setup_independent_fails(self, mock_format_exc):
+        calls = self._register_contexts(
+            ("a", 1, True), ("b", 1, True), ("c", 2, True))
+        ctx_object = {"config": {"a@bar": {"wait": True, "fail": True},
+                                 "b@bar": {"wait": True}, "c@bar": {}},
+                      "task": {"uuid": "uuid"}}
+        manager = context.ContextManager(ctx_object)
+
+        e = self.assertRaises(KeyError, manager.__enter__)
+
+        self.assertEqual(("a",), e.args)
+        # the failed context and the one set up at the same time are
+        # cleaned up
+        self.assertEqual(
+            [("cleanup", "a"), ("cleanup", "b")],
+            sorted(c for c in calls if c[0] == "cleanup"))
+        self.assertNotIn(("setup", "c"), calls)
+        self.assertEqual(
+            [mock_format_exc.return_value, None],
+            [r["setup"]["error"] for r in manager.contexts_results()])
     @mock.patch("rally.task.context.ContextManager._get_sorted_context_lst")
     def test_setup(self, mock__get_sorted_context_lst):
         foo_context = mock.MagicMock()
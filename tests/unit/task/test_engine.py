@@ -15,7 +15,6 @@
 
 """Tests for the Test engine."""
 
-import collections
 import itertools
 import threading
 from unittest import mock
@@ -23,13 +22,34 @@ from unittest import mock
 from rally import consts
 from rally import exceptions
 from rally.common import objects
+from rally.common import utils
+from rally.task import abort
 from rally.task import context
 from rally.task import engine
+from rally.task import metrics
+from rally.task import runner
 from rally.task import scenario
 from rally.task import task_cfg
 from tests.unit import test
 
 
+class EventLog(list):
+    """List of events which allows to wait for an event to happen."""
+
+    def __init__(self):
+        super().__init__()
+        self._cond = threading.Condition()
+
+    def append(self, event):
+        with self._cond:
+            super().append(event)
+            self._cond.notify_all()
+
+    def wait(self, event, timeout=5):
+        with self._cond:
+            return self._cond.wait_for(lambda: event in self, timeout)
+
+
 class MyException(exceptions.RallyException):
     msg_fmt = "MyException"
 
@@ -436,6 +456,7 @@ class TaskEngineTestCase(test.TestCase):
 
         self.assertEqual(2, mock_log.exception.call_count)
 
+    @mock.patch("rally.task.engine.abort.AbortChannel")
     @mock.patch("rally.task.engine.ResultConsumer")
     @mock.patch("rally.task.engine.context.ContextManager.cleanup")
     @mock.patch("rally.task.engine.context.ContextManager.setup")
@@ -444,14 +465,13 @@ class TaskEngineTestCase(test.TestCase):
     def test_run__task_soft_aborted(
             self, mock_scenario_runner, mock_scenario,
             mock_context_manager_setup, mock_context_manager_cleanup,
-            mock_result_consumer):
+            mock_result_consumer, mock_abort_channel):
         scenario_cls = mock_scenario.get.return_value
         scenario_cls.get_platform.return_value = "openstack"
         scenario_cls.get_info.return_value = {"title": ""}
         task = mock.MagicMock()
-        mock_result_consumer.is_task_in_aborting_status.side_effect = [False,
-                                                                       False,
-                                                                       True]
+        abort_channel = mock_abort_channel.return_value
+        abort_channel.is_aborting.side_effect = [False, False, True]
         config = task_cfg.TaskConfig({
             "a.task": [{"runner": {"type": "a", "b": 1},
                         "description": "foo"}],
@@ -468,6 +488,13 @@ class TaskEngineTestCase(test.TestCase):
 
         eng.run()
 
+        mock_abort_channel.assert_called_once_with(task["uuid"])
+        abort_channel.start.assert_called_once_with(poll=False)
+        abort_channel.poll.assert_called_once_with()
+        abort_channel.stop.assert_called_once_with()
+        self.assertEqual(
+            abort_channel,
+            mock_result_consumer.call_args[1]["abort_channel"])
         self.assertEqual(2, fake_runner.run.call_count)
         self.assertEqual(mock.call(consts.TaskStatus.ABORTED),
                          task.update_status.mock_calls[-1])
@@ -478,6 +505,18 @@ class TaskEngineTestCase(test.TestCase):
             mock.call(consts.SubtaskStatus.ABORTED),
         ))
 
+    @mock.patch("rally.task.engine.abort.AbortChannel")
+    def test_run__task_run_by_another_engine(self, mock_abort_channel):
+        task = mock.MagicMock()
+        abort_channel = mock_abort_channel.return_value
+        abort_channel.start.side_effect = exceptions.RallyException(
+            "Task is already run")
+        eng = engine.TaskEngine(mock.MagicMock(), task, mock.Mock())
+
+        self.assertRaises(exceptions.RallyException, eng.run)
+        self.assertFalse(task.update_status.called)
+        self.assertFalse(task.get_subtasks.called)
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer")
     @mock.patch("rally.task.engine.context.ContextManager.cleanup")
@@ -540,6 +579,199 @@ class TaskEngineTestCase(test.TestCase):
         subtask_obj.update_status.assert_called_once_with(
             consts.SubtaskStatus.CRASHED)
 
+    def _get_parallel_subtask(self, workloads, max_parallel=None):
+        subtask = {"title": "foo", "description": "", "contexts": {},
+                   "run_in_parallel": True,
+                   "workloads": [{"position": i} for i in range(workloads)]}
+        if max_parallel:
+            subtask["max_parallel"] = max_parallel
+        return subtask
+
+    @mock.patch("rally.task.engine.TaskEngine._run_workload")
+    def test__run_subtask_in_parallel(self, mock_task_engine__run_workload):
+        task = mock.MagicMock(spec=objects.Task)
+        subtask = self._get_parallel_subtask(4, max_parallel=2)
+        lock = threading.Lock()
+        running = []
+        max_running = []
+        # workloads wait for each other, so they should run at once
+        barrier = threading.Barrier(2, timeout=5)
+
+        def run_workload(subtask_obj, workload, subtask_context=None):
+            with lock:
+                running.append(workload)
+                max_running.append(len(running))
+            barrier.wait()
+            with lock:
+                running.remove(workload)
+
+        mock_task_engine__run_workload.side_effect = run_workload
+        eng = engine.TaskEngine(mock.MagicMock(), task, mock.Mock())
+        eng.task_workloads_count = 4
+        eng.task_workload_index = 0
+
+        eng._run_subtask(subtask, 1)
+
+        task.add_subtask.assert_called_once_with(
+            title="foo", description="", contexts={}, run_in_parallel=True)
+        subtask_obj = task.add_subtask.return_value
+        self.assertEqual(
+            [0, 1, 2, 3],
+            sorted(c[0][1]["position"]
+                   for c in mock_task_engine__run_workload.call_args_list))
+        self.assertEqual(
+            {subtask_obj},
+            {c[0][0] for c in mock_task_engine__run_workload.call_args_list})
+        self.assertEqual(2, max(max_running))
+        self.assertEqual(4, eng.task_workload_index)
+        subtask_obj.update_status.assert_called_once_with(
+            consts.SubtaskStatus.FINISHED)
+
+    @mock.patch("rally.task.engine.TaskEngine._run_workload")
+    def test__run_subtask_in_parallel_aborted(
+            self, mock_task_engine__run_workload):
+        task = mock.MagicMock(spec=objects.Task)
+        subtask = self._get_parallel_subtask(3)
+
+        def run_workload(subtask_obj, workload, subtask_context=None):
+            if workload["position"] == 1:
+                raise engine.TaskAborted()
+
+        mock_task_engine__run_workload.side_effect = run_workload
+        eng = engine.TaskEngine(mock.MagicMock(), task, mock.Mock())
+        eng.task_workloads_count = 3
+        eng.task_workload_index = 0
+
+        self.assertRaises(engine.TaskAborted, eng._run_subtask, subtask, 1)
+
+        # the rest of workloads are not interrupted
+        self.assertEqual(3, mock_task_engine__run_workload.call_count)
+        self.assertEqual(2, eng.task_workload_index)
+        subtask_obj = task.add_subtask.return_value
+        subtask_obj.update_status.assert_called_once_with(
+            consts.SubtaskStatus.ABORTED)
+
+    def _run_subtask_in_pipeline(self, events, load=None, cleanup=None,
+                                 defer_cleanup=False):
+        """Run a subtask of 3 workloads with the load and the contexts faked.
+
+        The stages of the workloads are logged to `events` as pairs of the
+        name of a stage and the position of a workload.
+        """
+        engine.CONF.set_override("pipeline_context_setup", True)
+        self.addCleanup(engine.CONF.clear_override, "pipeline_context_setup")
+        engine.CONF.set_override("defer_context_cleanup", defer_cleanup)
+        self.addCleanup(engine.CONF.clear_override, "defer_context_cleanup")
+        config = task_cfg.TaskConfig({
+            "version": 2, "title": "foo", "subtasks": [{
+                "title": "bar",
+                "workloads": [{"scenario": {"a.task": {}},
+                               "description": "baz",
+                               "runner": {"constant": {}}}
+                              for i in range(3)]}]})
+        task = mock.MagicMock(spec=objects.Task)
+        task.__getitem__.return_value = "task-uuid"
+        subtask_obj = task.add_subtask.return_value
+        subtask_obj.add_workload.side_effect = (
+            lambda **kw: {"uuid": kw["position"]})
+
+        class FakeContextManager:
+            def __init__(self, context_obj):
+                self.position = context_obj["owner_id"]
+
+            def __enter__(self):
+                events.append(("setup", self.position))
+
+            def __exit__(self, *args):
+                if cleanup:
+                    cleanup(self.position)
+                events.append(("cleanup", self.position))
+
+        def run(name, context_obj, args):
+            events.append(("load", context_obj["owner_id"]))
+            if load:
+                load(context_obj["owner_id"])
+
+        eng = engine.TaskEngine(config, task, mock.Mock())
+        eng.task_workloads_count = 3
+        eng.task_workload_index = 0
+        eng._prepare_context = mock.Mock(
+            side_effect=lambda ctx, name, owner_id, **kw: {
+                "owner_id": owner_id})
+        with mock.patch.multiple("rally.task.engine",
+                                 ResultConsumer=mock.DEFAULT,
+                                 runner=mock.DEFAULT,
+                                 context=mock.DEFAULT) as mocks:
+            mocks["context"].ContextManager.side_effect = FakeContextManager
+            runner_cls = mocks["runner"].ScenarioRunner.get.return_value
+            runner_cls.return_value.run.side_effect = run
+            eng._run_subtask(config.subtasks[0], 1)
+        consumer = mocks["ResultConsumer"].return_value.__enter__
+        return subtask_obj, consumer.return_value
+
+    @mock.patch("rally.common.objects.Task.get_status",
+                return_value=consts.TaskStatus.RUNNING)
+    def test__run_subtask_in_pipeline(self, mock_task_get_status):
+        events = EventLog()
+
+        def load(position):
+            # the contexts of the next workload are set up meanwhile
+            if position < 2:
+                self.assertTrue(events.wait(("setup", position + 1)))
+            self.assertNotIn(("setup", position + 2), events)
+
+        subtask_obj, consumer = self._run_subtask_in_pipeline(events, load)
+
+        for position in range(3):
+            self.assertLess(events.index(("load", position)),
+                            events.index(("cleanup", position)))
+        for position in range(2):
+            # the load is not started before the previous workload is
+            # cleaned up
+            self.assertLess(events.index(("cleanup", position)),
+                            events.index(("load", position + 1)))
+        self.assertFalse(consumer.sla_checker.set_aborted_manually.called)
+        subtask_obj.update_status.assert_called_once_with(
+            consts.SubtaskStatus.FINISHED)
+
+    @mock.patch("rally.common.objects.Task.get_status",
+                return_value=consts.TaskStatus.RUNNING)
+    def test__run_subtask_in_pipeline_with_deferred_cleanup(
+            self, mock_task_get_status):
+        events = EventLog()
+
+        def cleanup(position):
+            # the next workload generates the load meanwhile
+            if position < 2:
+                self.assertTrue(events.wait(("load", position + 1)))
+
+        subtask_obj, consumer = self._run_subtask_in_pipeline(
+            events, cleanup=cleanup, defer_cleanup=True)
+
+        self.assertEqual(9, len(events))
+        subtask_obj.update_status.assert_called_once_with(
+            consts.SubtaskStatus.FINISHED)
+
+    @mock.patch("rally.common.objects.Task.get_status",
+                return_value=consts.TaskStatus.RUNNING)
+    def test__run_subtask_in_pipeline_aborted(self, mock_task_get_status):
+        events = EventLog()
+
+        def load(position):
+            self.assertTrue(events.wait(("setup", position + 1)))
+            mock_task_get_status.return_value = (
+                consts.TaskStatus.SOFT_ABORTING)
+
+        self.assertRaises(engine.TaskAborted, self._run_subtask_in_pipeline,
+                          events, load)
+
+        # the contexts of the second workload are set up already, but the
+        # load is not started
+        self.assertEqual(
+            {("setup", 0), ("setup", 1), ("load", 0), ("cleanup", 0),
+             ("cleanup", 1)},
+            set(events))
+
     def test__prepare_context(self):
 
         @context.configure("test1", 1, platform="testing")
@@ -580,6 +812,292 @@ class TaskEngineTestCase(test.TestCase):
         self.assertEqual(expected_result, result)
 
 
+    def test__prepare_context_with_subtask_context(self):
+
+        @context.configure("test1", 1, platform="testing")
+        class TestContext1(context.Context):
+            pass
+
+        self.addCleanup(TestContext1.unregister)
+
+        @scenario.configure("test_ctx.test", platform="testing",
+                            context={"test1@testing": {"a": 1}})
+        class TestScenario(scenario.Scenario):
+            pass
+
+        self.addCleanup(TestScenario.unregister)
+
+        task = mock.MagicMock()
+        env = mock.MagicMock()
+        eng = engine.TaskEngine({}, task, env)
+        subtask_context = eng._prepare_context(
+            {"test1": {"b": 2}}, None, "subtask_uuid")
+        self.assertEqual(
+            {"task": task, "owner_id": "subtask_uuid", "scenario_name": None,
+             "config": {"test1@testing": {"b": 2}}, "env": env.data},
+            subtask_context)
+        # the data which the contexts of the subtask have set up
+        subtask_context["users"] = [{"id": "user"}]
+
+        result = eng._prepare_context({}, "test_ctx.test", "foo_uuid",
+                                      subtask_context=subtask_context)
+
+        # the default context of the scenario is set up by the subtask
+        self.assertEqual(
+            {"task": task, "owner_id": "foo_uuid",
+             "scenario_name": "test_ctx.test", "config": {},
+             "env": env.data, "users": [{"id": "user"}]},
+            result)
+        result["users"][0]["id"] = "changed"
+        result["users"].append({"id": "another"})
+        self.assertEqual([{"id": "user"}], subtask_context["users"])
+
+        # an iteration gets its own view of the view of the workload
+        workload_context = eng._prepare_context(
+            {}, "test_ctx.test", "bar_uuid", subtask_context=subtask_context)
+        scenario_context = runner._get_scenario_context(0, workload_context)
+        scenario_context["users"][0]["id"] = "changed"
+        scenario_context["users"].append({"id": "another"})
+        self.assertEqual([{"id": "user"}], subtask_context["users"])
+        self.assertEqual([{"id": "user"}], workload_context["users"])
+
+    @mock.patch("rally.task.engine.context.ContextManager.cleanup")
+    @mock.patch("rally.task.engine.context.ContextManager.setup")
+    @mock.patch("rally.task.engine.TaskEngine._run_workload")
+    def test__run_subtask_with_contexts(
+            self, mock_task_engine__run_workload, mock_context_manager_setup,
+            mock_context_manager_cleanup):
+        task = mock.MagicMock(spec=objects.Task)
+        subtask_obj = task.add_subtask.return_value
+        subtask = {"title": "foo", "description": "",
+                   "contexts": {"users": {}},
+                   "workloads": [{"position": 0}, {"position": 1}]}
+        eng = engine.TaskEngine(mock.MagicMock(), task, mock.Mock())
+        eng._prepare_context = mock.Mock()
+        eng.task_workloads_count = 2
+        eng.task_workload_index = 0
+
+        eng._run_subtask(subtask, 1)
+
+        eng._prepare_context.assert_called_once_with(
+            {"users": {}}, None, subtask_obj.__getitem__.return_value)
+        # the contexts are set up once for all workloads
+        mock_context_manager_setup.assert_called_once_with()
+        mock_context_manager_cleanup.assert_called_once_with()
+        self.assertEqual(
+            [mock.call(subtask_obj, w,
+                       subtask_context=eng._prepare_context.return_value)
+             for w in subtask["workloads"]],
+            mock_task_engine__run_workload.call_args_list)
+        subtask_obj.set_contexts_results.assert_called_once_with([])
+        subtask_obj.update_status.assert_called_once_with(
+            consts.SubtaskStatus.FINISHED)
+
+    @mock.patch("rally.task.engine.objects.Workload.delete_by_uuid")
+    @mock.patch("rally.task.engine.TaskEngine._run_workload")
+    @mock.patch("rally.task.engine.abort.AbortChannel")
+    def test_run_resumes_task(self, mock_abort_channel,
+                              mock_task_engine__run_workload,
+                              mock_workload_delete_by_uuid):
+        finished_subtask = mock.MagicMock()
+        finished_subtask.__getitem__.side_effect = {
+            "uuid": "s1", "status": consts.SubtaskStatus.FINISHED}.get
+        interrupted_subtask = mock.MagicMock()
+        interrupted_subtask.__getitem__.side_effect = {
+            "uuid": "s2", "status": consts.SubtaskStatus.RUNNING}.get
+        interrupted_subtask.get_workloads.return_value = [
+            {"uuid": "w1", "position": 0, "sla_results": {"sla": []}},
+            {"uuid": "w2", "position": 1, "sla_results": {}}]
+        task = mock.MagicMock(spec=objects.Task)
+        task.get_subtasks.return_value = [finished_subtask,
+                                          interrupted_subtask]
+        config = mock.MagicMock()
+        config.subtasks = [
+            {"title": "s%d" % i, "description": "", "contexts": {},
+             "workloads": [{"position": 0}, {"position": 1}]}
+            for i in range(1, 4)]
+        eng = engine.TaskEngine(config, task, mock.Mock())
+        mock_abort_channel.return_value.is_aborting.return_value = False
+
+        with mock.patch("rally.task.engine.objects.Task.get_status"):
+            eng.run()
+
+        self.assertEqual(6, eng.task_workload_index)
+        # only the last subtask is new
+        task.add_subtask.assert_called_once_with(
+            title="s3", description="", contexts={}, run_in_parallel=False)
+        self.assertFalse(finished_subtask.update_status.called)
+        interrupted_subtask.update_status.assert_has_calls(
+            [mock.call(consts.SubtaskStatus.RUNNING),
+             mock.call(consts.SubtaskStatus.FINISHED)])
+        # the results of the interrupted workload are dropped
+        mock_workload_delete_by_uuid.assert_called_once_with("w2")
+        self.assertEqual({"s2": {0}}, eng._finished_workloads)
+        self.assertEqual(
+            [interrupted_subtask] * 2 + [task.add_subtask.return_value] * 2,
+            [c[0][0] for c in mock_task_engine__run_workload.call_args_list])
+
+    @mock.patch("rally.task.engine.objects.Workload.delete_by_uuid")
+    @mock.patch("rally.task.engine.TaskEngine._run_workload")
+    @mock.patch("rally.task.engine.abort.AbortChannel")
+    def test_run_resumes_aborted_task(self, mock_abort_channel,
+                                      mock_task_engine__run_workload,
+                                      mock_workload_delete_by_uuid):
+        def sla(criterion, success=False):
+            return {"sla": [{"criterion": "failure_rate", "success": True,
+                             "detail": ""},
+                            {"criterion": criterion, "success": success,
+                             "detail": ""}]}
+
+        aborted_subtask = mock.MagicMock()
+        aborted_subtask.__getitem__.side_effect = {
+            "uuid": "s1", "status": consts.SubtaskStatus.ABORTED}.get
+        aborted_subtask.get_workloads.return_value = [
+            {"uuid": "w1", "position": 0,
+             "sla_results": sla("max_seconds_per_iteration")},
+            {"uuid": "w2", "position": 1,
+             "sla_results": sla("aborted_manually")},
+            {"uuid": "w3", "position": 2,
+             "sla_results": sla("something_went_wrong")}]
+        task = mock.MagicMock(spec=objects.Task)
+        task.get_subtasks.return_value = [aborted_subtask]
+        config = mock.MagicMock()
+        config.subtasks = [
+            {"title": "s1", "description": "", "contexts": {},
+             "workloads": [{"position": i} for i in range(4)]}]
+        eng = engine.TaskEngine(config, task, mock.Mock())
+        mock_abort_channel.return_value.is_aborting.return_value = False
+
+        with mock.patch("rally.task.engine.objects.Task.get_status"):
+            eng.run()
+
+        self.assertFalse(task.add_subtask.called)
+        # the workloads which were interrupted by the abort or crashed are
+        # run again, while the one which failed its SLA is kept
+        self.assertEqual([mock.call("w2"), mock.call("w3")],
+                         mock_workload_delete_by_uuid.call_args_list)
+        self.assertEqual({"s1": {0}}, eng._finished_workloads)
+        self.assertEqual(4, mock_task_engine__run_workload.call_count)
+        aborted_subtask.update_status.assert_has_calls(
+            [mock.call(consts.SubtaskStatus.RUNNING),
+             mock.call(consts.SubtaskStatus.FINISHED)])
+
+    @mock.patch("rally.task.engine.TaskEngine._run_workload")
+    def test_run_resumes_task_with_abort_status(
+            self, mock_task_engine__run_workload):
+        for status in (consts.TaskStatus.ABORTED,
+                       consts.TaskStatus.SOFT_ABORTING):
+            mock_task_engine__run_workload.reset_mock()
+            statuses = [status]
+            task = mock.MagicMock()
+            task.__getitem__.return_value = "task-uuid"
+            task.get_subtasks.return_value = []
+            task.update_status.side_effect = statuses.append
+            config = mock.MagicMock()
+            config.subtasks = [
+                {"title": "s1", "description": "", "contexts": {},
+                 "workloads": [{"position": 0}, {"position": 1}]}]
+            eng = engine.TaskEngine(config, task, mock.Mock())
+
+            # the status the task was interrupted with does not abort it
+            with mock.patch("rally.task.abort.objects.Task.get_status",
+                            side_effect=lambda uuid: statuses[-1]):
+                eng.run()
+
+            self.assertEqual(2, mock_task_engine__run_workload.call_count)
+            self.assertEqual([status, consts.TaskStatus.RUNNING,
+                              consts.TaskStatus.FINISHED], statuses)
+
+    @mock.patch("rally.task.engine.metrics.MetricsServer")
+    @mock.patch("rally.task.engine.abort.AbortChannel")
+    def test_run_serves_metrics(self, mock_abort_channel,
+                                mock_metrics_server):
+        self.addCleanup(engine.CONF.clear_override, "live_metrics_address")
+        engine.CONF.set_override("live_metrics_address", "127.0.0.1:9464")
+        config = mock.MagicMock()
+        config.subtasks = []
+        eng = engine.TaskEngine(config, mock.MagicMock(), mock.Mock())
+
+        with mock.patch("rally.task.engine.objects.Task.get_status"):
+            eng.run()
+
+        self.assertIsInstance(eng.metrics, metrics.TaskMetrics)
+        mock_metrics_server.assert_called_once_with("127.0.0.1:9464",
+                                                    eng.metrics)
+        server = mock_metrics_server.return_value
+        server.__enter__.assert_called_once_with()
+        server.__exit__.assert_called_once_with(None, None, None)
+
+    def test__run_workload_finished(self):
+        subtask_obj = mock.MagicMock()
+        subtask_obj.__getitem__.return_value = "s1"
+        eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock(),
+                                mock.Mock())
+        eng.abort_channel = mock.Mock()
+        eng.abort_channel.is_aborting.return_value = False
+        eng._finished_workloads = {"s1": {0}}
+        pipeline = mock.Mock()
+
+        eng._run_workload(subtask_obj, {"position": 0}, pipeline=pipeline)
+
+        self.assertFalse(subtask_obj.add_workload.called)
+        # the next workload does not start the load before the previous one
+        pipeline.wait_run.assert_called_once_with(0)
+
+    @mock.patch("rally.task.engine.time")
+    @mock.patch("rally.task.engine.context.ContextManager")
+    @mock.patch("rally.task.engine.runner.ScenarioRunner")
+    @mock.patch("rally.task.engine.ResultConsumer")
+    def test__run_workload_in_pipeline(
+            self, mock_result_consumer, mock_scenario_runner,
+            mock_context_manager, mock_time):
+        eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock(),
+                                mock.Mock())
+        eng.abort_channel = mock.Mock()
+        eng.abort_channel.is_aborting.return_value = False
+        eng._prepare_context = mock.Mock()
+        consumer = mock_result_consumer.return_value.__enter__.return_value
+        consumer.start = 7.0
+        # only the clock of the engine is faked, logging keeps the real one
+        mock_time.time.side_effect = [10.0, 15.0]
+        pipeline = mock.Mock()
+        pipeline.wait_run.return_value = True
+
+        eng._run_workload(mock.MagicMock(), self._make_workload("a.task"),
+                          pipeline=pipeline)
+
+        pipeline.wait_run.assert_called_once_with(0)
+        runner_obj = mock_scenario_runner.get.return_value.return_value
+        self.assertTrue(runner_obj.run.called)
+        # the runner may adapt the load to the SLA of the workload
+        self.assertEqual({}, runner_obj.workload_sla)
+        # the time spent waiting for the load of the previous workload is
+        # not counted
+        self.assertEqual(12.0, consumer.start)
+
+    @mock.patch("rally.task.engine.json.dumps")
+    @mock.patch("rally.task.engine.context.Context.validate")
+    def test__validate_subtask_contexts(self, mock_context_validate,
+                                        mock_dumps):
+        mock_dumps.return_value = "<JSON>"
+        mock_context_validate.return_value = ["context_error"]
+        eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock(),
+                                mock.Mock())
+        subtask = {"title": "foo", "contexts": {"a": "a_conf"}}
+
+        e = self.assertRaises(exceptions.InvalidTaskConfig,
+                              eng._validate_subtask_contexts, subtask, 2,
+                              vtype="syntax")
+
+        self.assertEqual("Input task is invalid!\n\nSubtask foo[2] has wrong "
+                         "configuration\nSubtask configuration:\n<JSON>\n\n"
+                         "Reason(s):\n context_error", e.format_message())
+        mock_context_validate.assert_called_once_with(
+            name="a", context=None, config=None, plugin_cfg="a_conf",
+            vtype="syntax")
+        mock_dumps.assert_called_once_with({"contexts": {"a": "a_conf"}})
+
+
 class ResultConsumerTestCase(test.TestCase):
 
     @mock.patch("rally.common.objects.Task.get_status")
@@ -602,8 +1120,8 @@ class ResultConsumerTestCase(test.TestCase):
             [{"duration": 2, "timestamp": 2}]
         ]
 
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque(results)
+        runner.event_queue = utils.WaitableDeque()
         ctx_manager = mock.MagicMock()
 
         with engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
@@ -620,6 +1138,35 @@ class ResultConsumerTestCase(test.TestCase):
                           {"duration": 1, "timestamp": 3}],
                          consumer_obj.results)
 
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_with_metrics(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        workload_cfg = {"fake": 2, "hooks": []}
+        runner = mock.MagicMock()
+        runner.result_queue = utils.WaitableDeque(
+            [[{"duration": 1, "timestamp": 3}]])
+        runner.event_queue = utils.WaitableDeque(
+            [{"type": "iteration", "value": 1},
+             {"type": "iteration", "value": 2}])
+        workload_metrics = mock.Mock()
+
+        with engine.ResultConsumer(workload_cfg, task=mock.MagicMock(),
+                                   subtask=mock.Mock(spec=objects.Subtask),
+                                   workload=mock.Mock(spec=objects.Workload),
+                                   runner=runner, abort_on_sla_failure=False,
+                                   ctx_manager=mock.MagicMock(),
+                                   metrics=workload_metrics):
+            pass
+
+        self.assertEqual(2, workload_metrics.iteration_started.call_count)
+        workload_metrics.add_iteration.assert_called_once_with(
+            {"duration": 1, "timestamp": 3})
+        workload_metrics.finish.assert_called_once_with()
+
     @mock.patch("rally.task.hook.HookExecutor")
     @mock.patch("rally.task.engine.LOG")
     @mock.patch("rally.task.engine.time.time")
@@ -640,10 +1187,11 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
+        runner.statistics = {"knee": {"peak_throughput": 2}}
 
         results = []
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque(results)
+        runner.event_queue = utils.WaitableDeque()
         ctx_manager = mock.MagicMock()
 
         with engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
@@ -656,7 +1204,8 @@ class ResultConsumerTestCase(test.TestCase):
         workload.set_results.assert_called_once_with(
             full_duration=1, sla_results=mock_sla_results, load_duration=0,
             start_time=None,
-            contexts_results=ctx_manager.contexts_results())
+            contexts_results=ctx_manager.contexts_results(),
+            runner_statistics={"knee": {"peak_throughput": 2}})
 
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
@@ -670,7 +1219,7 @@ class ResultConsumerTestCase(test.TestCase):
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
 
-        runner.result_queue = collections.deque(
+        runner.result_queue = utils.WaitableDeque(
             [[{"duration": 1, "timestamp": 1},
               {"duration": 2, "timestamp": 2}]] * 4)
         iteration_count = len(list(
@@ -693,6 +1242,32 @@ class ResultConsumerTestCase(test.TestCase):
         task.update_status.assert_called_once_with(
             consts.TaskStatus.SOFT_ABORTING)
 
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_sla_failure_abort_is_immediate(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_sla_checker.return_value.add_iteration.return_value = False
+        workload_cfg = {"fake": 2, "hooks": []}
+        task = mock.MagicMock()
+        subtask = mock.Mock(spec=objects.Subtask)
+        workload = mock.Mock(spec=objects.Workload)
+        runner = mock.MagicMock()
+        runner.result_queue = utils.WaitableDeque()
+        runner.event_queue = utils.WaitableDeque()
+        aborted = threading.Event()
+        runner.abort.side_effect = aborted.set
+        ctx_manager = mock.MagicMock()
+
+        with engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
+                                   workload=workload, runner=runner,
+                                   abort_on_sla_failure=True,
+                                   ctx_manager=ctx_manager):
+            # the consumer is waiting for the results and wakes up on them
+            runner.result_queue.append([{"duration": 1, "timestamp": 1}])
+            self.assertTrue(aborted.wait(1))
+
     @mock.patch("rally.task.hook.HookExecutor")
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.threading.Thread")
@@ -702,7 +1277,7 @@ class ResultConsumerTestCase(test.TestCase):
                                             mock_event, mock_thread,
                                             mock_task_get_status,
                                             mock_hook_executor):
-        runner = mock.MagicMock(result_queue=False)
+        runner = mock.MagicMock()
 
         is_done = mock.MagicMock()
         is_done.is_set.side_effect = (False, True)
@@ -743,9 +1318,9 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque(
+        runner.result_queue = utils.WaitableDeque(
             [[{"duration": 1, "timestamp": 4}]] * 4)
-        runner.event_queue = collections.deque()
+        runner.event_queue = utils.WaitableDeque()
         ctx_manager = mock.MagicMock()
 
         with engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
@@ -770,8 +1345,8 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1])
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque([1])
+        runner.event_queue = utils.WaitableDeque()
         ctx_manager = mock.MagicMock()
         exc = MyException()
         try:
@@ -796,6 +1371,7 @@ class ResultConsumerTestCase(test.TestCase):
             self, mock_sla_checker, mock_result_consumer_wait_and_abort,
             mock_task_get_status, mock_conf):
         mock_conf.raw_result_chunk_size = 2
+        mock_conf.raw_result_chunk_queue_size = 1
         mock_sla_instance = mock.MagicMock()
         mock_sla_checker.return_value = mock_sla_instance
         mock_task_get_status.return_value = consts.TaskStatus.RUNNING
@@ -815,8 +1391,8 @@ class ResultConsumerTestCase(test.TestCase):
             [{"duration": 7, "timestamp": 1}],
         ]
 
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque(results)
+        runner.event_queue = utils.WaitableDeque()
         ctx_manager = mock.MagicMock()
 
         with engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
@@ -846,6 +1422,51 @@ class ResultConsumerTestCase(test.TestCase):
                                   {"duration": 5, "timestamp": 3}]}),
             mock.call(3, {"raw": [{"duration": 7, "timestamp": 1}]})])
 
+    @mock.patch("rally.task.engine.CONF")
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_while_chunk_is_saved(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status, mock_conf):
+        mock_conf.raw_result_chunk_size = 1
+        mock_conf.raw_result_chunk_queue_size = 5
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        workload_cfg = {"fake": 2, "hooks": []}
+        task = mock.MagicMock(spec=objects.Task)
+        subtask = mock.Mock(spec=objects.Subtask)
+        workload = mock.MagicMock(spec=objects.Workload)
+        saved = threading.Event()
+        waited = []
+
+        def add_workload_data(chunk_order, workload_data):
+            # the database is slow, but the results are still checked
+            waited.append(saved.wait(5))
+            if chunk_order == 0:
+                raise Exception("Database is gone")
+
+        workload.add_workload_data.side_effect = add_workload_data
+        runner = mock.MagicMock()
+        runner.result_queue = utils.WaitableDeque(
+            [[{"duration": i, "timestamp": i}] for i in range(3)])
+        runner.event_queue = utils.WaitableDeque()
+        mock_sla_checker.return_value.add_iteration.side_effect = (
+            lambda r: r["duration"] < 2 or saved.set())
+        ctx_manager = mock.MagicMock()
+
+        with engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
+                                   workload=workload, runner=runner,
+                                   abort_on_sla_failure=False,
+                                   ctx_manager=ctx_manager):
+            pass
+
+        self.assertEqual([True] * 3, waited)
+        # the failure to save a chunk does not stop saving of the rest
+        workload.add_workload_data.assert_has_calls([
+            mock.call(0, {"raw": [{"duration": 0, "timestamp": 0}]}),
+            mock.call(1, {"raw": [{"duration": 1, "timestamp": 1}]}),
+            mock.call(2, {"raw": [{"duration": 2, "timestamp": 2}]})])
+
     @mock.patch("rally.task.engine.LOG")
     @mock.patch("rally.task.hook.HookExecutor")
     @mock.patch("rally.task.engine.time.time")
@@ -867,13 +1488,14 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
+        runner.statistics = {}
         events = [
             {"type": "iteration", "value": 1},
             {"type": "iteration", "value": 2},
             {"type": "iteration", "value": 3}
         ]
-        runner.result_queue = collections.deque()
-        runner.event_queue = collections.deque(events)
+        runner.result_queue = utils.WaitableDeque()
+        runner.event_queue = utils.WaitableDeque(events)
 
         ctx_manager = mock.MagicMock()
         consumer_obj = engine.ResultConsumer(
@@ -905,25 +1527,19 @@ class ResultConsumerTestCase(test.TestCase):
             start_time=None,
             contexts_results=ctx_manager.contexts_results())
 
-    @mock.patch("rally.task.engine.threading.Thread")
-    @mock.patch("rally.task.engine.threading.Event")
     @mock.patch("rally.common.objects.Task.get_status")
-    @mock.patch("rally.task.engine.TaskEngine._prepare_context")
-    @mock.patch("rally.task.engine.time.sleep")
-    def test_wait_and_abort_on_abort(
-            self, mock_sleep, mock_task_engine__prepare_context,
-            mock_task_get_status, mock_event, mock_thread):
+    def test_wait_and_abort_on_abort(self, mock_task_get_status):
+        engine.CONF.set_override("task_abort_poll_interval", 0.1)
+        self.addCleanup(engine.CONF.clear_override,
+                        "task_abort_poll_interval")
         runner = mock.MagicMock()
         workload_cfg = mock.MagicMock()
         task = mock.MagicMock()
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         mock_task_get_status.side_effect = (consts.TaskStatus.RUNNING,
-                                            consts.TaskStatus.RUNNING,
+                                            consts.TaskStatus.SOFT_ABORTING,
                                             consts.TaskStatus.ABORTING)
-        mock_is_done = mock.MagicMock()
-        mock_event.return_value = mock_is_done
-        mock_is_done.is_set.return_value = False
         ctx_manager = mock.MagicMock()
 
         res = engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
@@ -932,37 +1548,86 @@ class ResultConsumerTestCase(test.TestCase):
                                     ctx_manager=ctx_manager)
         res.wait_and_abort()
 
-        runner.abort.assert_called_with()
-        # test task.get_status is checked until is_done is not set
+        runner.abort.assert_called_once_with()
+        task.update_status.assert_called_once_with(consts.TaskStatus.ABORTED)
+        # the channel is not listening, so the status of the task is
+        # checked in the database until the task is aborted
         self.assertEqual(3, mock_task_get_status.call_count)
 
-    @mock.patch("rally.task.engine.threading.Thread")
-    @mock.patch("rally.task.engine.threading.Event")
-    @mock.patch("rally.common.objects.Task.get_status")
-    @mock.patch("rally.task.engine.TaskEngine._prepare_context")
-    @mock.patch("rally.task.engine.time.sleep")
-    def test_wait_and_abort_on_no_abort(
-            self, mock_sleep, mock_task_engine__prepare_context,
-            mock_task_get_status, mock_event, mock_thread):
+    def test_wait_and_abort_on_notification(self):
         runner = mock.MagicMock()
-        workload_cfg = mock.MagicMock()
         task = mock.MagicMock()
-        subtask = mock.Mock(spec=objects.Subtask)
-        workload = mock.Mock(spec=objects.Workload)
-        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
-        mock_is_done = mock.MagicMock()
-        mock_event.return_value = mock_is_done
-        ctx_manager = mock.MagicMock()
+        abort_channel = mock.Mock(spec=abort.AbortChannel)
+        abort_channel.wait.return_value = True
+
+        res = engine.ResultConsumer(mock.MagicMock(), task=task,
+                                    subtask=mock.Mock(spec=objects.Subtask),
+                                    workload=mock.Mock(spec=objects.Workload),
+                                    runner=runner, abort_on_sla_failure=True,
+                                    ctx_manager=mock.MagicMock(),
+                                    abort_channel=abort_channel)
+        res.wait_and_abort()
 
-        mock_is_done.is_set.side_effect = [False, False, False, False, True]
+        abort_channel.wait.assert_called_once_with(res.is_done)
+        runner.abort.assert_called_once_with()
+        task.update_status.assert_called_once_with(consts.TaskStatus.ABORTED)
 
-        res = engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
-                                    workload=workload, runner=runner,
-                                    abort_on_sla_failure=True,
-                                    ctx_manager=ctx_manager)
+    def test_wait_and_abort_on_no_abort(self):
+        runner = mock.MagicMock()
+        abort_channel = mock.Mock(spec=abort.AbortChannel)
+        abort_channel.wait.return_value = False
+
+        res = engine.ResultConsumer(mock.MagicMock(), task=mock.MagicMock(),
+                                    subtask=mock.Mock(spec=objects.Subtask),
+                                    workload=mock.Mock(spec=objects.Workload),
+                                    runner=runner, abort_on_sla_failure=True,
+                                    ctx_manager=mock.MagicMock(),
+                                    abort_channel=abort_channel)
         res.wait_and_abort()
 
         # check method don't abort runner if task is not aborted
         self.assertFalse(runner.abort.called)
-        # test task.get_status is checked until is_done is not set
-        self.assertEqual(4, mock_task_get_status.call_count)
+
+
+class WorkloadPipelineTestCase(test.TestCase):
+
+    def _get_state(self, pipeline):
+        return ([e.is_set() for e in pipeline._may_setup],
+                [e.is_set() for e in pipeline._may_run])
+
+    def test_stages(self):
+        pipeline = engine.WorkloadPipeline(3)
+        self.assertEqual(([True, False, False], [True, False, False]),
+                         self._get_state(pipeline))
+
+        self.assertTrue(pipeline.wait_setup(0))
+        self.assertTrue(pipeline.wait_run(0))
+        self.assertEqual(([True, True, False], [True, False, False]),
+                         self._get_state(pipeline))
+
+        pipeline.load_finished(0)
+        self.assertEqual(([True, True, False], [True, False, False]),
+                         self._get_state(pipeline))
+
+        pipeline.finished(0)
+        self.assertEqual(([True, True, False], [True, True, False]),
+                         self._get_state(pipeline))
+
+        # nothing to start after the last workload
+        pipeline.finished(2)
+
+    def test_stages_with_deferred_cleanup(self):
+        pipeline = engine.WorkloadPipeline(2, defer_cleanup=True)
+
+        pipeline.load_finished(0)
+
+        self.assertEqual(([True, False], [True, True]),
+                         self._get_state(pipeline))
+
+    def test_stop(self):
+        pipeline = engine.WorkloadPipeline(3)
+
+        pipeline.stop()
+
+        self.assertFalse(pipeline.wait_setup(2))
+        self.assertFalse(pipeline.wait_run(2))
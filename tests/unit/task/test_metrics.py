@@ -0,0 +1,155 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+from unittest import mock
+import urllib.error
+import urllib.request
+
+from rally.task import metrics
+from tests.unit import test
+
+
+def _result(duration, error=False, actions=()):
+    return {
+        "duration": duration,
+        "timestamp": 1.0,
+        "error": ["Error", "msg", "trace"] if error else [],
+        "atomic_actions": [
+            {"name": name, "started_at": 1.0,
+             "finished_at": 1.0 + action_duration, "children": []}
+            for name, action_duration in actions]
+    }
+
+
+def _workload(name="Dummy.dummy", position=0):
+    return {"uuid": "w-%s" % position, "name": name, "position": position}
+
+
+class WorkloadMetricsTestCase(test.TestCase):
+
+    @mock.patch("rally.task.metrics.time.monotonic")
+    def test_to_dict(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        workload_metrics = metrics.WorkloadMetrics("t", _workload(), 10)
+        for _i in range(4):
+            workload_metrics.iteration_started()
+        workload_metrics.add_iteration(_result(4.0, actions=[("a", 1.0)]))
+        mock_monotonic.return_value = 105.0
+        for duration in (1.0, 2.0):
+            workload_metrics.add_iteration(
+                _result(duration, error=duration > 1, actions=[("a", 0.5)]))
+        # the first iteration leaves the window
+        mock_monotonic.return_value = 111.0
+
+        self.assertEqual(
+            {"task_uuid": "t", "uuid": "w-0", "name": "Dummy.dummy",
+             "position": 0, "running": True, "iterations": 3,
+             "failed_iterations": 1, "in_flight": 1,
+             "throughput": 0.2, "error_rate": 0.5,
+             "duration": {"p50": 1.5, "p95": 1.95, "p99": 1.99,
+                          "count": 3, "sum": 7.0},
+             "atomic_actions": {
+                 "a": {"p50": 0.5, "p95": 0.5, "p99": 0.5,
+                       "count": 3, "sum": 2.0}}},
+            workload_metrics.to_dict())
+
+        workload_metrics.finish()
+        mock_monotonic.return_value = 200.0
+        stats = workload_metrics.to_dict()
+        self.assertFalse(stats["running"])
+        self.assertEqual(0, stats["in_flight"])
+        self.assertEqual(0.0, stats["throughput"])
+        self.assertEqual(0.0, stats["error_rate"])
+        self.assertIsNone(stats["duration"]["p99"])
+        self.assertEqual(3, stats["duration"]["count"])
+
+
+class TaskMetricsTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task_metrics = metrics.TaskMetrics("t")
+        self.workload_metrics = self.task_metrics.add_workload(
+            _workload(name='Foo."bar"\\', position=1))
+        self.workload_metrics.add_iteration(
+            _result(2.0, actions=[("a", 1.0)]))
+
+    @mock.patch("rally.task.metrics.time.monotonic", return_value=1.0)
+    def test_to_dict(self, mock_monotonic):
+        result = self.task_metrics.to_dict()
+        self.assertEqual("t", result["task_uuid"])
+        self.assertEqual([self.workload_metrics.to_dict()],
+                         result["workloads"])
+
+    def test_to_prometheus(self):
+        labels = ('task="t",workload="w-1",scenario="Foo.\\"bar\\"\\\\",'
+                  'position="1"')
+        lines = self.task_metrics.to_prometheus().splitlines()
+
+        self.assertIn("# TYPE rally_workload_iterations_total counter",
+                      lines)
+        self.assertIn("rally_workload_iterations_total{%s} 1" % labels,
+                      lines)
+        self.assertIn("rally_workload_running{%s} 1" % labels, lines)
+        self.assertIn("rally_workload_error_rate{%s} 0.0" % labels, lines)
+        self.assertIn("# TYPE rally_workload_duration_seconds summary",
+                      lines)
+        self.assertIn(
+            'rally_workload_duration_seconds{%s,quantile="0.99"} 2.0'
+            % labels, lines)
+        self.assertIn("rally_workload_duration_seconds_count{%s} 1"
+                      % labels, lines)
+        self.assertIn(
+            'rally_atomic_action_duration_seconds{%s,action="a",'
+            'quantile="0.5"} 1.0' % labels, lines)
+        self.assertIn(
+            'rally_atomic_action_duration_seconds_sum{%s,action="a"} 1.0'
+            % labels, lines)
+
+
+class MetricsServerTestCase(test.TestCase):
+
+    def _get(self, port, path):
+        with urllib.request.urlopen(
+                "http://127.0.0.1:%s%s" % (port, path), timeout=5) as r:
+            return r.headers["Content-Type"], r.read().decode()
+
+    def test_serve(self):
+        task_metrics = metrics.TaskMetrics("t")
+        task_metrics.add_workload(_workload())
+
+        with metrics.MetricsServer("127.0.0.1:0", task_metrics) as server:
+            content_type, body = self._get(server.port, "/metrics")
+            self.assertEqual(task_metrics.to_prometheus(), body)
+            self.assertTrue(content_type.startswith("text/plain"))
+
+            content_type, body = self._get(server.port, "/metrics.json")
+            self.assertEqual(task_metrics.to_dict(), json.loads(body))
+            self.assertEqual("application/json", content_type)
+
+            e = self.assertRaises(urllib.error.HTTPError,
+                                  self._get, server.port, "/foo")
+            self.assertEqual(404, e.code)
+            e.close()
+
+        self.assertIsNone(server.port)
+
+    @mock.patch("rally.task.metrics.LOG")
+    def test_start_fails(self, mock_log):
+        for address in ("127.0.0.1", "256.0.0.1:1"):
+            server = metrics.MetricsServer(address, metrics.TaskMetrics("t"))
+            server.start()
+            self.assertIsNone(server.port)
+            # nothing to stop
+            server.stop()
+        self.assertEqual(2, mock_log.warning.call_count)
@@ -13,14 +13,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import asyncio
 import collections
 import multiprocessing
+import queue
 from unittest import mock
 
 import ddt
 
+from rally.common import utils
 from rally.plugins.task.runners import serial
 from rally.task import runner
+from rally.task import transport
 from rally.task import types
 from tests.unit import fakes
 from tests.unit import test
@@ -53,6 +57,55 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
         result = runner._get_scenario_context(13, context_obj)
         self.assertEqual({"foo": "bar", "iteration": 14}, result)
 
+    def test_get_scenario_context_isolation(self):
+        context_obj = {"users": [{"id": "u1", "roles": ["admin"]}],
+                       "tenants": {"t1": {"name": "foo"}}}
+
+        result = runner._get_scenario_context(0, context_obj)
+        self.assertIsInstance(result, utils.CopyOnWriteDict)
+        result["users"][0]["roles"].append("member")
+        result["tenants"]["t1"]["name"] = "bar"
+
+        self.assertEqual({"users": [{"id": "u1", "roles": ["admin"]}],
+                          "tenants": {"t1": {"name": "foo"}}}, context_obj)
+
+    def test_get_scenario_context_copied_by_scenario(self):
+        context_obj = {"users": [{"id": "u1"}]}
+
+        result = runner._get_scenario_context(0, context_obj)
+        dict(result)["users"].append({"id": "u2"})
+        {**result}["users"][0]["id"] = "u3"
+
+        self.assertEqual({"users": [{"id": "u1"}]}, context_obj)
+
+    def test_get_scenario_context_deepcopy(self):
+        runner.CONF.set_override("scenario_context_deepcopy", True)
+        self.addCleanup(runner.CONF.clear_override,
+                        "scenario_context_deepcopy")
+        context_obj = {"users": [{"id": "u1"}]}
+
+        result = runner._get_scenario_context(0, context_obj)
+
+        self.assertIs(dict, type(result))
+        self.assertEqual({"users": [{"id": "u1"}], "iteration": 1}, result)
+        self.assertIsNot(context_obj["users"], result["users"])
+
+    def test_run_scenario_once_arguments_isolation(self):
+        scenario_kwargs = {"servers": [{"name": "foo"}]}
+
+        class Scenario(fakes.FakeScenario):
+            def run(self, servers):
+                servers[0]["name"] = "bar"
+                servers.append({"name": "spam"})
+
+        result = runner._run_scenario_once(
+            Scenario, "run", runner._get_scenario_context(0, {
+                "task": {"uuid": "foo"}}),
+            scenario_kwargs, mock.MagicMock())
+
+        self.assertEqual([], result["error"])
+        self.assertEqual({"servers": [{"name": "foo"}]}, scenario_kwargs)
+
     def test_run_scenario_once_internal_logic(self):
         context = runner._get_scenario_context(
             12, fakes.FakeContext({}).context)
@@ -176,11 +229,201 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
             self.assertEqual(iteration, RecordingScenario.received["img"])
             self.assertEqual("keep", RecordingScenario.received["plain"])
 
+    def test_run_scenario_once_reuses_scenario(self):
+        instances = []
+
+        class ReusableScenario(fakes.FakeScenario):
+            def setup_worker(self):
+                instances.append(self)
+
+            def run(self, raise_exc=False):
+                self.add_output(additive={"title": "foo",
+                                          "chart_plugin": "StackedArea",
+                                          "data": [["foo", 1]]})
+                super().run(raise_exc=raise_exc)
+
+        def run_iteration(owner_id, iteration, raise_exc=False):
+            context = {"task": {"uuid": "foo"}, "owner_id": owner_id,
+                       "iteration": iteration}
+            return runner._run_scenario_once(
+                ReusableScenario, "run", context, {"raise_exc": raise_exc},
+                mock.MagicMock())
+        self.addCleanup(runner._scenario_pool.clear, "w1")
+        self.addCleanup(runner._scenario_pool.clear, "w2")
+
+        results = [run_iteration("w1", i) for i in range(1, 4)]
+
+        self.assertEqual(1, len(instances))
+        self.assertEqual(3, instances[0].context["iteration"])
+        # the output is collected per iteration
+        self.assertEqual([1, 1, 1],
+                         [len(r["output"]["additive"]) for r in results])
+
+        # another workload does not share the instance
+        run_iteration("w2", 1)
+        self.assertEqual(2, len(instances))
+
+        # the instance is discarded after a failed iteration
+        result = run_iteration("w1", 4, raise_exc=True)
+        self.assertEqual("Exception", result["error"][0])
+        run_iteration("w1", 5)
+        self.assertEqual(3, len(instances))
+
+        runner._scenario_pool.clear("w1")
+        run_iteration("w1", 6)
+        self.assertEqual(4, len(instances))
+
+    @mock.patch(BASE + "rutils.Timer", side_effect=fakes.FakeTimer)
+    def test_run_scenario_once_async(self, mock_timer):
+        event_queue = mock.MagicMock()
+        context = runner._get_scenario_context(
+            12, fakes.FakeContext({}).context)
+
+        result = asyncio.run(runner._run_scenario_once_async(
+            fakes.FakeAsyncScenario, "run", context, {}, event_queue))
+
+        expected_result = {
+            "duration": fakes.FakeTimer().duration(),
+            "timestamp": fakes.FakeTimer().timestamp(),
+            "idle_duration": 0,
+            "error": [],
+            "output": {"additive": [], "complete": []},
+            "atomic_actions": []
+        }
+        self.assertEqual(expected_result, result)
+        event_queue.put.assert_called_once_with(
+            {"type": "iteration", "value": 13})
+
+    @mock.patch(BASE + "rutils.Timer", side_effect=fakes.FakeTimer)
+    def test_run_scenario_once_async_exception(self, mock_timer):
+        result = asyncio.run(runner._run_scenario_once_async(
+            fakes.FakeAsyncScenario, "run", mock.MagicMock(),
+            {"raise_exc": True}, mock.MagicMock()))
+
+        self.assertEqual(["Exception", "Something went wrong"],
+                         result["error"][:2])
+
+    def test_run_scenario_once_async_timeout(self):
+        result = asyncio.run(runner._run_scenario_once_async(
+            fakes.FakeAsyncScenario, "run", mock.MagicMock(),
+            {"sleep": 10}, mock.MagicMock(), timeout=0.01))
+
+        self.assertEqual(["ThreadTimeoutException",
+                          "Iteration interrupted due to timeout."],
+                         result["error"][:2])
+        self.assertLess(result["duration"], 10)
+
+    @mock.patch(BASE + "time.time", return_value=10.0)
+    def test__wait_for_start(self, mock_time):
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=False))
+        finished = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
+        busy = mock.MagicMock(is_alive=mock.MagicMock(side_effect=[True,
+                                                                   False]))
+        pool = collections.deque([busy, finished])
+
+        self.assertTrue(runner._wait_for_start(pool, 1, 9.0, aborted))
+
+        # the slot is waited for, the start is not delayed by the schedule
+        busy.join.assert_called_once_with(0.001)
+        self.assertEqual(0, len(pool))
+        aborted.wait.assert_not_called()
+
+    @mock.patch(BASE + "time.time", side_effect=[10.0, 10.5])
+    def test__wait_for_start_sleeps_till_scheduled_time(self, mock_time):
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=False))
+
+        self.assertTrue(
+            runner._wait_for_start(collections.deque(), 1, 10.5, aborted))
+        aborted.wait.assert_called_once_with(0.5)
+
+    def test__wait_for_start_aborted(self):
+        aborted = mock.MagicMock(is_set=mock.MagicMock(return_value=True))
+
+        self.assertFalse(
+            runner._wait_for_start(collections.deque(), 1, 0, aborted))
+
+
+@ddt.ddt
+class LoadPhasesTestCase(test.TestCase):
+
+    @ddt.data(
+        ({}, 0, 0, None),
+        ({"warmup": {"iterations": 2}}, 1, 100, "warmup"),
+        ({"warmup": {"iterations": 2}}, 2, 0, None),
+        ({"warmup": {"duration": 1.5}}, 9, 1.4, "warmup"),
+        ({"warmup": {"duration": 1.5}}, 0, 1.5, None),
+        ({"cooldown": {"iterations": 2}}, 7, 0, None),
+        ({"cooldown": {"iterations": 2}}, 8, 0, "cooldown"),
+        ({"warmup": {"iterations": 9},
+          "cooldown": {"iterations": 9}}, 8, 0, "warmup"))
+    @ddt.unpack
+    def test_get_for_times(self, config, iteration, elapsed, expected):
+        phases = runner.LoadPhases(config, times=10)
+        self.assertEqual(expected, phases.get(iteration, elapsed))
+
+    @ddt.data(
+        ({"warmup": {"iterations": 2}}, 1, 0, "warmup"),
+        ({"warmup": {"duration": 1.5}}, 100, 1.4, "warmup"),
+        ({"cooldown": {"duration": 3}}, 100, 6.9, None),
+        ({"cooldown": {"duration": 3}}, 100, 7, "cooldown"),
+        # the total number of iterations is unknown
+        ({"cooldown": {"iterations": 2}}, 100, 9, None))
+    @ddt.unpack
+    def test_get_for_duration(self, config, iteration, elapsed, expected):
+        phases = runner.LoadPhases(config, duration=10)
+        self.assertEqual(expected, phases.get(iteration, elapsed))
+
+    def test_timed(self):
+        self.assertFalse(runner.LoadPhases({}).timed)
+        self.assertFalse(
+            runner.LoadPhases({"warmup": {"iterations": 1}}).timed)
+        self.assertTrue(runner.LoadPhases({"warmup": {"duration": 1}}).timed)
+        self.assertTrue(
+            runner.LoadPhases({"cooldown": {"duration": 1}}).timed)
+
+    @ddt.data(
+        ({"times": 10}, None),
+        ({"times": 10, "warmup": {"duration": 100}}, None),
+        ({"times": 10, "warmup": {"iterations": 5},
+          "cooldown": {"iterations": 4}}, None),
+        ({"times": 10, "warmup": {"iterations": 5},
+          "cooldown": {"iterations": 5}}, "(10) should be less than"),
+        ({"warmup": {"iterations": 1}}, "(1) should be less than"),
+        ({"duration": 10, "warmup": {"duration": 5},
+          "cooldown": {"duration": 4}}, None),
+        # the number of iterations of the timed load is not known
+        ({"duration": 10, "warmup": {"iterations": 100}}, None),
+        ({"duration": 10, "warmup": {"duration": 6},
+          "cooldown": {"duration": 4}}, "(10) should be less than"),
+        ({"duration": 0, "warmup": {"duration": 1}},
+         "(1) should be less than"))
+    @ddt.unpack
+    def test_check(self, config, error):
+        if error is None:
+            self.assertIsNone(runner.LoadPhases.check(config))
+        else:
+            self.assertIn(error, runner.LoadPhases.check(config))
+
 
 def noop_worker_process(i):
     pass
 
 
+def put_worker_process(result_queue, event_queue, i, info):
+    for j in range(100):
+        event_queue.put({"type": "iteration", "value": j})
+        result_queue.put({"timestamp": i * 100 + j})
+
+
+def batched_put_worker_process(result_queue, event_queue, i, info):
+    for j in range(100):
+        result_queue.put({"timestamp": float(i * 100 + j), "duration": 1.0,
+                          "idle_duration": 0.0, "error": [],
+                          "output": {"additive": [], "complete": []},
+                          "atomic_actions": []})
+    result_queue.flush()
+
+
 @ddt.ddt
 class ScenarioRunnerTestCase(test.TestCase):
 
@@ -207,6 +450,17 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner_obj._run_scenario.assert_called_once_with(
             scenario_class, "run", context_obj, {"foo": 11, "bar": "spam"})
 
+    @mock.patch(BASE + "_scenario_pool")
+    def test_run_releases_reusable_scenarios(self, mock__scenario_pool):
+        runner_obj = serial.SerialScenarioRunner(mock.MagicMock(), {})
+        runner_obj._run_scenario = mock.Mock(side_effect=ValueError)
+
+        self.assertRaises(ValueError, runner_obj.run,
+                          "classbased.fooscenario",
+                          {"task": runner_obj.task, "owner_id": "w1"}, {})
+
+        mock__scenario_pool.clear.assert_called_once_with("w1")
+
     def test_abort(self):
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -230,15 +484,21 @@ class ScenarioRunnerTestCase(test.TestCase):
         for process in process_pool:
             self.assertIsInstance(process, multiprocessing.Process)
 
+    @mock.patch(BASE + "multiprocessing.connection.wait")
     @mock.patch(BASE + "ScenarioRunner._send_result")
-    def test__join_processes(self, mock_scenario_runner__send_result):
-        process = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
-        processes = 10
-        process_pool = collections.deque([process] * processes)
+    def test__join_processes(self, mock_scenario_runner__send_result,
+                             mock_wait):
+        processes = [mock.MagicMock(is_alive=mock.MagicMock(
+            side_effect=[True, False])) for i in range(10)]
+        process_pool = collections.deque(processes)
         mock_result_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
+            get_nowait=mock.MagicMock(side_effect=[
+                {"timestamp": 1}, {"timestamp": 2}, queue.Empty,
+                queue.Empty, queue.Empty]))
         mock_event_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
+            get_nowait=mock.MagicMock(side_effect=[
+                {"type": "iteration", "value": 1}, queue.Empty,
+                queue.Empty, queue.Empty]))
 
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
@@ -247,8 +507,96 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner_obj._join_processes(
             process_pool, mock_result_queue, mock_event_queue)
 
-        self.assertEqual(processes, process.join.call_count)
+        self.assertEqual(2, mock_wait.call_count)
+        mock_wait.assert_called_with(
+            [mock_result_queue._reader, mock_event_queue._reader]
+            + [p.sentinel for p in processes])
+        self.assertEqual(0, len(process_pool))
+        for process in processes:
+            process.join.assert_called_once_with()
+        self.assertEqual(
+            [mock.call({"timestamp": 1}), mock.call({"timestamp": 2})],
+            mock_scenario_runner__send_result.call_args_list)
+        self.assertEqual([{"type": "iteration", "value": 1}],
+                         list(runner_obj.event_queue))
         mock_result_queue.close.assert_called_once_with()
+        mock_event_queue.close.assert_called_once_with()
+
+    def test__join_processes_real_processes(self):
+        runner_obj = self._get_runner(task=fakes.FakeTask(uuid="foo_uuid"))
+        runner_obj.task.result_has_valid_schema = mock.MagicMock(
+            return_value=True)
+        result_queue = multiprocessing.Queue()
+        event_queue = multiprocessing.Queue()
+
+        process_pool = runner_obj._create_process_pool(
+            3, put_worker_process,
+            ((result_queue, event_queue, i) for i in range(3)))
+        runner_obj._join_processes(process_pool, result_queue, event_queue)
+
+        results = [r for batch in runner_obj.result_queue for r in batch]
+        self.assertEqual(300, len(results))
+        self.assertEqual(300, len(runner_obj.event_queue))
+
+    def test__join_processes_batched_result_queue(self):
+        runner_obj = self._get_runner(task=fakes.FakeTask(uuid="foo_uuid"),
+                                      batch_size=1000)
+        runner_obj.task.result_has_valid_schema = mock.MagicMock(
+            return_value=True)
+        runner.CONF.set_override("runner_result_batch_size", 30)
+        self.addCleanup(runner.CONF.clear_override,
+                        "runner_result_batch_size")
+        result_queue = runner_obj._create_result_queue()
+        event_queue = multiprocessing.Queue()
+
+        process_pool = runner_obj._create_process_pool(
+            3, batched_put_worker_process,
+            ((result_queue, event_queue, i) for i in range(3)))
+        runner_obj._join_processes(process_pool, result_queue, event_queue)
+
+        self.assertEqual(1, len(runner_obj.result_queue))
+        self.assertEqual([float(i) for i in range(300)],
+                         [r["timestamp"] for r in runner_obj.result_queue[0]])
+
+    def test__create_result_queue(self):
+        for opt, value in (("runner_result_batch_size", 7),
+                           ("runner_result_batch_delay", 0.5)):
+            runner.CONF.set_override(opt, value)
+            self.addCleanup(runner.CONF.clear_override, opt)
+
+        result_queue = runner.ScenarioRunner._create_result_queue()
+        self.addCleanup(result_queue.close)
+
+        self.assertIsInstance(result_queue, transport.BatchedResultQueue)
+        self.assertEqual(7, result_queue.max_size)
+        self.assertEqual(0.5, result_queue.max_delay)
+
+    def test__create_iteration_counter(self):
+        runner.CONF.set_override("runner_iteration_block_size", 5)
+        self.addCleanup(runner.CONF.clear_override,
+                        "runner_iteration_block_size")
+
+        counter = runner.ScenarioRunner._create_iteration_counter(
+            limit=10, workers=2)
+
+        self.assertIsInstance(counter, utils.BlockRAMInt)
+        self.assertEqual(5, counter.block_size)
+        self.assertEqual(10, counter.limit)
+        self.assertEqual(2, counter.workers)
+
+    def test__create_result_queue_shared_memory(self):
+        for opt, value in (("runner_result_transport", "shared_memory"),
+                           ("runner_result_ring_size", 10)):
+            runner.CONF.set_override(opt, value)
+            self.addCleanup(runner.CONF.clear_override, opt)
+
+        result_queue = runner.ScenarioRunner._create_result_queue(3)
+        self.addCleanup(result_queue.close)
+
+        self.assertIsInstance(result_queue,
+                              transport.SharedMemoryResultQueue)
+        self.assertEqual(10, result_queue.ring_size)
+        self.assertEqual(3, len(result_queue._rings))
 
     def _get_runner(self, task="mock_me", config="mock_me", batch_size=0):
         class ScenarioRunner(runner.ScenarioRunner):
@@ -357,6 +357,33 @@ class ScenarioTestCase(test.TestCase):
             context={"task": {"uuid": "task_uuid"}, "owner_id": "foo_uuid"})
         self.assertEqual("foo_uuid", scenario_inst.get_owner_id())
 
+    def test_is_reusable(self):
+        class ReusableScenario(scenario.Scenario):
+            def setup_worker(self):
+                pass
+
+        self.assertFalse(scenario.Scenario.is_reusable())
+        self.assertTrue(ReusableScenario.is_reusable())
+
+    def test_reset(self):
+        scenario_inst = scenario.Scenario(context={"task": {"uuid": "t1"},
+                                                   "iteration": 1})
+        scenario_inst._idle_duration = 2.0
+        scenario_inst._atomic_actions.append({"name": "foo"})
+        output = scenario_inst._output
+        output["additive"].append({"title": "foo"})
+
+        scenario_inst.reset({"task": {"uuid": "t1"}, "iteration": 2})
+
+        self.assertEqual(2, scenario_inst.context["iteration"])
+        self.assertEqual({"uuid": "t1"}, scenario_inst.task)
+        self.assertEqual(0, scenario_inst.idle_duration())
+        self.assertEqual([], scenario_inst.atomic_actions())
+        self.assertEqual({"additive": [], "complete": []},
+                         scenario_inst._output)
+        # the output of the previous iteration is not changed
+        self.assertEqual([{"title": "foo"}], output["additive"])
+
     def test_sleep_between(self):
         scenario_inst = scenario.Scenario()
         scenario_inst.sleep_between(0.001, 0.002)
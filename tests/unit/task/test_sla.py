@@ -32,7 +32,7 @@ class SLABaseForTestCase(test.TestCase):
             CONFIG_SCHEMA = {"type": "integer"}
 
             def add_iteration(self, iteration):
-                self.success = self.criterion_value == iteration
+                self.success = self.criterion_value == iteration["data"]
                 return self.success
 
             def merge(self, other):
@@ -52,19 +52,34 @@ class SLACheckerTestCase(SLABaseForTestCase):
         sla_checker = sla.SLAChecker({"sla": {"test_criterion": 42}})
 
         iteration = {"key": {"name": "fake", "pos": 0}, "data": 42}
-        self.assertTrue(sla_checker.add_iteration(iteration["data"]))
+        self.assertTrue(sla_checker.add_iteration(iteration))
         expected_result = [{"criterion": "test_criterion",
                             "detail": "detail",
                             "success": True}]
         self.assertEqual(expected_result, sla_checker.results())
 
         iteration["data"] = 43
-        self.assertFalse(sla_checker.add_iteration(iteration["data"]))
+        self.assertFalse(sla_checker.add_iteration(iteration))
         expected_result = [{"criterion": "test_criterion",
                             "detail": "detail",
                             "success": False}]
         self.assertEqual(expected_result, sla_checker.results())
 
+    def test_add_iteration_of_warmup_and_cooldown(self):
+        sla_checker = sla.SLAChecker({"sla": {"test_criterion": 42}})
+
+        self.assertTrue(sla_checker.add_iteration({"data": 42}))
+        self.assertTrue(
+            sla_checker.add_iteration({"data": 43, "phase": "warmup"}))
+        self.assertTrue(
+            sla_checker.add_iteration({"data": 43, "phase": "cooldown"}))
+        self.assertTrue(sla_checker.results()[0]["success"])
+
+        self.assertFalse(sla_checker.add_iteration({"data": 43}))
+        # the failed SLA stays failed
+        self.assertFalse(
+            sla_checker.add_iteration({"data": 42, "phase": "cooldown"}))
+
     def test_set_unexpected_failure(self):
         exc = "error;("
         sla_checker = sla.SLAChecker({"sla": {}})
@@ -321,3 +321,30 @@ class TaskConfigTestCase(test.TestCase):
             "is found.",
             e.kwargs["message"]
         )
+
+    def test_v2_subtask_max_parallel(self):
+        subtask = {"title": "foo", "run_in_parallel": True,
+                   "workloads": [{"scenario": {"Dummy.dummy": {}}}]}
+        config = task_cfg.TaskConfig(
+            {"version": 2, "title": "", "subtasks": [
+                dict(subtask, max_parallel=2)]})
+        self.assertEqual(2, config.subtasks[0]["max_parallel"])
+
+        e = self.assertRaises(
+            exceptions.InvalidTaskException,
+            task_cfg.TaskConfig,
+            {"version": 2, "title": "", "subtasks": [
+                dict(subtask, max_parallel=0)]})
+        self.assertIn("Subtask #1", e.kwargs["message"])
+
+    def test_v2_subtask_contexts(self):
+        config = {"version": 2, "title": "foo", "subtasks": [{
+            "title": "bar", "contexts": {"users": {"tenants": 2}},
+            "workloads": [{"scenario": {"Dummy.dummy": {}}}]}]}
+
+        task = task_cfg.TaskConfig(config)
+
+        self.assertEqual({"users": {"tenants": 2}},
+                         task.subtasks[0]["contexts"])
+        self.assertEqual({"users": {"tenants": 2}},
+                         task.to_dict()["subtasks"][0]["contexts"])
@@ -0,0 +1,266 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+import pickle
+import queue
+import threading
+import time
+from unittest import mock
+
+from rally.task import transport
+from tests.unit import test
+
+
+def _result(i, **kwargs):
+    result = {"timestamp": 1000.0 + i, "duration": 0.5 * i,
+              "idle_duration": 0.0, "error": [],
+              "output": {"additive": [], "complete": []},
+              "atomic_actions": []}
+    result.update(kwargs)
+    return result
+
+
+def batched_put_worker(result_queue, start, count):
+    for i in range(start, start + count):
+        result_queue.put(_result(i))
+    result_queue.flush()
+
+
+class BatchTestCase(test.TestCase):
+
+    def test_encode_decode(self):
+        results = [
+            _result(0),
+            _result(1, error=["Exception", "foo", "trace"]),
+            _result(2, atomic_actions=[{"name": "foo", "children": [],
+                                        "started_at": 1, "finished_at": 2}],
+                    output={"additive": [{"foo": "bar"}], "complete": []}),
+            _result(3, idle_duration=2, scheduled_at=1002.5),
+        ]
+
+        fixed, variable = transport.encode_batch(results)
+
+        self.assertIsInstance(fixed, bytes)
+        self.assertEqual(len(results) * 3 * 8, len(fixed))
+        self.assertIsNone(pickle.loads(variable)[0])
+        decoded = transport.decode_batch((fixed, variable))
+        self.assertEqual(results, decoded)
+        self.assertIsInstance(decoded[3]["idle_duration"], float)
+
+    def test_decode_does_not_share_empty_parts(self):
+        decoded = transport.decode_batch(
+            transport.encode_batch([_result(0), _result(1)]))
+
+        decoded[0]["error"].append("foo")
+        self.assertEqual([], decoded[1]["error"])
+
+
+class BatchedResultQueueTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.queue = transport.BatchedResultQueue(max_size=3, max_delay=60)
+        self.addCleanup(self.queue.close)
+
+    def _get_all(self, expected):
+        results = []
+        while len(results) < expected:
+            try:
+                results.append(self.queue.get_nowait())
+            except queue.Empty:
+                self.assertTrue(self.queue._reader.poll(5))
+        return results
+
+    def test_get_nowait_empty(self):
+        self.assertRaises(queue.Empty, self.queue.get_nowait)
+
+    def test_put_sends_full_batch(self):
+        for i in range(4):
+            self.queue.put(_result(i))
+
+        self.assertEqual([_result(i) for i in range(3)], self._get_all(3))
+        self.assertRaises(queue.Empty, self.queue.get_nowait)
+
+        self.queue.flush()
+        self.assertEqual([_result(3)], self._get_all(1))
+
+    def test_put_sends_batch_by_time(self):
+        self.queue.max_delay = 0.01
+
+        self.queue.put(_result(0))
+
+        self.assertEqual([_result(0)], self._get_all(1))
+        self.queue.flush()
+
+    def test_flush_stops_flusher(self):
+        self.queue.put(_result(0))
+        flusher = self.queue._flusher
+
+        self.queue.flush()
+
+        self.assertFalse(flusher.is_alive())
+        self.assertIsNone(self.queue._flusher)
+        self.assertEqual([_result(0)], self._get_all(1))
+
+        # the queue can be used after it was flushed
+        self.queue.put(_result(1))
+        self.queue.flush()
+        self.assertEqual([_result(1)], self._get_all(1))
+
+    def test_flush_without_put(self):
+        self.queue.flush()
+
+        self.assertRaises(queue.Empty, self.queue.get_nowait)
+
+    def test_pickle_drops_batching_state(self):
+        self.queue.put(_result(0))
+        self.addCleanup(self.queue.flush)
+
+        state = self.queue.__getstate__()
+
+        self.assertIsNone(state["_pid"])
+        self.assertNotIn("_batch", state)
+        self.assertNotIn("_cond", state)
+
+    def test_unpickled_queue_has_sender_lock(self):
+        state = self.queue.__getstate__()
+        self.assertNotIn("_sender_lock", state)
+
+        restored = transport.BatchedResultQueue.__new__(
+            transport.BatchedResultQueue)
+        restored.__setstate__(state)
+        self.assertIsNotNone(restored._sender_lock)
+
+    def test_concurrent_first_put(self):
+        init_sender = self.queue._init_sender
+
+        def slow_init_sender():
+            time.sleep(0.05)
+            init_sender()
+
+        with mock.patch.object(self.queue, "_init_sender",
+                               side_effect=slow_init_sender) as mock_init:
+            threads = [threading.Thread(target=self.queue.put,
+                                        args=(_result(i),))
+                       for i in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        mock_init.assert_called_once_with()
+        self.queue.flush()
+        self.assertEqual(2, len(self._get_all(2)))
+
+    def test_worker_processes(self):
+        processes = [
+            multiprocessing.Process(target=batched_put_worker,
+                                    args=(self.queue, i * 10, 10))
+            for i in range(2)]
+        for process in processes:
+            process.start()
+
+        results = self._get_all(20)
+        for process in processes:
+            process.join()
+
+        self.assertEqual([_result(i) for i in range(20)],
+                         sorted(results, key=lambda r: r["timestamp"]))
+
+
+class SharedMemoryResultQueueTestCase(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.queue = transport.SharedMemoryResultQueue(
+            2, ring_size=4, max_size=3, max_delay=60)
+        self.addCleanup(self.queue.close)
+
+    def _get_all(self, expected):
+        results = []
+        while len(results) < expected:
+            try:
+                results.append(self.queue.get_nowait())
+            except queue.Empty:
+                self.assertTrue(self.queue._reader.poll(5))
+        return results
+
+    def _written_to_rings(self):
+        return [transport.SharedMemoryResultQueue._POSITION.unpack_from(
+            ring.buf, 0)[0] for ring in self.queue._rings]
+
+    def test_lightweight_results_are_written_to_ring(self):
+        for i in range(3):
+            self.queue.put(_result(i))
+
+        self.assertEqual([3, 0], self._written_to_rings())
+        self.assertEqual([_result(i) for i in range(3)], self._get_all(3))
+        self.assertRaises(queue.Empty, self.queue.get_nowait)
+
+    def test_slow_path(self):
+        results = [_result(0, error=["Exception", "foo", "trace"]),
+                   _result(1),
+                   _result(2, atomic_actions=[{"name": "foo"}])]
+        for result in results:
+            self.queue.put(result)
+
+        self.assertEqual([1, 0], self._written_to_rings())
+        self.assertEqual(
+            sorted(results, key=lambda r: r["timestamp"]),
+            sorted(self._get_all(3), key=lambda r: r["timestamp"]))
+
+    def test_ring_wraps_around(self):
+        results = [_result(i) for i in range(10)]
+        received = []
+        for i in range(0, 9, 3):
+            for result in results[i:i + 3]:
+                self.queue.put(result)
+            received.extend(self._get_all(3))
+        self.queue.put(results[9])
+        self.queue.flush()
+        received.extend(self._get_all(1))
+
+        self.assertEqual([10, 0], self._written_to_rings())
+        self.assertEqual(results, received)
+
+    def test_full_ring(self):
+        self.queue.max_size = 6
+        results = [_result(i) for i in range(6)]
+        for result in results:
+            self.queue.put(result)
+
+        # 4 records fit into the ring, the rest takes the slow path
+        self.assertEqual([4, 0], self._written_to_rings())
+        self.assertEqual(
+            results,
+            sorted(self._get_all(6), key=lambda r: r["timestamp"]))
+
+    def test_worker_processes(self):
+        self.queue = transport.SharedMemoryResultQueue(
+            2, ring_size=100, max_size=3, max_delay=60)
+        self.addCleanup(self.queue.close)
+        processes = [
+            multiprocessing.Process(target=batched_put_worker,
+                                    args=(self.queue, i * 10, 10))
+            for i in range(3)]
+        for process in processes:
+            process.start()
+
+        results = self._get_all(30)
+        for process in processes:
+            process.join()
+
+        # there are 2 rings only, so one of the workers uses the slow path
+        self.assertEqual(20, sum(self._written_to_rings()))
+        self.assertEqual([_result(i) for i in range(30)],
+                         sorted(results, key=lambda r: r["timestamp"]))
@@ -292,6 +292,8 @@ class TaskAPITestCase(test.TestCase):
         task_engine = mock_task_engine.return_value
         task_engine.validate.assert_called_once_with()
         task_engine.run.assert_called_once_with()
+        fake_task.set_input_task.assert_called_once_with(
+            task_config_instance.to_dict.return_value)
 
         mock_task.assert_called_once_with(
             deployment_uuid=mock_deployment_get.return_value["uuid"],
@@ -364,6 +366,81 @@ class TaskAPITestCase(test.TestCase):
                           self.task_inst.start,
                           deployment="deployment_uuid", config="config")
 
+    @mock.patch("rally.api.abort.is_listening", return_value=False)
+    @mock.patch("rally.api.task_cfg.TaskConfig")
+    @mock.patch("rally.api.objects.Task.get")
+    @mock.patch("rally.api.objects.Deployment.get")
+    @mock.patch("rally.api.engine.TaskEngine")
+    def test_resume(self, mock_task_engine, mock_deployment_get,
+                    mock_task_get, mock_task_config, mock_is_listening):
+        fake_task = fakes.FakeTask(uuid="some_uuid",
+                                   deployment_uuid="deployment_uuid",
+                                   status=consts.TaskStatus.RUNNING)
+        fake_task.get_status = mock.Mock()
+        fake_task.get_input_task = mock.Mock(return_value={"foo": "bar"})
+        mock_task_get.return_value = fake_task
+        fake_deployment = fakes.FakeDeployment(
+            uuid="deployment_uuid", status=consts.DeployStatus.DEPLOY_FINISHED)
+        mock_deployment_get.return_value = fake_deployment
+
+        self.assertEqual(
+            ("some_uuid", fake_task.get_status.return_value),
+            self.task_inst.resume(task_uuid="some_uuid",
+                                  abort_on_sla_failure=True))
+
+        mock_is_listening.assert_called_once_with("some_uuid")
+        mock_task_config.assert_called_once_with({"foo": "bar"})
+        mock_task_engine.assert_called_once_with(
+            mock_task_config.return_value, fake_task,
+            fake_deployment.env_obj, abort_on_sla_failure=True)
+        task_engine = mock_task_engine.return_value
+        self.assertFalse(task_engine.validate.called)
+        task_engine.run.assert_called_once_with()
+        mock_deployment_get.assert_called_once_with("deployment_uuid")
+
+    @mock.patch("rally.api.abort.is_listening")
+    @mock.patch("rally.api.objects.Task.get")
+    def test_resume_fails(self, mock_task_get, mock_is_listening):
+        fake_task = fakes.FakeTask(uuid="some_uuid",
+                                   status=consts.TaskStatus.CRASHED)
+        fake_task.get_input_task = mock.Mock(return_value=None)
+        mock_task_get.return_value = fake_task
+
+        # there is no config to run
+        mock_is_listening.return_value = False
+        e = self.assertRaises(exceptions.RallyException,
+                              self.task_inst.resume, task_uuid="some_uuid")
+        self.assertIn("config has not been saved", "%s" % e)
+
+        # the task is still running
+        mock_is_listening.return_value = True
+        e = self.assertRaises(exceptions.RallyException,
+                              self.task_inst.resume, task_uuid="some_uuid")
+        self.assertIn("still running", "%s" % e)
+
+        # the task is not interrupted
+        fake_task["status"] = consts.TaskStatus.FINISHED
+        e = self.assertRaises(exceptions.RallyException,
+                              self.task_inst.resume, task_uuid="some_uuid")
+        self.assertIn("in 'finished' status", "%s" % e)
+
+    @mock.patch("rally.api.abort.is_listening", return_value=False)
+    @mock.patch("rally.api.objects.Task.get")
+    @mock.patch("rally.api.objects.Deployment.get")
+    def test_resume_on_unfinished_deployment(
+            self, mock_deployment_get, mock_task_get, mock_is_listening):
+        fake_task = fakes.FakeTask(uuid="some_uuid",
+                                   deployment_uuid="deployment_uuid",
+                                   status=consts.TaskStatus.ABORTED)
+        fake_task.get_input_task = mock.Mock(return_value={"foo": "bar"})
+        mock_task_get.return_value = fake_task
+        mock_deployment_get.return_value = fakes.FakeDeployment(
+            uuid="deployment_uuid", name="foo",
+            status=consts.DeployStatus.DEPLOY_INCONSISTENT)
+
+        self.assertRaises(exceptions.DeploymentNotFinishedStatus,
+                          self.task_inst.resume, task_uuid="some_uuid")
+
     @ddt.data(True, False)
     @mock.patch("rally.api.time")
     @mock.patch("rally.api.objects.Task")
@@ -387,15 +464,18 @@ class TaskAPITestCase(test.TestCase):
         self.assertTrue(mock_time.sleep.called)
 
     @ddt.data(True, False)
+    @mock.patch("rally.api.abort.notify")
     @mock.patch("rally.api.time")
     @mock.patch("rally.api.objects.Task")
-    def test_abort_without_waiting(self, soft, mock_task, mock_time):
+    def test_abort_without_waiting(self, soft, mock_task, mock_time,
+                                   mock_notify):
         some_uuid = "133695fb-400d-4988-859c-30bfaa0488ce"
 
         self.task_inst.abort(task_uuid=some_uuid, soft=soft, wait=False)
 
         mock_task.get.assert_called_once_with(some_uuid)
         mock_task.get.return_value.abort.assert_called_once_with(soft=soft)
+        mock_notify.assert_called_once_with(some_uuid, soft=soft)
         self.assertFalse(mock_task.get_status.called)
         self.assertFalse(mock_time.sleep.called)
 
@@ -534,7 +614,7 @@ class TaskAPITestCase(test.TestCase):
                     "sla": {},
                     "sla_results": {"sla": [{"success": True}]},
                     "args": {},
-                    "statistics": {},
+                    "statistics": {"runner": {"foo": "bar"}},
                     "total_iteration_count": 3,
                     "failed_iteration_count": 0,
                     "data": ["data-raw"]}
@@ -578,7 +658,8 @@ class TaskAPITestCase(test.TestCase):
             load_duration=workload["load_duration"],
             sla_results=workload["sla_results"]["sla"],
             contexts_results=workload["contexts_results"],
-            hooks_results=workload["hooks"], start_time=workload["start_time"])
+            hooks_results=workload["hooks"], start_time=workload["start_time"],
+            runner_statistics={"foo": "bar"})
 
     @mock.patch("rally.api.objects.Task")
     @mock.patch("rally.api.objects.Deployment.get")
@@ -654,7 +735,8 @@ class TaskAPITestCase(test.TestCase):
             load_duration=workload["load_duration"],
             sla_results=workload["sla_results"]["sla"],
             contexts_results=workload["contexts_results"],
-            hooks_results=workload["hooks"], start_time=workload["start_time"])
+            hooks_results=workload["hooks"], start_time=workload["start_time"],
+            runner_statistics=None)
 
     @mock.patch("rally.api.objects.Deployment.get")
     def test_import_results_with_inconsistent_deployment(